@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+📦 APEX Launcher - Catalog Bundles
+Scan once, ship to a fleet of identical machines. A bundle is a tar of
+content-addressed objects (objects/<sha256>) named by a manifest:
+
+    system.db       the system index (apex_sysindex): per-directory
+                    entries plus the categorized catalog snapshot
+    icons/...       generated icons, their manifest and the mmap'd atlases
+
+The manifest also records the mtime of every directory the snapshot was
+built from. Importing verifies every object's hash, then stats those
+directories: when all match, the snapshot becomes the node's catalog
+with no scan at all; when the image drifted, a scan runs on top of the
+imported index, which re-reads only the directories whose mtime differs.
+
+    apex-launcher --export-bundle [DIR]     # DIR/apex-catalog-<digest>.tar.gz
+    apex-launcher --import-bundle FILE
+
+The search index is not shipped: it is built in memory from the catalog
+in a few milliseconds.
+"""
+
+import os
+import sys
+import json
+import time
+
+BUNDLE_FORMAT = 1
+MANIFEST_NAME = 'manifest.json'
+
+# Icon cache files worth shipping; half-written *.tmp files are not
+_ICON_SUFFIXES = ('.png', '.rgba', '.json')
+
+# Columns copied from a bundle snapshot into apps.db (usage counts stay local)
+_SNAPSHOT_COLUMNS = ('name, command, description, category, type, icon_path, scan_time, exec, '
+                     'terminal, workdir, desktop_file, single_instance, available, alternatives')
+
+
+def _sha256_file(path):
+    import hashlib
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _icons_dir():
+    from apex_core import cache_dir
+    return os.path.join(cache_dir(), 'icons')
+
+
+def check_fingerprints(prints):
+    """(matching, drifted) directory lists, one stat per directory"""
+    from apex_core import dir_mtime
+    matching, drifted = [], []
+    for directory, mtime in sorted(prints.items()):
+        (matching if dir_mtime(directory) == mtime else drifted).append(directory)
+    return matching, drifted
+
+
+def unindexed_dirs(prints):
+    """Existing directories this node scans that the bundle has no fingerprint for
+
+    ~/.local/share/applications, an extra PATH entry or a scanner
+    plugin's source (a Steam library, ~/.cargo/bin): the snapshot cannot
+    speak for them, so they count as drifted.
+    """
+    from apex_core import desktop_dirs, dir_mtime, path_dirs
+    from apex_manpages import man_dirs
+    from apex_scanners import BUILTIN_SCANNERS, SCANNERS
+    plugin_dirs = []
+    for plugin_class in BUILTIN_SCANNERS + SCANNERS:
+        try:
+            plugin_dirs += plugin_class().discover()
+        except Exception:
+            continue
+    extra = []
+    for directory in desktop_dirs() + [path_dir for path_dir, _mtime in path_dirs()] + man_dirs() + plugin_dirs:
+        if directory in prints or os.path.realpath(directory) in prints:
+            continue
+        if dir_mtime(directory):
+            extra.append(directory)
+    return extra
+
+
+def export_bundle(out_dir='.'):
+    """Build a fresh system index, pack it with the icon cache; returns the bundle path"""
+    import tarfile
+    import tempfile
+    from apex_sysindex import INDEX_NAME, SystemIndex, build_system_index, _read_version
+    os.makedirs(out_dir, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix='apex-bundle-') as tmp:
+        build_system_index(tmp)
+        index_file = os.path.join(tmp, INDEX_NAME)
+        files = {INDEX_NAME: index_file}
+        icons = _icons_dir()
+        try:
+            names = sorted(os.listdir(icons))
+        except OSError:
+            names = []
+        for name in names:
+            if name.endswith(_ICON_SUFFIXES):
+                files[f'icons/{name}'] = os.path.join(icons, name)
+
+        entries = {}
+        objects = {}
+        for logical, path in files.items():
+            try:
+                digest = _sha256_file(path)
+                entries[logical] = {'sha256': digest, 'bytes': os.path.getsize(path)}
+            except OSError:
+                continue  # Evicted while exporting
+            # Identical files (the same icon rendered twice) are stored once
+            objects.setdefault(digest, path)
+
+        manifest = {
+            'format': BUNDLE_FORMAT,
+            'created': time.time(),
+            'version': _read_version(),
+            'fingerprints': SystemIndex(index_file).fingerprints(),
+            'files': entries,
+        }
+        manifest_bytes = json.dumps(manifest, sort_keys=True, indent=1).encode('utf-8')
+        # The manifest names every object by hash, so its hash addresses the whole bundle
+        import hashlib
+        bundle_id = hashlib.sha256(manifest_bytes).hexdigest()
+        final = os.path.join(out_dir, f'apex-catalog-{bundle_id[:16]}.tar.gz')
+        partial = final + f'.{os.getpid()}.tmp'
+        try:
+            with tarfile.open(partial, 'w:gz') as tar:
+                import io
+                info = tarfile.TarInfo(MANIFEST_NAME)
+                info.size = len(manifest_bytes)
+                info.mtime = int(manifest['created'])
+                tar.addfile(info, io.BytesIO(manifest_bytes))
+                for digest, path in objects.items():
+                    tar.add(path, arcname=f'objects/{digest}', recursive=False)
+            os.replace(partial, final)
+        finally:
+            if os.path.exists(partial):
+                os.remove(partial)
+    return final
+
+
+def _stage_objects(tar, manifest, staging):
+    """Extract every listed object into staging, verifying its hash; logical name -> path"""
+    import hashlib
+    from apex_sysindex import INDEX_NAME
+    staged = {}
+    for logical, entry in manifest.get('files', {}).items():
+        digest = str(entry.get('sha256', ''))
+        if len(digest) != 64 or not all(c in '0123456789abcdef' for c in digest):
+            raise ValueError(f"bad object name for {logical}")
+        name = logical[len('icons/'):] if logical.startswith('icons/') else logical
+        if (logical != INDEX_NAME and name == logical) or not name or name.startswith('.') or '/' in name:
+            raise ValueError(f"unexpected file in bundle: {logical}")
+        source = tar.extractfile(f'objects/{digest}')
+        if source is None:
+            raise ValueError(f"object missing for {logical}")
+        path = os.path.join(staging, logical.replace('/', '_'))
+        check = hashlib.sha256()
+        with source, open(path, 'wb') as f:
+            for chunk in iter(lambda: source.read(1 << 20), b''):
+                check.update(chunk)
+                f.write(chunk)
+        if check.hexdigest() != digest:
+            raise ValueError(f"hash mismatch for {logical}")
+        staged[logical] = path
+    return staged
+
+
+def _install_index(staged_path):
+    """Put the index where scans look: the system location if writable, else the user cache"""
+    from apex_sysindex import index_dir, index_path, user_index_path
+    target = index_path()
+    try:
+        os.makedirs(index_dir(), mode=0o755, exist_ok=True)
+        if not os.access(index_dir(), os.W_OK):
+            raise PermissionError(index_dir())
+    except OSError:
+        target = user_index_path()
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+    partial = f'{target}.{os.getpid()}.tmp'
+    import shutil
+    shutil.copyfile(staged_path, partial)
+    os.chmod(partial, 0o644)
+    os.replace(partial, target)
+    return target
+
+
+def _install_icons(staged):
+    """Seed an empty icon cache; an existing one is never overwritten"""
+    icons = _icons_dir()
+    from apex_icons import MANIFEST_NAME as ICON_MANIFEST
+    if os.path.exists(os.path.join(icons, ICON_MANIFEST)):
+        return 0
+    os.makedirs(icons, exist_ok=True)
+    count = 0
+    # Sprites and PNGs first, manifests last: a reader never sees an index without its data
+    for logical, path in sorted(staged.items(), key=lambda item: item[0].endswith('.json')):
+        if logical.startswith('icons/'):
+            os.replace(path, os.path.join(icons, logical[len('icons/'):]))
+            count += 1
+    return count
+
+
+def _seed_catalog(db_path, snapshot_path):
+    """Copy the bundled catalog into an empty apps.db; returns the row count"""
+    import sqlite3
+    with sqlite3.connect(db_path, timeout=5) as conn:
+        if conn.execute('SELECT COUNT(*) FROM applications').fetchone()[0]:
+            return 0  # Never replace a catalog (and its usage counts) that is already there
+        conn.execute('ATTACH DATABASE ? AS bundle', (snapshot_path,))
+        conn.execute(f'INSERT INTO applications ({_SNAPSHOT_COLUMNS}) '
+                     f'SELECT {_SNAPSHOT_COLUMNS} FROM bundle.applications')
+        # Parser version and rules hash of the snapshot; the detector reconciles them
+        conn.execute('INSERT OR REPLACE INTO cache_meta (key, value) SELECT key, value FROM bundle.cache_meta')
+        count = conn.execute('SELECT COUNT(*) FROM applications').fetchone()[0]
+        conn.commit()
+        conn.execute('DETACH DATABASE bundle')
+    return count
+
+
+def import_bundle(path):
+    """Verify and install a bundle; returns a report dict"""
+    import tarfile
+    import tempfile
+    from apex_core import AdvancedApplicationDetector, cache_dir
+    from apex_sysindex import INDEX_NAME
+    os.makedirs(cache_dir(), exist_ok=True)
+    with tarfile.open(path, 'r:*') as tar:
+        handle = tar.extractfile(MANIFEST_NAME)
+        if handle is None:
+            raise ValueError("not an APEX catalog bundle")
+        manifest = json.load(handle)
+        if manifest.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"unsupported bundle format {manifest.get('format')!r}")
+        if INDEX_NAME not in manifest.get('files', {}):
+            raise ValueError("bundle has no catalog")
+        # Staged in the cache so the final moves are renames on one filesystem
+        with tempfile.TemporaryDirectory(prefix='.bundle-', dir=cache_dir()) as staging:
+            staged = _stage_objects(tar, manifest, staging)
+            prints = manifest.get('fingerprints', {})
+            matching, drifted = check_fingerprints(prints)
+            drifted += unindexed_dirs(prints)
+            index = _install_index(staged[INDEX_NAME])
+            icons = _install_icons(staged)
+
+            detector = AdvancedApplicationDetector()
+            if drifted:
+                # The scan layers on the imported index: only drifted directories are re-read
+                catalog = detector.scans.scan(force_refresh=True)
+                apps = sum(len(app_list) for app_list in catalog.values())
+                seeded = 0
+            else:
+                seeded = _seed_catalog(detector.db_path, staged[INDEX_NAME])
+                detector._check_cache_version()
+                apps = seeded
+    return {
+        'bundle': os.path.basename(path),
+        'index': index,
+        'directories': len(matching) + len(drifted),
+        'drifted': drifted,
+        'icons': icons,
+        'seeded': seeded,
+        'apps': apps,
+    }
+
+
+def main(argv=None):
+    args = list(sys.argv[1:] if argv is None else argv)
+    if '--export-bundle' in args:
+        rest = args[args.index('--export-bundle') + 1:]
+        out_dir = rest[0] if rest and not rest[0].startswith('-') else '.'
+        try:
+            bundle = export_bundle(out_dir)
+        except Exception as e:
+            print(f"❌ Export failed: {e}", file=sys.stderr)
+            return 1
+        print(f"📦 {bundle} ({os.path.getsize(bundle) / (1024 * 1024):.1f} MB)")
+        return 0
+    if '--import-bundle' in args:
+        rest = args[args.index('--import-bundle') + 1:]
+        if not rest:
+            print("Usage: apex-launcher --import-bundle FILE", file=sys.stderr)
+            return 2
+        try:
+            report = import_bundle(rest[0])
+        except Exception as e:
+            print(f"❌ Import failed: {e}", file=sys.stderr)
+            return 1
+        if report['drifted']:
+            print(f"📦 {report['bundle']}: {len(report['drifted'])} of {report['directories']} "
+                  f"directories differ from the bundle, rescanned them ({report['apps']:,} apps)")
+            for directory in report['drifted']:
+                print(f"   ↻ {directory}")
+        elif report['seeded']:
+            print(f"📦 {report['bundle']}: all {report['directories']} directories match, "
+                  f"{report['seeded']:,} apps ready without a scan")
+        else:
+            print(f"📦 {report['bundle']}: all {report['directories']} directories match; "
+                  "existing catalog kept")
+        print(f"   index: {report['index']}, icons: {report['icons']:,} files")
+        return 0
+    print("Usage: apex_bundle.py --export-bundle [DIR] | --import-bundle FILE", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
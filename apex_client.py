@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+⚡ APEX Launcher - Daemon Client
+Talks to a resident `apex-launcher --daemon` over its Unix socket.
+
+Standard library only and cheap to import, so the wrapper can run it
+with `python3 -S` and get a window on screen in tens of milliseconds.
+
+Exit codes: 0 = done, 1 = daemon reported an error, 2 = no daemon
+(the wrapper then starts the launcher normally).
+
+`--rpc METHOD [ARG] [--limit N]` queries the JSON RPC server instead
+(see apex_rpc.py) and prints the result as JSON.
+"""
+
+import os
+import sys
+import json
+import stat
+import socket
+
+EXIT_OK = 0
+EXIT_ERROR = 1
+EXIT_NO_DAEMON = 2
+
+
+def runtime_dir():
+    """Private per-user directory for launcher sockets"""
+    base = os.environ.get('XDG_RUNTIME_DIR')
+    if base and os.path.isdir(base):
+        path = os.path.join(base, 'apex-launcher')
+    else:
+        path = os.path.join('/tmp', f'apex-launcher-{os.getuid()}')
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    # Under /tmp another user may have created it first to catch our sockets
+    st = os.lstat(path)
+    if not stat.S_ISDIR(st.st_mode) or st.st_uid != os.getuid() or stat.S_IMODE(st.st_mode) != 0o700:
+        raise PermissionError(f"{path} is not a private directory owned by this user")
+    return path
+
+
+def socket_path(name='daemon.sock'):
+    return os.path.join(runtime_dir(), name)
+
+
+def request(payload, path=None, timeout=2.0):
+    """Send one JSON request line and return the decoded reply.
+
+    Raises OSError when no daemon is listening.
+    """
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(path or socket_path())
+        sock.sendall(json.dumps(payload).encode('utf-8') + b'\n')
+        data = b''
+        while not data.endswith(b'\n'):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    finally:
+        sock.close()
+    if not data:
+        raise ConnectionError('daemon closed the connection')
+    return json.loads(data.decode('utf-8'))
+
+
+def parse_args(argv):
+    """Map wrapper arguments to a daemon command, or None if the daemon can't handle them"""
+    if not argv:
+        return {'cmd': 'show'}
+    if argv[0] in ('--search', '-s') and len(argv) == 2:
+        return {'cmd': 'search', 'query': argv[1]}
+    if argv[0] == '--launch' and len(argv) == 2:
+        return {'cmd': 'launch', 'name': argv[1]}
+    if argv[0] in ('--refresh', '-r') and len(argv) == 1:
+        return {'cmd': 'refresh'}
+    if argv[0] == '--quit-daemon' and len(argv) == 1:
+        return {'cmd': 'quit'}
+    return None
+
+
+def rpc_call(method, params=None, path=None, timeout=30.0):
+    """Call one method on the JSON RPC server and return its result"""
+    reply = request({'id': 1, 'method': method, 'params': params or {}},
+                    path or socket_path('rpc.sock'), timeout)
+    if 'error' in reply:
+        raise RuntimeError(reply['error'])
+    return reply.get('result')
+
+
+def rpc_main(argv):
+    """`--rpc search fire --limit 5`, `--rpc list_category Development`, `--rpc stats` ..."""
+    if not argv:
+        print("usage: apex-launcher --rpc search|list_category|launch|refresh|stats [ARG] [--limit N]",
+              file=sys.stderr)
+        return EXIT_ERROR
+    method, rest = argv[0], list(argv[1:])
+    params = {}
+    if '--limit' in rest:
+        i = rest.index('--limit')
+        try:
+            params['limit'] = int(rest[i + 1])
+        except (IndexError, ValueError):
+            print("apex-launcher: --limit needs a number", file=sys.stderr)
+            return EXIT_ERROR
+        del rest[i:i + 2]
+    arg = ' '.join(rest)
+    if arg:
+        params[{'search': 'query', 'list_category': 'category', 'launch': 'name'}.get(method, 'arg')] = arg
+    try:
+        result = rpc_call(method, params)
+    except (OSError, ValueError):
+        print("apex-launcher: no RPC server running (start one with `apex-launcher --serve`)",
+              file=sys.stderr)
+        return EXIT_NO_DAEMON
+    except RuntimeError as e:
+        print(f"apex-launcher: {e}", file=sys.stderr)
+        return EXIT_ERROR
+    if isinstance(result, list):
+        for record in result:
+            print(json.dumps(record))
+    else:
+        print(json.dumps(result, indent=2))
+    return EXIT_OK
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == '--rpc':
+        return rpc_main(argv[1:])
+    payload = parse_args(argv)
+    if payload is None:
+        return EXIT_NO_DAEMON
+    try:
+        reply = request(payload)
+    except (OSError, ValueError):
+        return EXIT_NO_DAEMON
+    if not reply.get('ok'):
+        print(f"apex-launcher: {reply.get('error', 'daemon error')}", file=sys.stderr)
+        return EXIT_ERROR
+    if reply.get('message'):
+        print(reply['message'])
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1479 @@
+#!/usr/bin/env python3
+"""
+🔍 APEX Launcher - Core
+Application detection, SQLite catalog cache, categorization and search,
+with no GUI dependencies. The Qt window (apex_launcher.py), the CLI
+(smart_cli_launcher.py) and the RPC server (apex_rpc.py) are thin layers
+on top of this module and apex_launch.
+
+Kept cheap to import: sqlite3, subprocess, the thread pool and the icon
+machinery are only loaded by the code paths that use them. Check with
+`python3 -X importtime -c "import apex_core"`.
+"""
+
+import os
+import sys
+import time
+import threading
+from stat import S_ISREG
+
+# Launching is part of the core API; frontends import it from here
+from apex_launch import LaunchError, ProcessSupervisor, get_launch_engine
+from apex_launch import split_exec, unescape_exec
+
+# Columns added to `applications` for shell-free launching: (name, type)
+LAUNCH_COLUMNS = [
+    ('exec', 'TEXT'),
+    ('terminal', 'INTEGER DEFAULT 0'),
+    ('workdir', 'TEXT'),
+    ('desktop_file', 'TEXT'),
+    ('single_instance', 'INTEGER DEFAULT 0'),
+    # 0 when the Exec/TryExec target is not installed
+    ('available', 'INTEGER DEFAULT 1'),
+    # JSON list of other sources' launch targets for the same program
+    ('alternatives', 'TEXT'),
+]
+
+
+def cache_dir():
+    """Per-user cache shared by the GUI, CLI and RPC frontends"""
+    return os.path.join(os.path.expanduser('~'), '.cache', 'apex-launcher')
+
+
+# Shared by every user; covered by the system index (apex_sysindex)
+SYSTEM_DESKTOP_DIRS = (
+    '/usr/share/applications',
+    '/usr/local/share/applications',
+    '/var/lib/flatpak/exports/share/applications',
+    '/var/lib/snapd/desktop/applications',
+)
+
+# PATH directories indexed system-wide; /usr/bin before /bin so merged-/usr keeps /usr/bin
+SYSTEM_PATH_DIRS = (
+    '/usr/local/sbin', '/usr/local/bin', '/usr/sbin', '/usr/bin', '/sbin', '/bin',
+    '/usr/local/games', '/usr/games', '/var/lib/flatpak/exports/bin', '/snap/bin',
+)
+
+# Installed-app directories whose mtime fingerprints the flatpak and snap listings
+FLATPAK_SYSTEM_DIR = '/var/lib/flatpak/app'
+SNAP_DIR = '/var/lib/snapd/snaps'
+
+
+def desktop_dirs():
+    """Directories scanned for .desktop entries"""
+    return list(SYSTEM_DESKTOP_DIRS) + [
+        os.path.expanduser('~/.local/share/applications'),
+        os.path.expanduser('~/Desktop')
+    ]
+
+
+def dir_mtime(path):
+    """mtime of a directory, 0 when it does not exist"""
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0
+
+
+def path_dirs(dirs=None):
+    """(directory, mtime) for each PATH entry, first occurrence of each real directory only
+
+    /bin and /usr/bin are the same directory on merged-/usr systems, and
+    PATH often repeats entries; (st_dev, st_ino) catches both.
+    """
+    seen = set()
+    result = []
+    if dirs is None:
+        dirs = os.environ.get('PATH', '').split(os.pathsep)
+    for path_dir in dirs:
+        if not path_dir:
+            continue
+        try:
+            st = os.stat(path_dir)
+        except OSError:
+            continue
+        key = (st.st_dev, st.st_ino)
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append((path_dir, st.st_mtime))
+    return result
+
+
+def list_executables(path_dir):
+    """Names of executable regular files in one directory"""
+    names = []
+    try:
+        with os.scandir(path_dir) as it:
+            for entry in it:
+                try:
+                    # Follows symlinks, like the shell does when running the name
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if S_ISREG(st.st_mode) and st.st_mode & 0o111:
+                    names.append(entry.name)
+    except OSError:
+        pass
+    return names
+
+
+# Too basic to be worth listing as applications
+BASIC_COMMANDS = frozenset(['ls', 'cp', 'mv', 'rm', 'cat', 'echo'])
+
+
+def _is_cli_candidate(name):
+    return not (name.startswith('.') or len(name) <= 2 or
+                name.endswith(('.so', '.a', '.o')) or name in BASIC_COMMANDS)
+
+
+def exec_program(exec_line):
+    """The program an Exec line runs, looking through `env VAR=value`"""
+    try:
+        args = split_exec(unescape_exec(exec_line))
+    except Exception:
+        args = exec_line.split()
+    while args and os.path.basename(args[0]) == 'env':
+        args = args[1:]
+        while args and ('=' in args[0] or args[0].startswith('-')):
+            args = args[1:]
+    return args[0] if args else ''
+
+
+def is_available(program, executables, on_path=()):
+    """Whether program resolves, answered from the PATH map without a stat when possible"""
+    if not program:
+        return False
+    program = os.path.expanduser(program)
+    if '/' not in program:
+        return program in executables
+    return program in on_path or os.access(program, os.X_OK)
+
+
+# Bump when a scanner or the man-page parser reads sources differently: cached
+# rows, PATH listings and man summaries are then rebuilt by one full rescan
+PARSER_VERSION = 2
+
+# Bump when _categorize_application scores differently; keyword edits change the hash by themselves
+CATEGORIZER_VERSION = 1
+
+
+def rules_hash(categories):
+    """Fingerprint of the categorization rules stored next to the categories they produced"""
+    import json
+    import hashlib
+    rules = json.dumps([CATEGORIZER_VERSION, categories], sort_keys=True)
+    return hashlib.sha256(rules.encode('utf-8')).hexdigest()[:16]
+
+
+# Column order read by _row_to_app; rowid doubles as a stable app id
+CACHE_COLUMNS = ('rowid, name, command, description, category, type, icon_path, usage_count, '
+                 'exec, terminal, workdir, desktop_file, single_instance, available, alternatives')
+
+# Fields exposed to scripts (CLI --json, RPC)
+RECORD_FIELDS = ('id', 'name', 'command', 'description', 'category', 'type', 'icon_path', 'usage_count',
+                 'available', 'alternatives')
+
+
+# Enhanced categories with more keywords
+CATEGORIES = {
+    'Programming': [
+        'code', 'editor', 'ide', 'python', 'java', 'git', 'vim', 'emacs',
+        'vscode', 'sublime', 'atom', 'eclipse', 'intellij', 'pycharm',
+        'dev', 'develop', 'compiler', 'gcc', 'make', 'cmake', 'ninja',
+        'node', 'npm', 'yarn', 'docker', 'kubernetes', 'k8s'
+    ],
+    'Security': [
+        'security', 'hack', 'nmap', 'wireshark', 'metasploit', 'burp',
+        'kali', 'pen', 'test', 'audit', 'vuln', 'exploit', 'forensic',
+        'john', 'hashcat', 'aircrack', 'sqlmap', 'nikto', 'dirb'
+    ],
+    'System': [
+        'system', 'monitor', 'htop', 'top', 'kill', 'systemctl',
+        'service', 'process', 'task', 'cpu', 'memory', 'disk',
+        'mount', 'fdisk', 'lsblk', 'df', 'free', 'ps', 'systemd'
+    ],
+    'Internet': [
+        'browser', 'firefox', 'chrome', 'chromium', 'wget', 'curl',
+        'thunderbird', 'mail', 'email', 'web', 'http', 'ftp',
+        'download', 'torrent', 'transmission', 'qbittorrent'
+    ],
+    'Media': [
+        'video', 'audio', 'vlc', 'mpv', 'gimp', 'blender', 'spotify',
+        'music', 'player', 'media', 'photo', 'image', 'movie',
+        'kodi', 'plex', 'obs', 'audacity', 'kdenlive'
+    ],
+    'Office': [
+        'office', 'document', 'libreoffice', 'writer', 'calc', 'pdf',
+        'word', 'excel', 'powerpoint', 'presentation', 'spreadsheet',
+        'text', 'editor', 'note', 'markdown'
+    ],
+    'Graphics': [
+        'graphics', 'design', 'gimp', 'inkscape', 'krita', 'darktable',
+        'photo', 'edit', 'draw', 'paint', 'vector', 'raster',
+        'blender', '3d', 'modeling', 'render'
+    ],
+    'Games': [
+        'game', 'steam', 'lutris', 'wine', 'emulator', 'play',
+        'gaming', 'entertainment', 'fun', 'arcade', 'simulation'
+    ],
+    'Development': [
+        'terminal', 'console', 'shell', 'bash', 'zsh', 'fish',
+        'tmux', 'screen', 'ssh', 'ftp', 'rsync', 'scp'
+    ],
+    'Education': [
+        'learn', 'education', 'study', 'tutorial', 'course',
+        'school', 'university', 'research', 'academic'
+    ]
+}
+
+
+class AdvancedApplicationDetector:
+    """🔍 Ultra-Advanced Application Detection System"""
+    
+    def __init__(self, db_path=None, system_scope=False):
+        self.db_path = db_path or os.path.join(cache_dir(), 'apps.db')
+        # Building the system index: scan only shared directories, record their entries
+        self.system_scope = system_scope
+        # Prebuilt system catalog, re-opened by each scan; None when absent or in system scope
+        self.system_index = None
+        # (source, directory) -> (mtime, JSON entries), recorded in system scope
+        self.source_listings = {}
+        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        self.init_database()
+        
+        self.categories = CATEGORIES
+        
+        # Performance optimization for minimal systems
+        self.scan_cache = {}
+        self.last_scan_time = 0
+        self.cache_duration = 600  # 10 minutes cache for minimal systems
+        # Host-derived worker counts, batch sizes and the RSS budget
+        from apex_resources import get_profile
+        self.profile = get_profile()
+        # name -> path of every PATH executable, from the last PATH scan that finished in time
+        self.path_executables = {}
+        self._realpaths = {}
+        # Serializes catalog writes from concurrent scans in this process
+        self.db_lock = threading.Lock()
+        # Every frontend refreshes through this, so concurrent requests share one scan
+        self.scans = ScanCoordinator(self)
+        # Per-plugin status, entry count and milliseconds of the last scan
+        self.scan_metrics = {}
+        # Set when the memory budget cut the current scan short
+        self.scan_truncated = False
+        # Categories and parsed rows must come from this version's rules and parsers
+        self.rules_hash = rules_hash(self.categories)
+        self._check_cache_version()
+    
+    def init_database(self):
+        """Initialize SQLite database for caching"""
+        import sqlite3
+        with sqlite3.connect(self.db_path) as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS applications (
+                    name TEXT PRIMARY KEY,
+                    command TEXT,
+                    description TEXT,
+                    category TEXT,
+                    type TEXT,
+                    icon_path TEXT,
+                    last_used INTEGER DEFAULT 0,
+                    usage_count INTEGER DEFAULT 0,
+                    scan_time INTEGER
+                )
+            ''')
+            # Launch metadata added after the first release
+            existing = {row[1] for row in conn.execute('PRAGMA table_info(applications)')}
+            for column, column_type in LAUNCH_COLUMNS:
+                if column not in existing:
+                    conn.execute(f'ALTER TABLE applications ADD COLUMN {column} {column_type}')
+            # Per-directory PATH listings, reused while the directory mtime is unchanged
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS path_listings (
+                    dir TEXT PRIMARY KEY,
+                    mtime REAL,
+                    executables TEXT
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS favorites (
+                    name TEXT PRIMARY KEY
+                )
+            ''')
+            # Last result of each scanner plugin, reused while its fingerprint is unchanged
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS scanner_cache (
+                    plugin TEXT PRIMARY KEY,
+                    fingerprint TEXT,
+                    entries TEXT,
+                    duration_ms REAL,
+                    scanned_at REAL
+                )
+            ''')
+            # Which parser version and categorization rules produced the cached rows
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS cache_meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                )
+            ''')
+            conn.commit()
+    
+    def _check_cache_version(self):
+        """Reconcile apps.db with this build: re-categorize on new rules, rescan on a new parser"""
+        try:
+            import sqlite3
+            with self.db_lock, sqlite3.connect(self.db_path, timeout=5) as conn:
+                if not conn.execute('SELECT 1 FROM applications LIMIT 1').fetchone():
+                    return  # Nothing cached yet
+                meta = dict(conn.execute('SELECT key, value FROM cache_meta'))
+                if meta.get('parser_version') != str(PARSER_VERSION):
+                    # Rows keep their usage counts but expire, so the next scan rereads everything
+                    conn.execute('UPDATE applications SET scan_time = 0')
+                    conn.execute('DELETE FROM path_listings')
+                    conn.execute('DELETE FROM scanner_cache')
+                    conn.execute('DROP TABLE IF EXISTS man_descriptions')
+                    print("🔄 Scanner updated; the catalog will be rescanned", file=sys.stderr)
+                elif meta.get('rules_hash') != self.rules_hash:
+                    changed = self._recategorize_cached(conn)
+                    print(f"🔄 Categories updated; re-categorized {changed} cached apps", file=sys.stderr)
+                conn.commit()
+        except Exception as e:
+            print(f"Cache version check failed: {e}", file=sys.stderr)
+
+    def _recategorize_cached(self, conn):
+        """Apply the current rules to every cached row in one transaction, without scanning"""
+        rows = conn.execute('SELECT rowid, name, command, description, category FROM applications').fetchall()
+        updates = []
+        for rowid, name, command, description, category in rows:
+            new_category = self._categorize_application(name or '', {
+                'command': command or '', 'description': description or ''})
+            if new_category != category:
+                updates.append((new_category, rowid))
+        conn.executemany('UPDATE applications SET category = ? WHERE rowid = ?', updates)
+        self._write_cache_meta(conn)
+        return len(updates)
+
+    def _write_cache_meta(self, conn):
+        conn.executemany('INSERT OR REPLACE INTO cache_meta (key, value) VALUES (?, ?)', [
+            ('parser_version', str(PARSER_VERSION)),
+            ('rules_hash', self.rules_hash),
+        ])
+
+    def scanner_plugins(self):
+        """Sources of this scan: the core scanners, then the plugins of apex_scanners"""
+        from apex_scanners import BUILTIN_SCANNERS, SCANNERS, CoreScanner
+        plugins = [
+            CoreScanner('desktop', 'desktop', 0, 15.0, self._scan_desktop_files),
+            CoreScanner('flatpak', 'flatpak', 10, 5.0, self._scan_flatpak_packages),
+            CoreScanner('snap', 'snap', 20, 5.0, self._scan_snap_packages),
+            CoreScanner('appimage', 'appimage', 30, 5.0, self._scan_appimage_files),
+            CoreScanner('path', 'cli', 50, 15.0, self._scan_path_commands, man_pages=True),
+        ]
+        if self.system_scope:
+            return plugins  # Plugin sources live in home directories and per-user profiles
+        for plugin_class in BUILTIN_SCANNERS + SCANNERS:
+            try:
+                plugins.append(plugin_class())
+            except Exception as e:
+                print(f"Scanner plugin {plugin_class.__name__} unavailable: {e}", file=sys.stderr)
+        return plugins
+
+    def detect_applications(self, force_refresh=False, cancelled=None):
+        """Bulletproof application detection - never crashes
+
+        cancelled: optional callable polled between scan stages; when it
+        returns True the scan stops with ScanCancelled and writes nothing.
+        """
+        try:
+            current_time = time.time()
+            
+            # Check cache validity - with error handling
+            try:
+                if (not force_refresh and 
+                    current_time - self.last_scan_time < self.cache_duration and 
+                    self.scan_cache):
+                    return self.scan_cache
+            except Exception:
+                pass
+
+            # Fast-path: load from DB if recent - with error handling
+            if not force_refresh:
+                try:
+                    if self.cache_is_fresh(current_time):
+                        apps_by_category = self._catalog_from_cache()
+                        self.scan_cache = apps_by_category
+                        self.last_scan_time = current_time
+                        return apps_by_category
+                except Exception:
+                    pass
+            
+            print("🔍 Starting bulletproof application scan...", file=sys.stderr)
+            # The memory budget covers what this scan adds, not the frontend already loaded
+            self.profile.begin_scan()
+            
+            apps_by_category = {}
+            for cat in list(self.categories.keys()) + ['Other']:
+                apps_by_category[cat] = []
+            
+            # Unchanged system directories come from the package-manager-built index
+            if not self.system_scope:
+                try:
+                    from apex_sysindex import SystemIndex
+                    self.system_index = SystemIndex.open()
+                except Exception:
+                    self.system_index = None
+            
+            # Every source is a scanner plugin, run in parallel with its own time budget
+            from apex_scanners import run_scanners
+            plugins = self.scanner_plugins()
+            self.scan_truncated = False
+            self.path_executables = {}
+            self.source_listings = {}
+            results = run_scanners(self, plugins, workers=min(self.profile.scan_workers, len(plugins)))
+            
+            if cancelled and cancelled():
+                raise ScanCancelled()
+            self._apply_side_results(plugins)
+            
+            # A source that ran over budget or failed may be missing entries: its rows stay
+            failed = {plugin.type for plugin in plugins
+                      if self.scan_metrics.get(plugin.name, {}).get('status') in ('over budget', 'error')}
+            
+            total_found = sum(len(apps) for apps in results.values() if isinstance(apps, dict))
+            found = ', '.join(f"{len(results.get(plugin.name) or {})} {plugin.name}" for plugin in plugins
+                              if results.get(plugin.name) or plugin.name in ('desktop', 'path'))
+            print(f"Found: {found} (total: {total_found})", file=sys.stderr)
+            
+            # Merge with priority: one record per program, other sources kept as alternatives
+            priority = {plugin.type: plugin.priority for plugin in plugins}
+            all_apps = {}
+            identities = {}  # identity key -> name of the merged record
+            self._realpaths = {}
+            duplicates = 0
+            
+            truncated = False
+            for plugin in sorted(plugins, key=lambda plugin: plugin.priority):
+                src_apps = results.get(plugin.name)
+                if truncated or not isinstance(src_apps, dict):
+                    continue
+                self._mark_available(src_apps)
+                for name, info in src_apps.items():
+                    if self.profile.over_budget():
+                        print(f"⚠️ Memory budget ({self.profile.rss_budget_mb} MB) reached; "
+                              "catalog truncated", file=sys.stderr)
+                        self.scan_truncated = truncated = True
+                        break
+                    try:
+                        if not name or not isinstance(info, dict):
+                            continue
+                        keys = self._identity_keys(info)
+                        primary = name if name in all_apps else None
+                        for key in keys:
+                            if primary is not None:
+                                break
+                            match = identities.get(key)
+                            # Distinct PATH names sharing a binary (busybox applets) stay separate
+                            if match and not (info.get('type') == 'cli' and all_apps[match].get('type') == 'cli'):
+                                primary = match
+                        if primary is None:
+                            all_apps[name] = info
+                            primary = name
+                        else:
+                            self._merge_duplicate(all_apps, primary, name, info, priority)
+                            duplicates += 1
+                        for key in keys:
+                            identities.setdefault(key, primary)
+                    except Exception:
+                        continue
+            if duplicates:
+                print(f"Merged {duplicates} duplicate entries", file=sys.stderr)
+            
+            # Man-page summaries replace the CLI placeholder before categorizing
+            self._add_man_descriptions(all_apps, {plugin.type for plugin in plugins if plugin.man_pages})
+            
+            # Launch counts recorded by any frontend
+            usage = self._load_usage()
+            
+            # Safer categorization
+            for name, info in all_apps.items():
+                try:
+                    category = self._categorize_application(name, info)
+                    if category not in apps_by_category:
+                        category = 'Other'
+                    
+                    app_entry = {
+                        'name': name or 'Unknown',
+                        'command': info.get('command', name) or 'unknown',
+                        'description': info.get('description', 'Application') or 'Application',
+                        'type': info.get('type', 'unknown'),
+                        'icon_path': info.get('icon_path'),
+                        'category': category,
+                        'usage_count': usage.get(name, 0),
+                        'exec': info.get('exec', ''),
+                        'terminal': bool(info.get('terminal')),
+                        'workdir': info.get('workdir', ''),
+                        'desktop_file': info.get('desktop_file', ''),
+                        'single_instance': bool(info.get('single_instance')),
+                        'available': info.get('available', True),
+                        'alternatives': info.get('alternatives', [])
+                    }
+                    
+                    apps_by_category[category].append(app_entry)
+                except Exception:
+                    continue
+            
+            # Cached rows stand in for what a failed source would have found
+            if failed and not self.system_scope:
+                try:
+                    for app in self.iter_cached():
+                        if app['type'] in failed and app['name'] not in all_apps:
+                            apps_by_category.get(app['category'], apps_by_category['Other']).append(app)
+                except Exception:
+                    pass
+            
+            # Safe sorting
+            for cat in apps_by_category:
+                try:
+                    apps_by_category[cat].sort(
+                        key=lambda x: (-x.get('usage_count', 0), x.get('name','').lower())
+                    )
+                except Exception:
+                    pass
+            
+            # Writers take turns; a superseded scan must not overwrite newer rows
+            with self.db_lock:
+                if cancelled and cancelled():
+                    raise ScanCancelled()
+                
+                # Update cache
+                self.scan_cache = apps_by_category
+                self.last_scan_time = current_time
+                
+                # Safe database update
+                try:
+                    self._update_database(all_apps, current_time, keep_types=failed)
+                    # An incomplete scan can't tell which icons are orphaned
+                    if not (self.system_scope or failed or self.scan_truncated):
+                        self._collect_icon_garbage()
+                    elif self.scan_truncated and not self.system_scope:
+                        # Old rows were kept; show exactly what apps.db now holds
+                        apps_by_category = self.scan_cache = self._catalog_from_cache()
+                except Exception:
+                    pass
+            
+            return apps_by_category
+            
+        except ScanCancelled:
+            raise
+        except Exception as e:
+            # Ultimate fallback - return minimal structure
+            print(f"Scan failed: {e}", file=sys.stderr)
+            return {cat: [] for cat in list(self.categories.keys()) + ['Other']}
+    
+    def _catalog_from_cache(self):
+        """Cached rows grouped by category, most used first"""
+        apps_by_category = {cat: [] for cat in list(self.categories.keys()) + ['Other']}
+        for app in self.iter_cached():
+            apps_by_category[app['category']].append(app)
+        for cat in apps_by_category:
+            try:
+                apps_by_category[cat].sort(key=lambda x: (-x.get('usage_count', 0), x.get('name','').lower()))
+            except Exception:
+                pass
+        return apps_by_category
+
+    def cache_is_fresh(self, now=None):
+        """True when apps.db holds a usable catalog (see _cache_is_fresh)"""
+        try:
+            import sqlite3
+            if not os.path.exists(self.db_path):
+                return False
+            with sqlite3.connect(self.db_path, timeout=5) as conn:
+                last = conn.execute('SELECT MAX(scan_time) FROM applications').fetchone()[0] or 0
+            return bool(last) and self._cache_is_fresh(last, now or time.time())
+        except Exception:
+            return False
+
+    def iter_cached(self, category=None):
+        """Yield cached apps one row at a time, most used first"""
+        import sqlite3
+        with sqlite3.connect(self.db_path, timeout=5) as conn:
+            rows = conn.execute(f'SELECT {CACHE_COLUMNS} FROM applications '
+                                'ORDER BY usage_count DESC, name COLLATE NOCASE')
+            for row in rows:
+                try:
+                    app = _row_to_app(row)
+                except Exception:
+                    continue
+                if category in (None, '', 'All') or app['category'] == category:
+                    yield app
+
+    def find_cached(self, app_id):
+        """Cached app by its numeric id (the SQLite rowid), or None"""
+        import sqlite3
+        with sqlite3.connect(self.db_path, timeout=5) as conn:
+            row = conn.execute(f'SELECT {CACHE_COLUMNS} FROM applications WHERE rowid = ?',
+                               (int(app_id),)).fetchone()
+        return _row_to_app(row) if row else None
+
+    def _cache_is_fresh(self, last_scan, now):
+        """Cached rows are good while young, or while no scanned directory changed since"""
+        if now - last_scan < self.cache_duration:
+            return True
+        # Installs and removals touch the directory mtime
+        watched = desktop_dirs() + [d for d in os.environ.get('PATH', '').split(':') if d]
+        for path in watched:
+            try:
+                if os.stat(path).st_mtime > last_scan:
+                    return False
+            except OSError:
+                continue
+        return True
+
+    def _add_man_descriptions(self, all_apps, types=('cli',)):
+        """Fill command-line descriptions from the bulk man-page index
+
+        'cli' entries only have the placeholder; for the other types in
+        types (pipx, cargo, ...) a man page summary beats the package name.
+        """
+        if not any(info.get('type') in types for info in all_apps.values()):
+            return
+        try:
+            from apex_manpages import ManPageIndex
+            index = ManPageIndex(self.db_path, include_user=not self.system_scope, fallback=self.system_index)
+            with self.db_lock:
+                descriptions = index.load()
+        except Exception as e:
+            print(f"Man page descriptions unavailable: {e}", file=sys.stderr)
+            return
+        for name, info in all_apps.items():
+            if info.get('type') in types and (info.get('type') != 'cli' or info.get('description') == 'CLI tool'):
+                summary = descriptions.get(info.get('command', name))
+                if summary:
+                    info['description'] = summary
+
+    def _identity_keys(self, info):
+        """Keys shared by every copy of one program: desktop-file ID, flatpak/snap ID, executable"""
+        keys = []
+        if info.get('desktop_file'):
+            keys.append('desktop:' + os.path.basename(info['desktop_file'])[:-len('.desktop')])
+        if info.get('app_id'):
+            keys.append(f"{info.get('type')}:{info['app_id']}")
+            if info.get('type') == 'flatpak':
+                # Flatpak exports its launcher as <app id>.desktop
+                keys.append('desktop:' + info['app_id'])
+        try:
+            args = split_exec(unescape_exec(info.get('exec') or info.get('command', '')))
+        except Exception:
+            return keys
+        while args and os.path.basename(args[0]) == 'env':
+            args = args[1:]
+            while args and ('=' in args[0] or args[0].startswith('-')):
+                args = args[1:]
+        if not args:
+            return keys
+        program = os.path.basename(args[0])
+        if program == 'flatpak' and 'run' in args:
+            app_ids = [arg for arg in args[args.index('run') + 1:] if not arg.startswith(('-', '@@', '%'))]
+            if app_ids:
+                keys.append('flatpak:' + app_ids[0])
+                keys.append('desktop:' + app_ids[0])
+        elif args[0].startswith('/snap/bin/'):
+            # Every /snap/bin entry is a symlink to /usr/bin/snap; the name is the identity
+            keys.append('snap:' + program)
+        elif program != 'snap' and all(arg.startswith('%') for arg in args[1:]):
+            # Only a bare program: "libreoffice --calc" and "--writer" are different apps
+            path = args[0] if '/' in args[0] else self.path_executables.get(args[0])
+            if path:
+                real = self._realpaths.get(path)
+                if real is None:
+                    real = self._realpaths[path] = os.path.realpath(path)
+                # Multi-call binaries act on argv[0]: vim/view/vimdiff share one realpath
+                keys.append(f"exe:{real}:{program}")
+        return keys
+
+    def _merge_duplicate(self, all_apps, primary, name, info, priority):
+        """Fold another source's copy into the merged record, best launch target first"""
+        current = all_apps[primary]
+        rank = lambda entry: (entry.get('available') is False, priority.get(entry.get('type', 'cli'), 99))
+        if rank(info) < rank(current):
+            # The better target takes over the record; the old one becomes an alternative
+            info = dict(info, alternatives=current.pop('alternatives', []))
+            current, info = info, current
+            if not current.get('description') or current.get('description') == 'CLI tool':
+                current['description'] = info.get('description', '')
+            all_apps[primary] = current
+        alternatives = current.setdefault('alternatives', [])
+        alternatives.append({
+            'name': name,
+            'type': info.get('type', 'unknown'),
+            'command': info.get('command', ''),
+            'exec': info.get('exec', ''),
+            'desktop_file': info.get('desktop_file', ''),
+            'available': info.get('available', True),
+        })
+        alternatives.sort(key=lambda alt: (alt['available'] is False, priority.get(alt['type'], 99)))
+
+    def _apply_side_results(self, plugins):
+        """Adopt what the core scanners found besides entries.
+
+        Only scanners that finished in time count: one still running past
+        its budget keeps writing into its own dict, never into this scan.
+        """
+        for plugin in plugins:
+            side = getattr(plugin, 'side', None)
+            if not side or self.scan_metrics.get(plugin.name, {}).get('status') != 'scanned':
+                continue
+            if side.get('truncated'):
+                self.scan_truncated = True
+            if 'executables' in side:
+                self.path_executables = side['executables']
+            if side.get('path_listings'):
+                self._save_path_listings(side['path_listings'])
+            self.source_listings.update(side.get('sources', {}))
+
+    def _mark_available(self, all_apps):
+        """Flag entries whose TryExec/Exec target is missing, using the PATH scan's map"""
+        executables = self.path_executables
+        if not executables:
+            return  # PATH scan failed or timed out; don't hide anything
+        on_path = set(executables.values())
+        for info in all_apps.values():
+            if info.get('type') == 'cli':
+                continue  # Came from the PATH scan itself
+            program = info.get('try_exec') or exec_program(info.get('exec') or info.get('command', ''))
+            info['available'] = is_available(program, executables, on_path)
+
+    def _load_usage(self):
+        """name -> usage_count from the cache"""
+        try:
+            import sqlite3
+            with sqlite3.connect(self.db_path, timeout=5) as conn:
+                return dict(conn.execute('SELECT name, usage_count FROM applications WHERE usage_count > 0'))
+        except Exception:
+            return {}
+
+    def _scan_desktop_files(self, side):
+        """Desktop entries from every directory; unchanged system directories come from the system index"""
+        apps = {}
+        system = self._system_sources('desktop')
+        for desktop_dir in (SYSTEM_DESKTOP_DIRS if self.system_scope else desktop_dirs()):
+            mtime = dir_mtime(desktop_dir)
+            cached = system.get(desktop_dir)
+            if cached and cached[0] == mtime:
+                apps.update(cached[1])
+                continue
+            entries = self._scan_desktop_dir(desktop_dir, side)
+            if not side.get('truncated'):
+                # A partial listing would be reused until the directory changes
+                self._record_source(side, 'desktop', desktop_dir, mtime, entries)
+            apps.update(entries)
+        return apps
+
+    def _scan_desktop_dir(self, desktop_dir, side):
+        """Bulletproof desktop file scanning - never crashes"""
+        apps = {}
+        try:
+            if not os.path.exists(desktop_dir) or not os.access(desktop_dir, os.R_OK):
+                return apps
+                
+            # Use os.listdir instead of Path.glob for better error handling
+            try:
+                files = [f for f in os.listdir(desktop_dir) if f.endswith('.desktop')]
+            except (OSError, PermissionError):
+                return apps
+                
+            for filename in files:
+                if self.profile.over_budget():
+                    print(f"⚠️ Memory budget ({self.profile.rss_budget_mb} MB) reached; "
+                          f"skipping the rest of {desktop_dir}", file=sys.stderr)
+                    side['truncated'] = True
+                    break
+                file_path = os.path.join(desktop_dir, filename)
+                try:
+                    # Check file accessibility first
+                    if not os.path.isfile(file_path) or not os.access(file_path, os.R_OK):
+                        continue
+                        
+                    # Check file size to avoid huge files
+                    try:
+                        if os.path.getsize(file_path) > 50000:  # Skip files > 50KB
+                            continue
+                    except OSError:
+                        continue
+                        
+                    name = os.path.splitext(filename)[0]
+                    command = ''
+                    description = 'Application'
+                    en_name = None
+                    en_desc = None
+                    in_entry = False
+                    nodisplay = False
+                    app_type = ''
+                    icon_value = ''
+                    terminal = False
+                    workdir = ''
+                    single_instance = False
+                    try_exec = ''
+                    
+                    # Safe file reading with multiple fallbacks
+                    content = None
+                    for encoding in ['utf-8', 'latin-1', 'ascii']:
+                        try:
+                            with open(file_path, 'r', encoding=encoding, errors='replace') as f:
+                                content = f.read(10000)  # Limit read size
+                            break
+                        except (UnicodeDecodeError, OSError, IOError):
+                            continue
+                            
+                    if not content:
+                        continue
+                        
+                    # Parse content safely
+                    for line in content.split('\n'):  # Already capped by the read size
+                        try:
+                            line = line.strip()
+                            if not line or line.startswith('#'):
+                                continue
+                            if line.startswith('['):
+                                in_entry = (line.lower() == '[desktop entry]')
+                                continue
+                            if not in_entry or '=' not in line:
+                                continue
+                                
+                            try:
+                                key, value = line.split('=', 1)
+                                key = key.strip().lower()
+                                value = value.strip()
+                            except ValueError:
+                                continue
+                                
+                            if key == 'nodisplay':
+                                nodisplay = (value.lower() == 'true')
+                                if nodisplay:
+                                    break
+                            elif key == 'type':
+                                app_type = value.lower()
+                            elif key == 'name':
+                                name = value or name
+                            elif key == 'name[en]':
+                                en_name = value
+                            elif key == 'exec':
+                                command = value
+                            elif key == 'tryexec':
+                                try_exec = value
+                            elif key == 'comment':
+                                description = value or description
+                            elif key == 'comment[en]':
+                                en_desc = value
+                            elif key == 'genericname' and description == 'Application':
+                                description = value
+                            elif key == 'genericname[en]':
+                                if not en_desc:
+                                    en_desc = value
+                            elif key == 'icon':
+                                icon_value = value
+                            elif key == 'terminal':
+                                terminal = (value.lower() == 'true')
+                            elif key == 'path':
+                                workdir = value
+                            elif key in ('singlemainwindow', 'x-gnome-singlewindow'):
+                                single_instance = (value.lower() == 'true')
+                        except Exception:
+                            continue
+
+                    if nodisplay or (app_type and app_type != 'application'):
+                        continue
+
+                    exec_line = command
+                    if command:
+                        try:
+                            # Clean placeholders safely
+                            for placeholder in ['%U', '%F', '%u', '%f', '%i', '%c', '%k']:
+                                command = command.replace(placeholder, '')
+                            command = command.strip()
+                            # Extract executable
+                            if command:
+                                command = command.split()[0]
+                        except Exception:
+                            continue
+
+                    display_name = (en_name or name).strip()
+                    display_desc = (en_desc or description).strip()
+                    
+                    if display_name:  # Only add if we have a name
+                        apps[display_name] = {
+                            'command': command or display_name,
+                            'description': display_desc or 'Application',
+                            'type': 'desktop',
+                            'desktop_file': file_path,
+                            'icon_path': icon_value,
+                            'exec': exec_line,
+                            'terminal': terminal,
+                            'workdir': workdir,
+                            'single_instance': single_instance,
+                            'try_exec': try_exec
+                        }
+                except Exception:
+                    # Silent fail for individual files
+                    continue
+        except Exception:
+            # Silent fail for entire directory
+            pass
+                
+        return apps
+
+    def _system_sources(self, source):
+        """directory -> (mtime, entries) the system index holds for one source"""
+        return self.system_index.sources(source) if self.system_index is not None else {}
+
+    def _fresh_system_source(self, source, directory):
+        """Entries indexed for directory if its mtime still matches, else None"""
+        cached = self._system_sources(source).get(directory)
+        if cached and cached[0] == dir_mtime(directory):
+            return cached[1]
+        return None
+
+    def _record_source(self, side, source, directory, mtime, entries):
+        """Keep a copy of one directory's entries for the system index"""
+        if self.system_scope:
+            import json
+            # Serialized now: merging later mutates the entry dicts
+            side.setdefault('sources', {})[(source, directory)] = (mtime, json.dumps(entries))
+    
+    def _scan_path_commands(self, side):
+        """Executables on the full PATH; unchanged directories come from the listing cache"""
+        apps = {}
+        # Every executable on PATH, first one wins; used to validate Exec targets
+        executables = {}
+        listings = self._load_path_listings()
+        system = self.system_index.path_listings() if self.system_index is not None else {}
+        changed = {}
+        now = time.time()
+        for path_dir, mtime in path_dirs(SYSTEM_PATH_DIRS if self.system_scope else None):
+            cached = listings.get(path_dir)
+            if not (cached and cached[0] == mtime) and system:
+                # /bin on PATH is /usr/bin in the index on merged-/usr systems
+                cached = system.get(path_dir) or system.get(os.path.realpath(path_dir))
+            if cached and cached[0] == mtime:
+                names = cached[1]
+            else:
+                names = list_executables(path_dir)
+                # A listing taken in the same tick as a change could miss it; the
+                # system index is built after the package manager has finished
+                if now - mtime > 1 or self.system_scope:
+                    changed[path_dir] = (mtime, names)
+            for name in names:
+                executables.setdefault(name, os.path.join(path_dir, name))
+                # Earlier PATH entries shadow later ones, as in the shell
+                if name in apps or not _is_cli_candidate(name):
+                    continue
+                apps[name] = {
+                    'command': name,
+                    'description': 'CLI tool',
+                    'type': 'cli'
+                }
+        side['executables'] = executables
+        side['path_listings'] = changed
+        return apps
+
+    def _load_path_listings(self):
+        """directory -> (mtime, executable names) from the cache"""
+        try:
+            import sqlite3
+            with sqlite3.connect(self.db_path, timeout=5) as conn:
+                return {path_dir: (mtime, names.split('\n') if names else [])
+                        for path_dir, mtime, names in conn.execute(
+                            'SELECT dir, mtime, executables FROM path_listings')}
+        except Exception:
+            return {}
+
+    def _save_path_listings(self, listings):
+        try:
+            import sqlite3
+            with self.db_lock, sqlite3.connect(self.db_path, timeout=5) as conn:
+                conn.executemany('INSERT OR REPLACE INTO path_listings (dir, mtime, executables) VALUES (?, ?, ?)',
+                                 [(path_dir, mtime, '\n'.join(names))
+                                  for path_dir, (mtime, names) in listings.items()])
+                conn.commit()
+        except Exception as e:
+            print(f"PATH listing cache error: {e}", file=sys.stderr)
+    
+    def _scan_snap_packages(self, side):
+        """Ultra-fast Snap scanning"""
+        # Snaps are system-wide: the index covers them until one is (un)installed
+        mtime = dir_mtime(SNAP_DIR)
+        if not self.system_scope:
+            indexed = self._fresh_system_source('snap', SNAP_DIR)
+            if indexed is not None:
+                return indexed
+        apps = self._require_listing('snap', self._list_snaps())
+        self._record_source(side, 'snap', SNAP_DIR, mtime, apps)
+        return apps
+    
+    def _list_snaps(self):
+        """Installed snaps, or None when snap list failed or timed out"""
+        apps = {}
+        try:
+            import subprocess
+            result = subprocess.run(['snap', 'list'], 
+                                  capture_output=True, text=True, timeout=3)  # Shorter timeout
+        except FileNotFoundError:
+            return apps  # snapd isn't installed
+        except Exception:
+            return None
+        if result.returncode != 0:
+            return None
+        lines = result.stdout.strip().split('\n')[1:]  # Skip the header
+        for line in lines:
+            try:
+                parts = line.split()
+                if len(parts) >= 1:
+                    name = parts[0]
+                    apps[f"{name}"] = {  # Remove (Snap) suffix for cleaner names
+                        'command': name,
+                        'description': f'Snap: {name}',
+                        'type': 'snap',
+                        'app_id': name
+                    }
+            except Exception:
+                continue
+        return apps
+    
+    def _scan_flatpak_packages(self, side):
+        """System flatpaks from the index when unchanged, plus the user's own installation"""
+        if self.system_scope:
+            mtime = dir_mtime(FLATPAK_SYSTEM_DIR)
+            apps = self._require_listing('flatpak', self._list_flatpaks('--system'))
+            self._record_source(side, 'flatpak', FLATPAK_SYSTEM_DIR, mtime, apps)
+            return apps
+        apps = self._fresh_system_source('flatpak', FLATPAK_SYSTEM_DIR)
+        if apps is None:
+            return self._require_listing('flatpak', self._list_flatpaks())  # Both installations
+        if os.path.isdir(os.path.expanduser('~/.local/share/flatpak/app')):
+            apps.update(self._require_listing('flatpak', self._list_flatpaks('--user')))
+        return apps
+    
+    @staticmethod
+    def _require_listing(tool, apps):
+        """A package listing; a failed one says nothing about what is installed,
+        so it fails the scanner and the old rows stay"""
+        if apps is None:
+            raise RuntimeError(f"{tool} list failed or timed out")
+        return apps
+    
+    def _list_flatpaks(self, installation=None):
+        """Ultra-fast Flatpak scanning; None when flatpak list failed or timed out"""
+        apps = {}
+        try:
+            import subprocess
+            args = ['flatpak', 'list', '--app'] + ([installation] if installation else [])
+            result = subprocess.run(args, 
+                                  capture_output=True, text=True, timeout=3)  # Shorter timeout
+        except FileNotFoundError:
+            return apps  # Flatpak isn't installed
+        except Exception:
+            return None
+        if result.returncode != 0:
+            return None
+        lines = result.stdout.strip().split('\n')
+        for line in lines:
+            try:
+                parts = line.split('\t')
+                if len(parts) >= 2:
+                    name = parts[0]
+                    app_id = parts[1]
+                    apps[name] = {  # Remove (Flatpak) suffix for cleaner names
+                        'command': f'flatpak run {app_id}',
+                        'description': f'Flatpak: {name}',
+                        'type': 'flatpak',
+                        'app_id': app_id
+                    }
+            except Exception:
+                continue
+        return apps
+    
+    def _scan_appimage_files(self, side):
+        """Minimal AppImage scanning - skip for performance"""
+        return {}
+    
+    def _categorize_application(self, name, info):
+        """Advanced application categorization"""
+        name_lower = name.lower()
+        description_lower = info.get('description', '').lower()
+        command_lower = info.get('command', '').lower()
+        
+        # Check all text
+        all_text = f"{name_lower} {description_lower} {command_lower}"
+        
+        # Score each category
+        category_scores = {}
+        for category, keywords in self.categories.items():
+            score = 0
+            for keyword in keywords:
+                if keyword in all_text:
+                    # Weight by keyword position and length
+                    if keyword in name_lower:
+                        score += 3
+                    elif keyword in command_lower:
+                        score += 2
+                    else:
+                        score += 1
+            category_scores[category] = score
+        
+        # Return best matching category
+        if category_scores:
+            best_category = max(category_scores, key=category_scores.get)
+            if category_scores[best_category] > 0:
+                return best_category
+        
+        return 'Other'
+    
+    def _update_database(self, apps, scan_time, keep_types=()):
+        """Update application database
+
+        Rows missing from apps are deleted as uninstalled, except rows of
+        keep_types (sources that failed this scan) and any row at all when
+        the scan was truncated.
+        """
+        try:
+            import json
+            import sqlite3
+            rows = []
+            with sqlite3.connect(self.db_path) as conn:
+                for name, info in apps.items():
+                    rows.append((
+                        name,
+                        info.get('command', ''),
+                        info.get('description', ''),
+                        self._categorize_application(name, info),
+                        info.get('type', ''),
+                        info.get('icon_path'),
+                        scan_time,
+                        info.get('exec', ''),
+                        1 if info.get('terminal') else 0,
+                        info.get('workdir', ''),
+                        info.get('desktop_file', ''),
+                        1 if info.get('single_instance') else 0,
+                        0 if info.get('available') is False else 1,
+                        json.dumps(info['alternatives']) if info.get('alternatives') else None
+                    ))
+                    if len(rows) >= self.profile.batch_size:
+                        self._upsert_rows(conn, rows)
+                        rows = []
+                self._upsert_rows(conn, rows)
+                # Rows not seen in a complete scan belong to uninstalled apps
+                if not self.scan_truncated:
+                    keep = sorted(keep_types)
+                    conn.execute(f"DELETE FROM applications WHERE scan_time < ? "
+                                 f"AND type NOT IN ({', '.join('?' * len(keep))})", [scan_time] + keep)
+                self._write_cache_meta(conn)
+                conn.commit()
+        except Exception as e:
+            print(f"Database update failed: {e}", file=sys.stderr)
+
+    @staticmethod
+    def _upsert_rows(conn, rows):
+        # Upsert so usage_count/last_used survive a rescan
+        conn.executemany('''
+            INSERT INTO applications 
+            (name, command, description, category, type, icon_path, scan_time,
+             exec, terminal, workdir, desktop_file, single_instance, available, alternatives)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                command = excluded.command, description = excluded.description,
+                category = excluded.category, type = excluded.type,
+                icon_path = excluded.icon_path, scan_time = excluded.scan_time,
+                exec = excluded.exec, terminal = excluded.terminal,
+                workdir = excluded.workdir, desktop_file = excluded.desktop_file,
+                single_instance = excluded.single_instance, available = excluded.available,
+                alternatives = excluded.alternatives
+        ''', rows)
+
+    def _collect_icon_garbage(self):
+        """Drop cached icons for apps that are no longer in the database"""
+        try:
+            from apex_icons import _get_icon_generator
+            removed = _get_icon_generator().collect_garbage(self.db_path)
+            if removed:
+                print(f"🧹 Removed {removed} stale icons", file=sys.stderr)
+        except Exception:
+            pass
+
+
+class ScanCancelled(Exception):
+    """A scan stopped because a newer request superseded it"""
+
+
+class ScanCoordinator:
+    """🧭 Single-flight scans: concurrent refreshes share one in-flight scan
+
+    request() returns a concurrent.futures.Future. While a scan runs, further
+    requests get the same future. A forced refresh arriving during a cached
+    (non-forced) load supersedes it: the running scan is cancelled at its next
+    checkpoint and restarted with force_refresh, and every caller receives
+    the newer result.
+    """
+
+    def __init__(self, detector):
+        self.detector = detector
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+        self._future = None
+        self._running_force = False
+        self._pending_force = None
+        self.scans_started = 0
+        self.scans_cancelled = 0
+
+    @property
+    def in_flight(self):
+        return self._future is not None
+
+    def request(self, force_refresh=False):
+        """Future for the catalog, joining the in-flight scan when there is one"""
+        with self._lock:
+            if self._future is not None:
+                if force_refresh and not self._running_force:
+                    # The running scan may serve stale cache; restart it forced
+                    self._pending_force = True
+                    self._cancel.set()
+                return self._future
+            from concurrent.futures import Future
+            self._future = Future()
+            self._pending_force = bool(force_refresh)
+            future = self._future
+        threading.Thread(target=self._run, name='apex-scan', daemon=True).start()
+        return future
+
+    def scan(self, force_refresh=False, timeout=None):
+        """Blocking form of request()"""
+        return self.request(force_refresh).result(timeout)
+
+    def _run(self):
+        while True:
+            with self._lock:
+                future = self._future
+                self._running_force = bool(self._pending_force)
+                self._pending_force = None
+                self._cancel.clear()
+            self.scans_started += 1
+            try:
+                result = self.detector.detect_applications(self._running_force, self._cancel.is_set)
+            except ScanCancelled:
+                self.scans_cancelled += 1
+                continue
+            except Exception as e:
+                with self._lock:
+                    self._future = None
+                future.set_exception(e)
+                return
+            with self._lock:
+                if self._pending_force is not None:
+                    # Superseded after the last checkpoint: run again for the newer request
+                    continue
+                self._future = None
+            future.set_result(result)
+            return
+
+
+def _row_to_app(row):
+    (app_id, name, command, description, category, type_, icon_path, usage,
+     exec_line, terminal, workdir, desktop_file, single_instance, available, alternatives) = row
+    if category not in CATEGORIES:
+        category = 'Other'
+    return {
+        'id': app_id,
+        'name': name or 'Unknown',
+        'command': command or name or 'unknown',
+        'description': description or 'Application',
+        'type': type_ or 'unknown',
+        'icon_path': icon_path,
+        'category': category,
+        'usage_count': usage or 0,
+        'exec': exec_line or '',
+        'terminal': bool(terminal),
+        'workdir': workdir or '',
+        'desktop_file': desktop_file or '',
+        'single_instance': bool(single_instance),
+        'available': available is None or bool(available),
+        'alternatives': _load_alternatives(alternatives)
+    }
+
+
+def _load_alternatives(value):
+    if not value:
+        return []
+    import json
+    try:
+        return json.loads(value)
+    except ValueError:
+        return []
+
+
+def app_record(app):
+    """The script-facing subset of an app entry"""
+    return {key: app.get(key) for key in RECORD_FIELDS}
+
+
+def record_launch(app, db_path=None):
+    """Count a launch in the shared cache so every frontend ranks by usage"""
+    app['usage_count'] = app.get('usage_count', 0) + 1
+    try:
+        import sqlite3
+        with sqlite3.connect(db_path or os.path.join(cache_dir(), 'apps.db'), timeout=2) as conn:
+            conn.execute('UPDATE applications SET usage_count = usage_count + 1, last_used = ? WHERE name = ?',
+                         (int(time.time()), app.get('name')))
+    except Exception as e:
+        print(f"Could not record launch: {e}", file=sys.stderr)
+
+
+def iter_apps(apps_by_category, category='All'):
+    """Flatten a detect_applications() result, optionally to one category"""
+    if category in (None, '', 'All'):
+        return [app for app_list in apps_by_category.values() for app in app_list]
+    return list(apps_by_category.get(category, []))
+
+
+def app_matches(app, query):
+    """Plain substring match on name, command and description (query already lowercased)"""
+    return (query in app.get('name', '').lower() or
+            query in app.get('command', '').lower() or
+            query in app.get('description', '').lower())
+
+
+def _rank(q, name, command, description):
+    """Match rank of lowercased fields against query q (0 best), or None"""
+    if not q or name == q:
+        return 0
+    if name.startswith(q):
+        return 1
+    if q in name or q in command:
+        return 2
+    if q in description:
+        return 3
+    return None
+
+
+def search_apps(apps, query='', limit=None):
+    """Rank apps against a query: exact name, name prefix, name/command substring, description.
+
+    An empty query returns every app sorted by name.
+    """
+    q = str(query).lower().strip()
+    hits = []
+    for app in apps:
+        name = app.get('name', '').lower()
+        rank = _rank(q, name, app.get('command', '').lower(), app.get('description', '').lower())
+        if rank is not None:
+            hits.append((rank, name, app))
+    hits.sort(key=lambda hit: (hit[0], hit[1]))
+    if limit is not None:
+        hits = hits[:max(0, int(limit))]
+    return [app for _rank, _name, app in hits]
+
+
+class SearchIndex:
+    """🔎 Pre-lowercased app index for search-as-you-type
+
+    Ranks like search_apps. A query that extends the previous one only
+    re-checks the previous matches: every hit for "fire" is a hit for "fir".
+    """
+
+    def __init__(self, apps):
+        # Name order up front, so ranking is bucketing rather than sorting
+        self.entries = sorted(((app.get('name', '').lower(), app.get('command', '').lower(),
+                                app.get('description', '').lower(), app) for app in apps),
+                              key=lambda entry: entry[0])
+        self._all = [entry[3] for entry in self.entries]
+        self._last_query = None
+        self._last_matches = self.entries
+
+    def __len__(self):
+        return len(self.entries)
+
+    def search(self, query='', limit=None):
+        q = str(query).lower().strip()
+        if not q:
+            self._last_query, self._last_matches = q, self.entries
+            return self._all[:max(0, int(limit))] if limit is not None else list(self._all)
+        if self._last_query is not None and q.startswith(self._last_query):
+            pool = self._last_matches
+        else:
+            pool = self.entries
+        matches = []
+        buckets = ([], [], [], [])
+        for entry in pool:
+            rank = _rank(q, entry[0], entry[1], entry[2])
+            if rank is not None:
+                matches.append(entry)
+                buckets[rank].append(entry[3])
+        self._last_query, self._last_matches = q, matches
+        results = buckets[0] + buckets[1] + buckets[2] + buckets[3]
+        if limit is not None:
+            results = results[:max(0, int(limit))]
+        return results
+
+
+# Minimum RapidFuzz partial_ratio (0-100) for a fuzzy hit
+FUZZY_SCORE_CUTOFF = 70
+
+
+class FuzzyMatcher:
+    """🧮 Batch fuzzy ranking over a fixed list of apps
+
+    With RapidFuzz installed, each field (name, command, description) is
+    scored against all apps in one process.extract call over precomputed
+    choice lists, with score_cutoff pruning inside the C loop. Without it,
+    or for one-letter queries, SearchIndex ranking is used.
+    """
+
+    FIELDS = ('name', 'command', 'description')
+
+    def __init__(self, apps):
+        self.apps = list(apps)
+        self._index = None
+        try:
+            from rapidfuzz import fuzz, process
+            self._scorer, self._process, self._ratio = fuzz.partial_ratio, process, fuzz.ratio
+        except ImportError:
+            self._scorer = self._process = self._ratio = None
+        self.choices = None
+        if self._process is not None:
+            self.choices = [[app.get(field, '').lower() for app in self.apps] for field in self.FIELDS]
+
+    @property
+    def fuzzy(self):
+        return self._process is not None
+
+    def search(self, query, limit=None, score_cutoff=FUZZY_SCORE_CUTOFF):
+        """Best matches first, at most limit of them"""
+        q = str(query).lower().strip()
+        if not self.fuzzy or len(q) < 2:
+            if self._index is None:
+                self._index = SearchIndex(self.apps)
+            return self._index.search(q, limit)
+        best = {}
+        for choices in self.choices:
+            for choice, score, i in self._process.extract(q, choices, scorer=self._scorer, processor=None,
+                                                           limit=None, score_cutoff=score_cutoff):
+                # partial_ratio also aligns a short choice inside the query
+                # ("x" scores 100 against "firefx"): require a comparable length
+                if len(choice) * 4 < len(q) * 3:
+                    continue
+                if score > best.get(i, -1):
+                    best[i] = score
+        names, commands, descriptions = self.choices
+
+        def order(i):
+            # Equal scores: exact/prefix/substring matches first, then the
+            # closer whole-name match, then by name
+            rank = _rank(q, names[i], commands[i], descriptions[i])
+            return (-best[i], 4 if rank is None else rank, -self._ratio(q, names[i]), names[i])
+
+        ranked = sorted(best, key=order)
+        if limit is not None:
+            ranked = ranked[:max(0, int(limit))]
+        return [self.apps[i] for i in ranked]
+
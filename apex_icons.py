@@ -0,0 +1,776 @@
+#!/usr/bin/env python3
+"""
+🎨 APEX Launcher - Icon Engine
+Automatic icon generation for applications without a real icon.
+
+Kept free of any Qt import so icon rendering can run in worker
+processes and headless tools without paying for PyQt5.
+"""
+
+import os
+import json
+import time
+import atexit
+import hashlib
+import mmap
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from functools import lru_cache
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+# Below this many missing icons a process pool costs more than it saves
+POOL_THRESHOLD = 32
+
+# Disk budget for generated icons when the resource profile is unavailable
+DEFAULT_ICON_CACHE_MB = 64
+
+MANIFEST_NAME = 'manifest.json'
+
+# Physical icon sizes kept for the 64px card icon: 1x, 1.5x and 2x screens
+ICON_SIZES = (64, 96, 128)
+
+# Icon theme lookup, largest first; PIL cannot read SVG so scalable is skipped
+ICON_THEME_DIRS = [
+    f"/usr/share/icons/hicolor/{size}x{size}/apps"
+    for size in (256, 192, 128, 96, 64, 48)
+] + ['/usr/share/pixmaps']
+
+ICON_EXTENSIONS = ('.png', '.xpm')
+
+# Compact an atlas once this share of its slots belongs to evicted icons
+ATLAS_COMPACT_RATIO = 0.5
+
+FONT_CANDIDATES = [
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans-Bold.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans-Bold.ttf",
+    "arial.ttf",
+]
+
+
+@lru_cache(maxsize=None)
+def _load_font(font_size):
+    """Load the symbol font once per size"""
+    for candidate in FONT_CANDIDATES:
+        try:
+            return ImageFont.truetype(candidate, font_size)
+        except Exception:
+            continue
+    return ImageFont.load_default()
+
+
+@lru_cache(maxsize=None)
+def _hex_to_rgb(hex_color):
+    """Convert hex color to RGB tuple"""
+    hex_color = hex_color.lstrip('#')
+    return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
+
+
+@lru_cache(maxsize=4096)
+def resolve_icon_file(icon_value):
+    """Resolve a desktop-entry Icon= value to a raster file PIL can read"""
+    if not icon_value:
+        return None
+    if os.path.isabs(icon_value):
+        if icon_value.lower().endswith(ICON_EXTENSIONS) and os.path.isfile(icon_value):
+            return icon_value
+        return None
+    for icon_dir in ICON_THEME_DIRS:
+        for ext in ICON_EXTENSIONS:
+            candidate = os.path.join(icon_dir, icon_value + ext)
+            if os.path.isfile(candidate):
+                return candidate
+    return None
+
+
+class IconCache:
+    """🗂️ Indexed icon cache with a disk budget and LRU eviction
+
+    The manifest maps "name\0category\0size" to the cached file, its size
+    in bytes and the last access time. It is read once; lookups after that
+    are pure dictionary hits with no hashing or stat calls.
+    """
+
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_path = self.cache_dir / MANIFEST_NAME
+        if max_bytes is None:
+            # Sized to the host by the resource profile (APEX_ICON_CACHE_MB still wins)
+            try:
+                from apex_resources import get_profile
+                max_bytes = get_profile().icon_cache_mb * 1024 * 1024
+            except Exception:
+                max_bytes = DEFAULT_ICON_CACHE_MB * 1024 * 1024
+        self.max_bytes = max_bytes
+        self.entries = {}
+        self.total_bytes = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self._load()
+        atexit.register(self.flush)
+
+    @staticmethod
+    def make_key(app_name, category, size):
+        return f"{app_name}\0{category}\0{size}"
+
+    def _load(self):
+        """Load the manifest into memory (once)"""
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries = data.get('entries', {}) if isinstance(data, dict) else {}
+        except (OSError, ValueError):
+            entries = {}
+        for key, entry in entries.items():
+            try:
+                self.entries[key] = {
+                    'file': str(entry['file']),
+                    'bytes': int(entry.get('bytes', 0)),
+                    'atime': float(entry.get('atime', 0)),
+                }
+            except (KeyError, TypeError, ValueError):
+                continue
+        self.total_bytes = sum(e['bytes'] for e in self.entries.values())
+
+    def flush(self):
+        """Write the manifest back if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            # Copy so concurrent add() calls can't resize the dict mid-dump
+            data = {'version': 1, 'entries': dict(self.entries)}
+            self._dirty = False
+        try:
+            tmp_path = self.manifest_path.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp_path, self.manifest_path)
+        except OSError as e:
+            print(f"Icon manifest update failed: {e}")
+
+    def lookup(self, app_name, category, size):
+        """Return the cached icon path (and mark it used) or None"""
+        entry = self.entries.get(self.make_key(app_name, category, size))
+        if entry is None:
+            return None
+        entry['atime'] = time.time()
+        self._dirty = True
+        return str(self.cache_dir / entry['file'])
+
+    def add(self, app_name, category, size, path):
+        """Register a freshly written icon file"""
+        try:
+            nbytes = os.path.getsize(path)
+        except OSError:
+            return
+        key = self.make_key(app_name, category, size)
+        with self._lock:
+            old = self.entries.get(key)
+            if old:
+                self.total_bytes -= old['bytes']
+            self.entries[key] = {'file': os.path.basename(path), 'bytes': nbytes, 'atime': time.time()}
+            self.total_bytes += nbytes
+            self._dirty = True
+
+    def add_many(self, app_name, category, targets):
+        """Register several sizes of one icon, given as (size, path) pairs"""
+        for size, path in targets:
+            self.add(app_name, category, size, path)
+
+    def enforce_budget(self):
+        """Evict least recently used icons until the cache fits its budget"""
+        with self._lock:
+            if self.total_bytes <= self.max_bytes:
+                return 0
+            # Evict down to 90% so we don't thrash right at the limit
+            target = int(self.max_bytes * 0.9)
+            victims = []
+            for key, entry in sorted(self.entries.items(), key=lambda item: item[1]['atime']):
+                if self.total_bytes <= target:
+                    break
+                victims.append(self.entries.pop(key))
+                self.total_bytes -= entry['bytes']
+            self._dirty = True
+        for entry in victims:
+            self._unlink(entry['file'])
+        return len(victims)
+
+    def remove_where(self, predicate):
+        """Drop every entry whose (name, category) fails `predicate`"""
+        with self._lock:
+            victims = []
+            for key in list(self.entries):
+                name, category, _size = key.split('\0', 2)
+                if not predicate(name, category):
+                    entry = self.entries.pop(key)
+                    self.total_bytes -= entry['bytes']
+                    victims.append(entry)
+            if victims:
+                self._dirty = True
+        for entry in victims:
+            self._unlink(entry['file'])
+        return len(victims)
+
+    def collect_garbage(self, db_path):
+        """Remove icons for apps (or app/category pairs) no longer in apps.db,
+        plus stray files the manifest doesn't know about"""
+        import sqlite3
+        try:
+            with sqlite3.connect(db_path, timeout=5) as conn:
+                live = set(conn.execute('SELECT name, category FROM applications'))
+        except Exception as e:
+            print(f"Icon cache GC skipped: {e}")
+            return 0
+
+        removed = self.remove_where(lambda name, category: (name, category) in live)
+
+        # Orphaned PNGs (manifest lost, interrupted writes, old cache layouts)
+        known = {entry['file'] for entry in self.entries.values()}
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name == MANIFEST_NAME or entry.name in known:
+                        continue
+                    if entry.name.endswith(('.png', '.tmp')):
+                        self._unlink(entry.name)
+                        removed += 1
+        except OSError:
+            pass
+
+        self.flush()
+        return removed
+
+    def _unlink(self, filename):
+        try:
+            os.unlink(self.cache_dir / filename)
+        except OSError:
+            pass
+
+
+class IconAtlas:
+    """🧩 One sprite sheet per icon size, mmap'd for zero-open icon loading
+
+    `atlas-<size>.rgba` is a vertical strip of size x size RGBA8888 sprites
+    stored back to back; `atlas-<size>.json` maps "name\0category" to a
+    slot. The strip is append-only, so new icons are added without
+    rewriting existing ones and a reader's older mapping stays valid.
+    Writers in every process serialize on `atlas-<size>.lock` and re-read
+    the index under it; the strip only ever grows in place.
+    """
+
+    def __init__(self, cache_dir, size=64):
+        self.cache_dir = Path(cache_dir)
+        self.size = size
+        self.sprite_bytes = size * size * 4
+        self.data_path = self.cache_dir / f'atlas-{size}.rgba'
+        self.index_path = self.cache_dir / f'atlas-{size}.json'
+        # Separate file: compaction replaces the strip, and a lock on it would go with it
+        self.lock_path = self.cache_dir / f'atlas-{size}.lock'
+        self.index = {}
+        self.slots = 0
+        # Bumped whenever a key moves or goes away, so sliced copies can be dropped
+        self.generation = 0
+        self._mm = None
+        self._lock = threading.Lock()
+        self.load()
+
+    @staticmethod
+    def make_key(app_name, category):
+        return f"{app_name}\0{category}"
+
+    def load(self):
+        """Read the offset table and map the sprite sheet"""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('size') != self.size:
+                raise ValueError('atlas size mismatch')
+            index = {str(k): int(v) for k, v in data.get('index', {}).items()}
+            slots = int(data.get('slots', 0))
+        except (OSError, ValueError, TypeError, AttributeError):
+            index, slots = {}, 0
+        if any(index.get(key) != slot for key, slot in self.index.items()):
+            self.generation += 1  # Compacted by another process
+        self.index = index
+        self.slots = slots
+        self._remap()
+
+    @contextmanager
+    def _file_lock(self):
+        """Exclusive across processes (and, via self._lock, across threads)"""
+        with self._lock:
+            if fcntl is None:
+                yield
+                return
+            with open(self.lock_path, 'a') as lock:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _remap(self):
+        self._mm = None
+        try:
+            with open(self.data_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size >= self.slots * self.sprite_bytes > 0:
+                    self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            self._mm = None
+        if self._mm is None:
+            self.index, self.slots = {}, 0
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def get(self, app_name, category):
+        """Raw RGBA bytes for an icon, or None"""
+        slot = self.index.get(self.make_key(app_name, category))
+        mm = self._mm
+        if slot is None or mm is None:
+            return None
+        offset = slot * self.sprite_bytes
+        return mm[offset:offset + self.sprite_bytes]
+
+    def add_files(self, items):
+        """Append icons given as (app_name, category, png_path) to the atlas"""
+        sprites = []
+        for app_name, category, path in items:
+            key = self.make_key(app_name, category)
+            if key in self.index:
+                continue
+            try:
+                with Image.open(path) as img:
+                    img = img.convert('RGBA')
+                    if img.size != (self.size, self.size):
+                        img = img.resize((self.size, self.size), Image.LANCZOS)
+                    sprites.append((key, img.tobytes()))
+            except Exception:
+                continue
+        if not sprites:
+            return 0
+
+        try:
+            with self._file_lock():
+                # Another process may have appended since we last looked
+                self.load()
+                index = dict(self.index)
+                sprites = [(key, data) for key, data in sprites if key not in index]
+                if not sprites:
+                    return 0
+                with open(self.data_path, 'ab'):
+                    pass  # Create without touching existing data
+                with open(self.data_path, 'r+b') as f:
+                    # Past the end of the file: a partial tail from an interrupted
+                    # append is skipped, never truncated under someone's mmap
+                    size = os.fstat(f.fileno()).st_size
+                    slots = max(self.slots, -(-size // self.sprite_bytes))
+                    f.seek(slots * self.sprite_bytes)
+                    for key, data in sprites:
+                        f.write(data)
+                        index[key] = slots
+                        slots += 1
+                self._write_index(index, slots)
+                self.index, self.slots = index, slots
+                self._remap()
+        except OSError as e:
+            print(f"Icon atlas update failed: {e}")
+            return 0
+        return len(sprites)
+
+    def retain(self, keep):
+        """Forget icons whose key fails `keep`; compacts when mostly dead"""
+        with self._file_lock():
+            self.load()
+            index = {key: slot for key, slot in self.index.items() if keep(key)}
+            if len(index) == len(self.index):
+                return
+            self.generation += 1
+            if self.slots and len(index) < self.slots * (1 - ATLAS_COMPACT_RATIO):
+                self._compact(index)
+            else:
+                self._write_index(index, self.slots)
+                self.index = index
+
+    def _compact(self, index):
+        """Rewrite the sprite sheet with only live slots"""
+        mm = self._mm
+        new_index = {}
+        tmp_path = self.data_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'wb') as f:
+                for new_slot, (key, slot) in enumerate(sorted(index.items(), key=lambda item: item[1])):
+                    offset = slot * self.sprite_bytes
+                    f.write(mm[offset:offset + self.sprite_bytes])
+                    new_index[key] = new_slot
+            os.replace(tmp_path, self.data_path)
+        except (OSError, TypeError) as e:
+            print(f"Icon atlas compaction failed: {e}")
+            return
+        self._write_index(new_index, len(new_index))
+        self.index, self.slots = new_index, len(new_index)
+        self._remap()
+
+    def _write_index(self, index, slots):
+        tmp_path = self.index_path.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'size': self.size, 'slots': slots, 'index': index},
+                          f, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            print(f"Icon atlas index update failed: {e}")
+
+
+class IconGenerator:
+    """🎨 Automatic Icon Generator for Applications"""
+
+    def __init__(self, cache_dir=None, max_cache_bytes=None, use_index=True):
+        self.icon_cache_dir = Path(cache_dir) if cache_dir else Path.home() / '.cache' / 'apex-launcher' / 'icons'
+        self.icon_cache_dir.mkdir(parents=True, exist_ok=True)
+        self.cache = IconCache(self.icon_cache_dir, max_cache_bytes) if use_index else None
+        self.atlases = {}
+        # Garbage collection must not sweep files a running batch is still writing
+        self._batch_lock = threading.Lock()
+
+        # Prebuilt gradient + rounded mask + shine, keyed by (category, size)
+        self._backgrounds = {}
+
+        # Category-based icon mappings
+        self.category_icons = {
+            'Programming': {'color': '#4CAF50', 'symbol': '💻', 'gradient': ['#4CAF50', '#45a049']},
+            'Security': {'color': '#F44336', 'symbol': '🔒', 'gradient': ['#F44336', '#d32f2f']},
+            'System': {'color': '#FF9800', 'symbol': '⚙️', 'gradient': ['#FF9800', '#f57c00']},
+            'Internet': {'color': '#2196F3', 'symbol': '🌐', 'gradient': ['#2196F3', '#1976d2']},
+            'Media': {'color': '#9C27B0', 'symbol': '🎬', 'gradient': ['#9C27B0', '#7b1fa2']},
+            'Office': {'color': '#607D8B', 'symbol': '📄', 'gradient': ['#607D8B', '#455a64']},
+            'Graphics': {'color': '#E91E63', 'symbol': '🎨', 'gradient': ['#E91E63', '#c2185b']},
+            'Games': {'color': '#3F51B5', 'symbol': '🎮', 'gradient': ['#3F51B5', '#303f9f']},
+            'Development': {'color': '#009688', 'symbol': '🔧', 'gradient': ['#009688', '#00796b']},
+            'Education': {'color': '#795548', 'symbol': '📚', 'gradient': ['#795548', '#5d4037']},
+            'Other': {'color': '#9E9E9E', 'symbol': '📁', 'gradient': ['#9E9E9E', '#757575']}
+        }
+
+        # Application-specific icons
+        self.app_specific_icons = {
+            'firefox': '🔥', 'chrome': '🌎', 'code': '💻', 'vscode': '💻',
+            'terminal': '⚡', 'konsole': '⚡', 'gnome-terminal': '⚡',
+            'nautilus': '📁', 'dolphin': '📁', 'thunar': '📁',
+            'gimp': '🎨', 'inkscape': '🎨', 'blender': '🎬',
+            'vlc': '▶️', 'spotify': '🎵', 'discord': '💬',
+            'steam': '🎮', 'wine': '🍷', 'lutris': '🎮',
+            'libreoffice': '📄', 'writer': '📝', 'calc': '📊',
+            'thunderbird': '📧', 'evolution': '📧',
+            'virtualbox': '📦', 'vmware': '📦',
+            'wireshark': '🔍', 'nmap': '🔍', 'burpsuite': '🔍'
+        }
+
+    def cache_path_for(self, app_name, category='Other', size=64):
+        """Path of the cached PNG for an icon"""
+        cache_key = hashlib.md5(f"{app_name}_{category}_{size}".encode()).hexdigest()
+        return self.icon_cache_dir / f"{cache_key}.png"
+
+    def generate_icon(self, app_name, category='Other', app_type='desktop', size=64):
+        """Generate a beautiful icon for an application"""
+        try:
+            if not HAS_PIL:
+                # Return text-based icon info for Qt to render
+                return self._generate_qt_icon_info(app_name, category, app_type)
+
+            # Return cached icon if indexed
+            cached = self.cache.lookup(app_name, category, size)
+            if cached:
+                return cached
+
+            cache_path = str(self.cache_path_for(app_name, category, size))
+            if self._render_job((app_name, category, None, ((size, cache_path),))):
+                self._register(app_name, category, ((size, cache_path),))
+                if self.cache.enforce_budget():
+                    self._sync_atlases()
+                return cache_path
+            return self._generate_qt_icon_info(app_name, category, app_type)
+
+        except Exception as e:
+            print(f"Icon generation failed for {app_name}: {e}")
+            return self._generate_qt_icon_info(app_name, category, app_type)
+
+    def generate_icons(self, apps, sizes=ICON_SIZES, max_workers=None):
+        """Generate icons for many applications at once.
+
+        `apps` is an iterable of app dicts (name/category/type/icon_path).
+        Each icon is rendered (or loaded from its resolved theme file) once
+        at the largest of `sizes` and downscaled to the rest in the same
+        job. Returns a dict mapping app name to {size: path}, or to text
+        icon info when PIL is missing. Only icons missing from the cache are
+        produced, and large batches are spread over a process pool.
+        """
+        with self._batch_lock:
+            return self._generate_icons(apps, sizes, max_workers)
+
+    def _generate_icons(self, apps, sizes, max_workers):
+        sizes = tuple(sorted(set(sizes), reverse=True))
+        results = {}
+        missing = []
+        atlas_pending = []
+
+        for app in apps:
+            name = app.get('name')
+            if not name:
+                continue
+            category = app.get('category', 'Other')
+            if not HAS_PIL:
+                results[name] = self._generate_qt_icon_info(name, category, app.get('type', 'desktop'))
+                continue
+            cached = {size: self.cache.lookup(name, category, size) for size in sizes}
+            if all(cached.values()):
+                results[name] = cached
+                for size, path in cached.items():
+                    if IconAtlas.make_key(name, category) not in self.get_atlas(size):
+                        atlas_pending.append((size, name, category, path))
+            else:
+                targets = tuple((size, str(self.cache_path_for(name, category, size))) for size in sizes)
+                source = resolve_icon_file(app.get('icon_path'))
+                missing.append((name, category, source, targets))
+
+        if missing:
+            if max_workers is None:
+                from apex_resources import get_profile
+                max_workers = get_profile().icon_workers
+            workers = max_workers or 1
+            if len(missing) < POOL_THRESHOLD or workers <= 1:
+                rendered = map(self._render_job, missing)
+            else:
+                try:
+                    pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                               initargs=(str(self.icon_cache_dir),))
+                except Exception:
+                    pool = None
+                rendered = None
+                if pool is not None:
+                    try:
+                        with pool:
+                            chunksize = max(1, len(missing) // (workers * 4))
+                            rendered = list(pool.map(_render_icon_job, missing, chunksize=chunksize))
+                    except (BrokenProcessPool, OSError) as e:
+                        # A worker was killed (OOM) or couldn't start: render here instead
+                        print(f"Icon worker pool failed, rendering in-process: {e}")
+                if rendered is None:
+                    rendered = map(self._render_job, missing)
+
+            for (name, category, _source, targets), ok in zip(missing, rendered):
+                if ok:
+                    self.cache.add_many(name, category, targets)
+                    results[name] = dict(targets)
+                    atlas_pending.extend((size, name, category, path) for size, path in targets)
+                else:
+                    results[name] = self._generate_qt_icon_info(name, category, 'desktop')
+
+        for size in sizes:
+            items = [(name, category, path) for s, name, category, path in atlas_pending if s == size]
+            if items:
+                self.get_atlas(size).add_files(items)
+        if self.cache.enforce_budget():
+            self._sync_atlases()
+        self.cache.flush()
+        return results
+
+    def _register(self, app_name, category, targets):
+        """Index freshly written icons and append them to their atlases"""
+        self.cache.add_many(app_name, category, targets)
+        for size, path in targets:
+            self.get_atlas(size).add_files([(app_name, category, path)])
+
+    def get_atlas(self, size=64):
+        """The sprite sheet for `size`, mapped on first use"""
+        atlas = self.atlases.get(size)
+        if atlas is None:
+            atlas = self.atlases[size] = IconAtlas(self.icon_cache_dir, size)
+        return atlas
+
+    def collect_garbage(self, db_path):
+        """Remove icons for apps gone from apps.db from the cache and atlases"""
+        # A batch is writing icons: skip, the next scan collects instead of waiting
+        if not self._batch_lock.acquire(blocking=False):
+            return 0
+        try:
+            removed = self.cache.collect_garbage(db_path)
+            if removed:
+                self._sync_atlases()
+        finally:
+            self._batch_lock.release()
+        return removed
+
+    def _sync_atlases(self):
+        """Drop atlas slots whose PNG has been evicted from the cache"""
+        live = self.cache.entries
+        for index_path in self.icon_cache_dir.glob('atlas-*.json'):
+            try:
+                size = int(index_path.stem.split('-', 1)[1])
+            except ValueError:
+                continue
+            atlas = self.get_atlas(size)
+            atlas.retain(lambda key, size=size: f"{key}\0{size}" in live)
+
+    def render_icon(self, app_name, category='Other', size=64):
+        """Render an icon image (no caching to disk)"""
+        img = self._get_background(category, size).copy()
+        draw = ImageDraw.Draw(img)
+
+        # Add icon symbol
+        symbol = self._get_app_symbol(app_name, category)
+        font = _load_font(size // 2)
+
+        # Draw symbol
+        bbox = draw.textbbox((0, 0), symbol, font=font)
+        text_width = bbox[2] - bbox[0]
+        text_height = bbox[3] - bbox[1]
+
+        x = (size - text_width) // 2
+        y = (size - text_height) // 2 - 2
+
+        # Add text shadow
+        draw.text((x + 2, y + 2), symbol, font=font, fill=(0, 0, 0, 100))
+        draw.text((x, y), symbol, font=font, fill=(255, 255, 255, 255))
+        return img
+
+    def _render_job(self, job):
+        """Produce one app's icon at every requested size.
+
+        `job` is (name, category, source_file, ((size, path), ...)) with
+        sizes largest first. The largest size is rendered or loaded once and
+        the smaller ones are high-quality downscales of it. Returns True
+        when every file was written.
+        """
+        name, category, source, targets = job
+        try:
+            largest = targets[0][0]
+            img = self._load_source(source, largest) if source else None
+            if img is None:
+                img = self.render_icon(name, category, largest)
+            for size, cache_path in targets:
+                if size != img.width:
+                    img = img.resize((size, size), Image.LANCZOS)
+                # Write atomically so concurrent readers never see half a PNG;
+                # light compression since the atlas, not the PNG, is the read path
+                tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+                img.save(tmp_path, 'PNG', compress_level=1)
+                os.replace(tmp_path, cache_path)
+            return True
+        except Exception as e:
+            print(f"Icon generation failed for {name}: {e}")
+            return False
+
+    def _load_source(self, path, size):
+        """Load a resolved icon file centered on a transparent size x size canvas"""
+        try:
+            with Image.open(path) as src:
+                src = src.convert('RGBA')
+                src.thumbnail((size, size), Image.LANCZOS)
+                if src.width < size // 2:
+                    # Tiny legacy pixmaps look worse blown up than a generated icon
+                    return None
+                canvas = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+                canvas.paste(src, ((size - src.width) // 2, (size - src.height) // 2))
+                return canvas
+        except Exception:
+            return None
+
+    def _get_background(self, category, size):
+        """Gradient + rounded corners + shine for a category, built once"""
+        key = (category, size)
+        background = self._backgrounds.get(key)
+        if background is not None:
+            return background
+
+        cat_info = self.category_icons.get(category, self.category_icons['Other'])
+        color1, color2 = (_hex_to_rgb(c) for c in cat_info['gradient'])
+
+        # Vertical 0..255 ramp scaled to icon size, then mapped per channel
+        ramp = Image.linear_gradient('L').resize((size, size))
+        channels = [
+            ramp.point([int(c1 + (c2 - c1) * v / 256) for v in range(256)])
+            for c1, c2 in zip(color1, color2)
+        ]
+
+        # Rounded corners become the alpha channel
+        mask = Image.new('L', (size, size), 0)
+        ImageDraw.Draw(mask).rounded_rectangle([0, 0, size, size], size // 8, fill=255)
+        background = Image.merge('RGBA', channels + [mask])
+
+        # Add shine effect
+        shine = Image.new('RGBA', (size, size), (0, 0, 0, 0))
+        ImageDraw.Draw(shine).ellipse([size//4, size//8, 3*size//4, size//2],
+                                      fill=(255, 255, 255, 40))
+        background = Image.alpha_composite(background, shine)
+
+        self._backgrounds[key] = background
+        return background
+
+    def _generate_qt_icon_info(self, app_name, category, app_type):
+        """Generate icon info for Qt to render (fallback when PIL not available)"""
+        cat_info = self.category_icons.get(category, self.category_icons['Other'])
+        symbol = self._get_app_symbol(app_name, category)
+
+        return {
+            'type': 'text',
+            'symbol': symbol,
+            'color': cat_info['color'],
+            'category': category
+        }
+
+    def _hex_to_rgb(self, hex_color):
+        """Convert hex color to RGB tuple"""
+        return _hex_to_rgb(hex_color)
+
+    def _get_app_symbol(self, app_name, category):
+        """Get symbol for application"""
+        app_lower = app_name.lower()
+
+        # Check app-specific symbols first
+        for app_key, symbol in self.app_specific_icons.items():
+            if app_key in app_lower:
+                return symbol
+
+        # Use category symbol
+        return self.category_icons.get(category, self.category_icons['Other'])['symbol']
+
+
+# Per-process generator used by pool workers, so backgrounds are reused across jobs
+_WORKER_GENERATOR = None
+
+
+def _init_worker(cache_dir):
+    global _WORKER_GENERATOR
+    # Workers only render; the parent process owns the cache index
+    _WORKER_GENERATOR = IconGenerator(cache_dir, use_index=False)
+
+
+def _render_icon_job(job):
+    """Process-pool entry point for IconGenerator._render_job"""
+    global _WORKER_GENERATOR
+    if _WORKER_GENERATOR is None:
+        _WORKER_GENERATOR = IconGenerator(os.path.dirname(job[3][0][1]), use_index=False)
+    return _WORKER_GENERATOR._render_job(job)
+
+
+_ICON_GENERATOR_SINGLETON = None
+
+
+def _get_icon_generator():
+    global _ICON_GENERATOR_SINGLETON
+    if _ICON_GENERATOR_SINGLETON is None:
+        _ICON_GENERATOR_SINGLETON = IconGenerator()
+    return _ICON_GENERATOR_SINGLETON
@@ -0,0 +1,508 @@
+#!/usr/bin/env python3
+"""
+🚀 APEX Launcher - Launch Engine
+Shell-free application launching shared by the GUI and CLI frontends.
+
+Desktop entry Exec lines are parsed into an argv following the Desktop
+Entry Specification (escapes, quoting and field codes), the binary is
+resolved through a cached PATH map and the process is started with
+os.posix_spawn, so no /bin/sh is ever forked.
+"""
+
+import os
+import time
+import errno
+import threading
+
+# shutil, signal, socket and subprocess are imported where used: they cost
+# more import time than the rest of the launch path (see apex_core)
+
+# Seconds between PATH directory mtime checks
+PATH_RECHECK_INTERVAL = 2.0
+
+# Terminal emulators in order of preference, with the flag that starts a command
+TERMINALS = [
+    ('x-terminal-emulator', ['-e']),
+    ('gnome-terminal', ['--']),
+    ('konsole', ['-e']),
+    ('xfce4-terminal', ['-x']),
+    ('alacritty', ['-e']),
+    ('kitty', []),
+    ('foot', []),
+    ('wezterm', ['start', '--']),
+    ('tilix', ['-e']),
+    ('xterm', ['-e']),
+]
+
+# Deprecated field codes that must simply be removed
+_DEPRECATED_CODES = set('dDnNvm')
+
+# Markers flatpak wraps around file arguments in exported Exec lines
+_FLATPAK_MARKERS = {'@@', '@@u', '@@f'}
+
+
+class LaunchError(Exception):
+    """Raised when an application cannot be started"""
+
+
+class LaunchResult:
+    """Outcome of a launch: pid, the argv used and launch-to-spawn latency"""
+
+    __slots__ = ('pid', 'argv', 'latency_ms', 'process', 'reused')
+
+    def __init__(self, pid, argv, latency_ms, process=None, reused=False):
+        self.pid = pid
+        self.argv = argv
+        self.latency_ms = latency_ms
+        self.process = process
+        # True when a single-instance app was already running and nothing was spawned
+        self.reused = reused
+
+    def __repr__(self):
+        return (f"LaunchResult(pid={self.pid}, argv={self.argv!r}, "
+                f"latency_ms={self.latency_ms:.2f}, reused={self.reused})")
+
+
+def unescape_exec(value):
+    """Apply the desktop-entry string escapes (\\s \\n \\t \\r \\\\)"""
+    if '\\' not in value:
+        return value
+    out = []
+    i = 0
+    escapes = {'s': ' ', 'n': '\n', 't': '\t', 'r': '\r', '\\': '\\'}
+    while i < len(value):
+        ch = value[i]
+        if ch == '\\' and i + 1 < len(value) and value[i + 1] in escapes:
+            out.append(escapes[value[i + 1]])
+            i += 2
+            continue
+        out.append(ch)
+        i += 1
+    return ''.join(out)
+
+
+def split_exec(exec_line):
+    """Split an (unescaped) Exec value into arguments using the spec's quoting rules"""
+    args = []
+    current = []
+    in_arg = False
+    quoted = False
+    i = 0
+    while i < len(exec_line):
+        ch = exec_line[i]
+        if quoted:
+            if ch == '\\' and i + 1 < len(exec_line) and exec_line[i + 1] in '"`$\\':
+                current.append(exec_line[i + 1])
+                i += 2
+                continue
+            if ch == '"':
+                quoted = False
+            else:
+                current.append(ch)
+        elif ch == '"':
+            quoted = True
+            in_arg = True
+        elif ch in ' \t\n':
+            if in_arg:
+                args.append(''.join(current))
+                current = []
+                in_arg = False
+        else:
+            current.append(ch)
+            in_arg = True
+        i += 1
+    if in_arg:
+        args.append(''.join(current))
+    return args
+
+
+# Characters that make the spec require an Exec argument to be quoted
+_EXEC_RESERVED = frozenset(' \t\n"\'\\><~|&;$*?#()`')
+
+
+def quote_exec_arg(arg):
+    """One argument as an Exec value; parse_exec(quote_exec_arg(arg)) == [arg]"""
+    arg = arg.replace('%', '%%')
+    if arg and not any(ch in _EXEC_RESERVED for ch in arg):
+        return arg
+    quoted = '"' + ''.join('\\' + ch if ch in '"`$\\' else ch for ch in arg) + '"'
+    # The string-level escapes are undone before splitting (unescape_exec)
+    return quoted.replace('\\', '\\\\')
+
+
+def expand_field_codes(args, files=(), name='', icon='', desktop_file=''):
+    """Expand %f %F %u %U %i %c %k %% in split Exec arguments"""
+    files = [str(f) for f in files]
+    argv = []
+    for arg in args:
+        if arg in _FLATPAK_MARKERS:
+            continue
+        if arg in ('%F', '%U'):
+            argv.extend(files)
+            continue
+        if arg in ('%f', '%u'):
+            argv.extend(files[:1])
+            continue
+        if arg == '%i':
+            if icon:
+                argv.extend(['--icon', icon])
+            continue
+        if '%' not in arg:
+            argv.append(arg)
+            continue
+
+        out = []
+        i = 0
+        while i < len(arg):
+            ch = arg[i]
+            if ch != '%' or i + 1 >= len(arg):
+                out.append(ch)
+                i += 1
+                continue
+            code = arg[i + 1]
+            if code == '%':
+                out.append('%')
+            elif code in 'fu':
+                out.append(files[0] if files else '')
+            elif code in 'FU':
+                out.append(' '.join(files))
+            elif code == 'c':
+                out.append(name)
+            elif code == 'k':
+                out.append(desktop_file)
+            elif code == 'i':
+                out.append(icon)
+            elif code not in _DEPRECATED_CODES:
+                out.append(ch + code)
+            i += 2
+        expanded = ''.join(out)
+        if expanded:
+            argv.append(expanded)
+    return argv
+
+
+def parse_exec(exec_line, files=(), name='', icon='', desktop_file=''):
+    """Turn a raw desktop-entry Exec value into an argv list"""
+    return expand_field_codes(split_exec(unescape_exec(exec_line)), files, name, icon, desktop_file)
+
+
+class PathIndex:
+    """⚡ Cached map of executable name -> first match on $PATH
+
+    Built from directory listings only; the single hit returned by
+    lookup() is checked with os.access. The map is rebuilt when PATH or
+    the mtime of one of its directories changes, checked at most every
+    PATH_RECHECK_INTERVAL seconds.
+    """
+
+    def __init__(self):
+        self._path_env = None
+        self._mtimes = ()
+        self._checked_at = 0.0
+        self.executables = {}
+
+    def _dirs(self):
+        return [d for d in os.environ.get('PATH', '').split(':') if d]
+
+    def _current_mtimes(self, dirs):
+        mtimes = []
+        for d in dirs:
+            try:
+                mtimes.append(os.stat(d).st_mtime_ns)
+            except OSError:
+                mtimes.append(None)
+        return tuple(mtimes)
+
+    def refresh(self, force=False):
+        now = time.monotonic()
+        path_env = os.environ.get('PATH', '')
+        if not force and path_env == self._path_env and now - self._checked_at < PATH_RECHECK_INTERVAL:
+            return
+        dirs = self._dirs()
+        mtimes = self._current_mtimes(dirs)
+        self._checked_at = now
+        if not force and path_env == self._path_env and mtimes == self._mtimes:
+            return
+
+        executables = {}
+        for d in dirs:
+            try:
+                with os.scandir(d) as it:
+                    for entry in it:
+                        executables.setdefault(entry.name, entry.path)
+            except OSError:
+                continue
+        self.executables = executables
+        self._path_env = path_env
+        self._mtimes = mtimes
+
+    def lookup(self, name):
+        """Resolve a command name to an executable path, or None"""
+        self.refresh()
+        path = self.executables.get(name)
+        if path and os.access(path, os.X_OK) and not os.path.isdir(path):
+            return path
+        # Stale map or shadowed non-executable: fall back to a real search
+        import shutil
+        return shutil.which(name)
+
+
+class LaunchEngine:
+    """🚀 Shell-free launcher for detected applications"""
+
+    def __init__(self, path_index=None):
+        self.path_index = path_index or PathIndex()
+        self._terminal = None
+
+    def build_argv(self, app, files=()):
+        """Return (argv, cwd) for an app dict from the detector"""
+        exec_line = (app.get('exec') or '').strip()
+        if exec_line:
+            argv = parse_exec(exec_line, files, app.get('name', ''),
+                              app.get('icon_path') or '', app.get('desktop_file') or '')
+        else:
+            # CLI/snap/flatpak entries and caches without an Exec line
+            command = (app.get('command') or '').strip()
+            argv = expand_field_codes(split_exec(command), files, app.get('name', ''))
+        if not argv:
+            raise LaunchError(f"No command for {app.get('name', 'application')}")
+
+        argv[0] = self.resolve(argv[0])
+
+        if app.get('terminal'):
+            argv = self.terminal_argv() + argv
+
+        cwd = app.get('workdir') or None
+        if cwd:
+            cwd = os.path.expanduser(cwd)
+            if not os.path.isdir(cwd):
+                cwd = None
+        return argv, cwd
+
+    def resolve(self, program):
+        """Resolve argv[0] to an absolute executable path"""
+        program = os.path.expanduser(program)
+        if '/' in program:
+            if os.access(program, os.X_OK):
+                return program
+            raise LaunchError(f"Not executable: {program}")
+        path = self.path_index.lookup(program)
+        if not path:
+            raise LaunchError(f"Command not found: {program}")
+        return path
+
+    def terminal_argv(self):
+        """argv prefix that runs a command inside a terminal emulator"""
+        if self._terminal is None:
+            preferred = os.environ.get('TERMINAL')
+            candidates = ([(preferred, dict(TERMINALS).get(os.path.basename(preferred), ['-e']))]
+                          if preferred else []) + TERMINALS
+            for name, flags in candidates:
+                path = self.path_index.lookup(name) if '/' not in name else (name if os.access(name, os.X_OK) else None)
+                if path:
+                    self._terminal = [path] + flags
+                    break
+            else:
+                raise LaunchError("No terminal emulator found for Terminal=true application")
+        return list(self._terminal)
+
+    def launch(self, app, files=()):
+        """Start an application without a shell and report spawn latency"""
+        started = time.perf_counter()
+        argv, cwd = self.build_argv(app, files)
+        pid, process = self._spawn(argv, cwd)
+        latency_ms = (time.perf_counter() - started) * 1000
+        return LaunchResult(pid, argv, latency_ms, process)
+
+    def _spawn(self, argv, cwd):
+        """posix_spawn when possible; Popen (still shell-free) for Path= or old Pythons.
+
+        Children get their own session so they outlive the launcher and
+        don't receive its terminal's signals.
+        """
+        if cwd is None and hasattr(os, 'posix_spawn'):
+            file_actions = [
+                (os.POSIX_SPAWN_OPEN, 0, os.devnull, os.O_RDONLY, 0),
+                (os.POSIX_SPAWN_OPEN, 1, os.devnull, os.O_WRONLY, 0),
+                (os.POSIX_SPAWN_DUP2, 1, 2),
+            ]
+            try:
+                return os.posix_spawn(argv[0], argv, os.environ,
+                                      file_actions=file_actions, setsid=True), None
+            except OSError as e:
+                raise LaunchError(f"Failed to start {argv[0]}: {e}")
+        import subprocess
+        try:
+            process = subprocess.Popen(argv, cwd=cwd,
+                                       stdin=subprocess.DEVNULL,
+                                       stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL,
+                                       start_new_session=True)
+        except OSError as e:
+            raise LaunchError(f"Failed to start {argv[0]}: {e}")
+        return process.pid, process
+
+
+def app_key(app):
+    """Stable identity for running-instance tracking"""
+    return app.get('desktop_file') or app.get('exec') or app.get('command') or app.get('name', '')
+
+
+class ProcessSupervisor:
+    """👀 Tracks launched children, reaps them as they exit, spots running instances
+
+    Each child gets a pidfd when the kernel supports it; frontends poll
+    `watch_fd(pid)` in their event loop and call `reap()` when it becomes
+    readable. Without pidfds, `install_sigchld()` reaps from a SIGCHLD
+    handler and hands back a wakeup fd for event loops that run outside
+    Python (Qt). Only pids we spawned are waited on, so subprocess.run()
+    elsewhere keeps working.
+    """
+
+    def __init__(self, engine=None):
+        self.engine = engine or get_launch_engine()
+        self.children = {}      # pid -> {'key', 'name', 'started', 'process', 'pidfd'}
+        self.by_key = {}        # app key -> set of pids
+        self.exit_callbacks = []
+        self._lock = threading.RLock()
+        self._wakeup = None
+
+    def launch(self, app, files=(), single_instance=None):
+        """Launch through the engine, short-circuiting single-instance apps already running"""
+        if single_instance is None:
+            single_instance = bool(app.get('single_instance'))
+        key = app_key(app)
+        if single_instance and not files:
+            self.reap()
+            with self._lock:
+                # A reaper thread or SIGCHLD may have dropped a child since; fall through then
+                for pid in sorted(self.by_key.get(key, ())):
+                    child = self.children.get(pid)
+                    if child is not None:
+                        return LaunchResult(pid, [], 0.0, child['process'], reused=True)
+
+        result = self.engine.launch(app, files)
+        with self._lock:
+            self.children[result.pid] = {
+                'key': key,
+                'name': app.get('name', ''),
+                'started': time.time(),
+                'process': result.process,
+                'pidfd': self._open_pidfd(result.pid),
+            }
+            self.by_key.setdefault(key, set()).add(result.pid)
+        return result
+
+    def _open_pidfd(self, pid):
+        if not hasattr(os, 'pidfd_open'):
+            return None
+        try:
+            return os.pidfd_open(pid)
+        except OSError:
+            return None
+
+    def watch_fd(self, pid):
+        """A pollable fd that becomes readable when `pid` exits, or None"""
+        child = self.children.get(pid)
+        return child['pidfd'] if child else None
+
+    def is_running(self, app):
+        return bool(self.by_key.get(app_key(app)))
+
+    def running(self):
+        """Snapshot of live children: list of (pid, name, started)"""
+        with self._lock:
+            return [(pid, c['name'], c['started']) for pid, c in self.children.items()]
+
+    def reap(self):
+        """Collect every exited child without blocking; returns [(pid, status)]"""
+        exited = []
+        with self._lock:
+            for pid, child in list(self.children.items()):
+                process = child['process']
+                try:
+                    if process is not None:
+                        status = process.poll()
+                        if status is None:
+                            continue
+                    else:
+                        done, status = os.waitpid(pid, os.WNOHANG)
+                        if done == 0:
+                            continue
+                        status = os.waitstatus_to_exitcode(status) if hasattr(os, 'waitstatus_to_exitcode') else status
+                except ChildProcessError:
+                    status = None
+                except OSError as e:
+                    if e.errno != errno.EINTR:
+                        status = None
+                    else:
+                        continue
+                self._forget(pid)
+                exited.append((pid, status))
+        for pid, status in exited:
+            for callback in self.exit_callbacks:
+                try:
+                    callback(pid, status)
+                except Exception:
+                    pass
+        return exited
+
+    def _forget(self, pid):
+        child = self.children.pop(pid, None)
+        if not child:
+            return
+        if child['pidfd'] is not None:
+            try:
+                os.close(child['pidfd'])
+            except OSError:
+                pass
+        pids = self.by_key.get(child['key'])
+        if pids:
+            pids.discard(pid)
+            if not pids:
+                del self.by_key[child['key']]
+
+    def install_sigchld(self, wakeup=False):
+        """Reap from a SIGCHLD handler (main thread only).
+
+        With `wakeup=True` returns the read end of a socketpair that becomes
+        readable on every SIGCHLD, for event loops that don't run Python
+        signal handlers promptly on their own.
+        """
+        import signal
+
+        def _on_sigchld(signum, frame):
+            self.reap()
+
+        read_fd = None
+        if wakeup and self._wakeup is None:
+            import socket
+            rsock, wsock = socket.socketpair()
+            rsock.setblocking(False)
+            wsock.setblocking(False)
+            signal.set_wakeup_fd(wsock.fileno(), warn_on_full_buffer=False)
+            self._wakeup = (rsock, wsock)
+        if self._wakeup is not None:
+            read_fd = self._wakeup[0].fileno()
+        signal.signal(signal.SIGCHLD, _on_sigchld)
+        return read_fd
+
+    def drain_wakeup(self):
+        """Empty the SIGCHLD wakeup socket and reap"""
+        if self._wakeup is not None:
+            try:
+                while self._wakeup[0].recv(512):
+                    pass
+            except OSError:
+                pass
+        return self.reap()
+
+
+_LAUNCH_ENGINE_SINGLETON = None
+
+
+def get_launch_engine():
+    global _LAUNCH_ENGINE_SINGLETON
+    if _LAUNCH_ENGINE_SINGLETON is None:
+        _LAUNCH_ENGINE_SINGLETON = LaunchEngine()
+    return _LAUNCH_ENGINE_SINGLETON
@@ -12,34 +12,96 @@ Features:
 - 🚀 10x more powerful than any other launcher
 """
 
-import sys
 import os
-import subprocess
-import configparser
-import threading
+import sys
 import json
-import hashlib
 import time
-import sqlite3
-import shutil
-from concurrent.futures import ThreadPoolExecutor
-from pathlib import Path
-from collections import defaultdict
-from functools import lru_cache
+from collections import OrderedDict
+
+
+class StartupProfile:
+    """⏱️ Per-phase startup timings, printed with --profile-startup"""
+
+    def __init__(self):
+        self.enabled = '--profile-startup' in sys.argv
+        self.start = time.perf_counter()
+        self.marks = []
+        self.reported = False
+
+    def mark(self, phase):
+        if self.enabled:
+            self.marks.append((phase, time.perf_counter()))
+
+    @staticmethod
+    def _interpreter_ms():
+        """Time from process start to this module, from /proc (clock-tick resolution)"""
+        try:
+            with open('/proc/self/stat') as f:
+                start_ticks = int(f.read().rsplit(')', 1)[1].split()[19])
+            with open('/proc/uptime') as f:
+                uptime = float(f.read().split()[0])
+            return max(0.0, (uptime - start_ticks / os.sysconf('SC_CLK_TCK')) * 1000)
+        except Exception:
+            return None
+
+    def report(self):
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+        print("⏱️  Startup profile:", file=sys.stderr)
+        interpreter = self.interpreter_ms
+        if interpreter is not None:
+            print(f"  {'python interpreter':<24} {interpreter:8.1f} ms (approx.)", file=sys.stderr)
+        previous = self.start
+        for phase, stamp in self.marks:
+            print(f"  {phase:<24} {(stamp - previous) * 1000:8.1f} ms   "
+                  f"(at {(stamp - self.start) * 1000:8.1f} ms)", file=sys.stderr)
+            previous = stamp
+
+
+STARTUP = StartupProfile()
+STARTUP.interpreter_ms = STARTUP._interpreter_ms() if STARTUP.enabled else None
+
+
+def _has_display():
+    return bool(os.environ.get('DISPLAY') or os.environ.get('WAYLAND_DISPLAY')
+                or os.environ.get('QT_QPA_PLATFORM'))
+
+
+def _run_cli(reason=None):
+    """Hand over to the terminal frontend in this same interpreter"""
+    if reason:
+        print(f"[apex-launcher] {reason}; falling back to CLI.", file=sys.stderr)
+    try:
+        from smart_cli_launcher import main as cli_main
+    except ImportError as e:
+        print(f"[apex-launcher] CLI unavailable too: {e}", file=sys.stderr)
+        sys.exit(1)
+    cli_main()
+    sys.exit(0)
+
+
+# Decide GUI vs CLI before paying for the Qt import
+if __name__ == "__main__" and ('--cli' in sys.argv or '--tui' in sys.argv):
+    _run_cli()
+if __name__ == "__main__" and not _has_display():
+    _run_cli("no display")
 
 try:
     from PyQt5.QtWidgets import *
     from PyQt5.QtCore import *
     from PyQt5.QtGui import *
+    from PyQt5.QtNetwork import QLocalServer
     HAS_PYQT5 = True
 except ImportError:
     HAS_PYQT5 = False
+STARTUP.mark('import PyQt5')
 
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    HAS_PIL = True
-except ImportError:
-    HAS_PIL = False
+# Qt-free core only; PIL/icon machinery, asyncio (RPC) and the daemon client
+# are imported by the code paths that need them
+from apex_core import (AdvancedApplicationDetector, CATEGORIES, LaunchError, ProcessSupervisor,
+                       get_launch_engine, iter_apps, record_launch, search_apps)
+STARTUP.mark('import core')
 
 # Removed RapidFuzz for lighter weight
 # try:
@@ -59,735 +121,133 @@ if not HAS_PYQT5:
     print("  Arch: sudo pacman -S python-pyqt5") 
     print("  Fedora: sudo dnf install python3-qt5")
     print("  Or via pip: pip3 install --user PyQt5")
-    sys.exit(1)
+    if __name__ == "__main__":
+        _run_cli("GUI unavailable")
+    # Headless callers should use apex_core instead
+    raise ImportError("apex_launcher requires PyQt5")
 
 
-class IconGenerator:
-    """🎨 Automatic Icon Generator for Applications"""
-    
-    def __init__(self):
-        self.icon_cache_dir = Path.home() / '.cache' / 'apex-launcher' / 'icons'
-        self.icon_cache_dir.mkdir(parents=True, exist_ok=True)
-        
-        # Category-based icon mappings
-        self.category_icons = {
-            'Programming': {'color': '#4CAF50', 'symbol': '💻', 'gradient': ['#4CAF50', '#45a049']},
-            'Security': {'color': '#F44336', 'symbol': '🔒', 'gradient': ['#F44336', '#d32f2f']},
-            'System': {'color': '#FF9800', 'symbol': '⚙️', 'gradient': ['#FF9800', '#f57c00']},
-            'Internet': {'color': '#2196F3', 'symbol': '🌐', 'gradient': ['#2196F3', '#1976d2']},
-            'Media': {'color': '#9C27B0', 'symbol': '🎬', 'gradient': ['#9C27B0', '#7b1fa2']},
-            'Office': {'color': '#607D8B', 'symbol': '📄', 'gradient': ['#607D8B', '#455a64']},
-            'Graphics': {'color': '#E91E63', 'symbol': '🎨', 'gradient': ['#E91E63', '#c2185b']},
-            'Games': {'color': '#3F51B5', 'symbol': '🎮', 'gradient': ['#3F51B5', '#303f9f']},
-            'Development': {'color': '#009688', 'symbol': '🔧', 'gradient': ['#009688', '#00796b']},
-            'Education': {'color': '#795548', 'symbol': '📚', 'gradient': ['#795548', '#5d4037']},
-            'Other': {'color': '#9E9E9E', 'symbol': '📁', 'gradient': ['#9E9E9E', '#757575']}
-        }
-        
-        # Application-specific icons
-        self.app_specific_icons = {
-            'firefox': '🔥', 'chrome': '🌎', 'code': '💻', 'vscode': '💻',
-            'terminal': '⚡', 'konsole': '⚡', 'gnome-terminal': '⚡',
-            'nautilus': '📁', 'dolphin': '📁', 'thunar': '📁',
-            'gimp': '🎨', 'inkscape': '🎨', 'blender': '🎬',
-            'vlc': '▶️', 'spotify': '🎵', 'discord': '💬',
-            'steam': '🎮', 'wine': '🍷', 'lutris': '🎮',
-            'libreoffice': '📄', 'writer': '📝', 'calc': '📊',
-            'thunderbird': '📧', 'evolution': '📧',
-            'virtualbox': '📦', 'vmware': '📦',
-            'wireshark': '🔍', 'nmap': '🔍', 'burpsuite': '🔍'
-        }
-    
-    def generate_icon(self, app_name, category='Other', app_type='desktop', size=64):
-        """Generate a beautiful icon for an application"""
-        try:
-            if not HAS_PIL:
-                # Return text-based icon info for Qt to render
-                return self._generate_qt_icon_info(app_name, category, app_type)
-            
-            # Create cache key
-            cache_key = hashlib.md5(f"{app_name}_{category}_{size}".encode()).hexdigest()
-            cache_path = self.icon_cache_dir / f"{cache_key}.png"
-            
-            # Return cached icon if exists
-            if cache_path.exists():
-                return str(cache_path)
-            
-            # Create new icon with PIL
-            img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            draw = ImageDraw.Draw(img)
-            
-            # Get category style
-            cat_info = self.category_icons.get(category, self.category_icons['Other'])
-            gradient = cat_info['gradient']
-            
-            # Create gradient background
-            for y in range(size):
-                ratio = y / size
-                # Interpolate between gradient colors
-                color1 = self._hex_to_rgb(gradient[0])
-                color2 = self._hex_to_rgb(gradient[1])
-                
-                r = int(color1[0] + (color2[0] - color1[0]) * ratio)
-                g = int(color1[1] + (color2[1] - color1[1]) * ratio)
-                b = int(color1[2] + (color2[2] - color1[2]) * ratio)
-                
-                draw.line([(0, y), (size, y)], fill=(r, g, b, 220))
-            
-            # Add rounded corners
-            self._add_rounded_corners(img, radius=size//8)
-            
-            # Add icon symbol
-            symbol = self._get_app_symbol(app_name, category)
-            font_size = size // 2
-            
-            try:
-                # Try to use system font
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-            except:
-                try:
-                    font = ImageFont.truetype("arial.ttf", font_size)
-                except:
-                    font = ImageFont.load_default()
-            
-            # Draw symbol
-            bbox = draw.textbbox((0, 0), symbol, font=font)
-            text_width = bbox[2] - bbox[0]
-            text_height = bbox[3] - bbox[1]
-            
-            x = (size - text_width) // 2
-            y = (size - text_height) // 2 - 2
-            
-            # Add text shadow
-            draw.text((x + 2, y + 2), symbol, font=font, fill=(0, 0, 0, 100))
-            draw.text((x, y), symbol, font=font, fill=(255, 255, 255, 255))
-            
-            # Add shine effect
-            shine = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-            shine_draw = ImageDraw.Draw(shine)
-            shine_draw.ellipse([size//4, size//8, 3*size//4, size//2], 
-                              fill=(255, 255, 255, 40))
-            img = Image.alpha_composite(img, shine)
-            
-            # Save to cache
-            img.save(cache_path, 'PNG')
-            return str(cache_path)
-            
-        except Exception as e:
-            print(f"Icon generation failed for {app_name}: {e}")
-            return self._generate_qt_icon_info(app_name, category, app_type)
-    
-    def _generate_qt_icon_info(self, app_name, category, app_type):
-        """Generate icon info for Qt to render (fallback when PIL not available)"""
-        cat_info = self.category_icons.get(category, self.category_icons['Other'])
-        symbol = self._get_app_symbol(app_name, category)
-        
-        return {
-            'type': 'text',
-            'symbol': symbol,
-            'color': cat_info['color'],
-            'category': category
-        }
-    
-    def _hex_to_rgb(self, hex_color):
-        """Convert hex color to RGB tuple"""
-        hex_color = hex_color.lstrip('#')
-        return tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-    
-    def _add_rounded_corners(self, img, radius):
-        """Add rounded corners to image"""
-        if not HAS_PIL:
-            return
-        mask = Image.new('L', img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.rounded_rectangle([0, 0, img.size[0], img.size[1]], radius, fill=255)
-        
-        output = Image.new('RGBA', img.size, (0, 0, 0, 0))
-        output.paste(img, (0, 0))
-        output.putalpha(mask)
-        img.paste(output)
-    
-    def _get_app_symbol(self, app_name, category):
-        """Get symbol for application"""
-        app_lower = app_name.lower()
-        
-        # Check app-specific symbols first
-        for app_key, symbol in self.app_specific_icons.items():
-            if app_key in app_lower:
-                return symbol
-        
-        # Use category symbol
-        return self.category_icons.get(category, self.category_icons['Other'])['symbol']
+# apex_icons, set by the loader thread once its import has finished.
+# Importing PIL costs ~100 ms, so the GUI thread never does it itself.
+_ICON_MODULE = None
 
 
-_ICON_GENERATOR_SINGLETON = None
+def _loaded_icons():
+    return _ICON_MODULE
 
-def _get_icon_generator():
-    global _ICON_GENERATOR_SINGLETON
-    if _ICON_GENERATOR_SINGLETON is None:
-        _ICON_GENERATOR_SINGLETON = IconGenerator()
-    return _ICON_GENERATOR_SINGLETON
 
+def generate_catalog_icons(apps):
+    """Fill the icon atlas for a list of apps off the GUI thread; True when it ran"""
+    global _ICON_MODULE
+    try:
+        import apex_icons
+        _ICON_MODULE = apex_icons
+    except Exception as e:
+        print(f"Icon support unavailable: {e}")
+        return False
+    if not apex_icons.HAS_PIL:
+        return False
+    try:
+        apex_icons._get_icon_generator().generate_icons(apps)
+        return True
+    except Exception as e:
+        print(f"Icon generation failed: {e}")
+        return False
 
-class AdvancedApplicationDetector:
-    """🔍 Ultra-Advanced Application Detection System"""
-    
-    def __init__(self):
-        self.db_path = Path.home() / '.cache' / 'apex-launcher' / 'apps.db'
-        self.db_path.parent.mkdir(parents=True, exist_ok=True)
-        self.init_database()
-        
-        # Enhanced categories with more keywords
-        self.categories = {
-            'Programming': [
-                'code', 'editor', 'ide', 'python', 'java', 'git', 'vim', 'emacs',
-                'vscode', 'sublime', 'atom', 'eclipse', 'intellij', 'pycharm',
-                'dev', 'develop', 'compiler', 'gcc', 'make', 'cmake', 'ninja',
-                'node', 'npm', 'yarn', 'docker', 'kubernetes', 'k8s'
-            ],
-            'Security': [
-                'security', 'hack', 'nmap', 'wireshark', 'metasploit', 'burp',
-                'kali', 'pen', 'test', 'audit', 'vuln', 'exploit', 'forensic',
-                'john', 'hashcat', 'aircrack', 'sqlmap', 'nikto', 'dirb'
-            ],
-            'System': [
-                'system', 'monitor', 'htop', 'top', 'kill', 'systemctl',
-                'service', 'process', 'task', 'cpu', 'memory', 'disk',
-                'mount', 'fdisk', 'lsblk', 'df', 'free', 'ps', 'systemd'
-            ],
-            'Internet': [
-                'browser', 'firefox', 'chrome', 'chromium', 'wget', 'curl',
-                'thunderbird', 'mail', 'email', 'web', 'http', 'ftp',
-                'download', 'torrent', 'transmission', 'qbittorrent'
-            ],
-            'Media': [
-                'video', 'audio', 'vlc', 'mpv', 'gimp', 'blender', 'spotify',
-                'music', 'player', 'media', 'photo', 'image', 'movie',
-                'kodi', 'plex', 'obs', 'audacity', 'kdenlive'
-            ],
-            'Office': [
-                'office', 'document', 'libreoffice', 'writer', 'calc', 'pdf',
-                'word', 'excel', 'powerpoint', 'presentation', 'spreadsheet',
-                'text', 'editor', 'note', 'markdown'
-            ],
-            'Graphics': [
-                'graphics', 'design', 'gimp', 'inkscape', 'krita', 'darktable',
-                'photo', 'edit', 'draw', 'paint', 'vector', 'raster',
-                'blender', '3d', 'modeling', 'render'
-            ],
-            'Games': [
-                'game', 'steam', 'lutris', 'wine', 'emulator', 'play',
-                'gaming', 'entertainment', 'fun', 'arcade', 'simulation'
-            ],
-            'Development': [
-                'terminal', 'console', 'shell', 'bash', 'zsh', 'fish',
-                'tmux', 'screen', 'ssh', 'ftp', 'rsync', 'scp'
-            ],
-            'Education': [
-                'learn', 'education', 'study', 'tutorial', 'course',
-                'school', 'university', 'research', 'academic'
-            ]
-        }
-        
-        # Performance optimization for minimal systems
-        self.scan_cache = {}
-        self.last_scan_time = 0
-        self.cache_duration = 600  # 10 minutes cache for minimal systems
-        self.max_apps_per_scan = 1000  # Limit for low memory systems
-    
-    def init_database(self):
-        """Initialize SQLite database for caching"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS applications (
-                    name TEXT PRIMARY KEY,
-                    command TEXT,
-                    description TEXT,
-                    category TEXT,
-                    type TEXT,
-                    icon_path TEXT,
-                    last_used INTEGER DEFAULT 0,
-                    usage_count INTEGER DEFAULT 0,
-                    scan_time INTEGER
-                )
-            ''')
-            conn.execute('''
-                CREATE TABLE IF NOT EXISTS favorites (
-                    name TEXT PRIMARY KEY
-                )
-            ''')
-            conn.commit()
-    
-    def detect_applications(self, force_refresh=False):
-        """Bulletproof application detection - never crashes"""
-        try:
-            current_time = time.time()
-            
-            # Check cache validity - with error handling
-            try:
-                if (not force_refresh and 
-                    current_time - self.last_scan_time < self.cache_duration and 
-                    self.scan_cache):
-                    return self.scan_cache
-            except Exception:
-                pass
 
-            # Fast-path: load from DB if recent - with error handling
-            if not force_refresh:
-                try:
-                    if os.path.exists(self.db_path):
-                        with sqlite3.connect(self.db_path, timeout=5) as conn:
-                            last = conn.execute('SELECT MAX(scan_time) FROM applications').fetchone()[0] or 0
-                            if last and (current_time - last) < self.cache_duration:
-                                apps_by_category = {cat: [] for cat in list(self.categories.keys()) + ['Other']}
-                                for row in conn.execute('SELECT name, command, description, category, type, icon_path, usage_count FROM applications'):
-                                    try:
-                                        name, command, description, category, type_, icon_path, usage = row
-                                        category = category or 'Other'
-                                        if category not in apps_by_category:
-                                            category = 'Other'
-                                        apps_by_category[category].append({
-                                            'name': name or 'Unknown',
-                                            'command': command or name or 'unknown',
-                                            'description': description or 'Application',
-                                            'type': type_ or 'unknown',
-                                            'icon_path': icon_path,
-                                            'category': category,
-                                            'usage_count': usage or 0
-                                        })
-                                    except Exception:
-                                        continue
-                                for cat in apps_by_category:
-                                    try:
-                                        apps_by_category[cat].sort(key=lambda x: (-x.get('usage_count', 0), x.get('name','').lower()))
-                                    except Exception:
-                                        pass
-                                self.scan_cache = apps_by_category
-                                self.last_scan_time = current_time
-                                return apps_by_category
-                except Exception:
-                    pass
-            
-            print("🔍 Starting bulletproof application scan...")
-            
-            apps_by_category = {}
-            for cat in list(self.categories.keys()) + ['Other']:
-                apps_by_category[cat] = []
-            
-            # Safer parallel scans with timeouts
-            desktop_apps = {}
-            path_apps = {}
-            snap_apps = {}
-            flatpak_apps = {}
-            appimage_apps = {}
-            
-            try:
-                with ThreadPoolExecutor(max_workers=3, max_queue=10) as pool:  # Reduced workers
-                    futures = {}
-                    futures['desktop'] = pool.submit(self._scan_desktop_files)
-                    futures['path'] = pool.submit(self._scan_path_commands)
-                    futures['snap'] = pool.submit(self._scan_snap_packages)
-                    
-                    # Get results with timeout
-                    for scan_type, future in futures.items():
-                        try:
-                            result = future.result(timeout=15)  # 15 second timeout per scan
-                            if scan_type == 'desktop':
-                                desktop_apps = result
-                            elif scan_type == 'path':
-                                path_apps = result
-                            elif scan_type == 'snap':
-                                snap_apps = result
-                        except Exception:
-                            pass  # Silent fail for individual scans
-                            
-                    # Skip slower scans on minimal systems
-                    try:
-                        flatpak_apps = self._scan_flatpak_packages()
-                    except Exception:
-                        pass
-                        
-            except Exception:
-                # Fallback to single-threaded if threading fails
-                try:
-                    desktop_apps = self._scan_desktop_files()
-                except Exception:
-                    pass
-                try:
-                    path_apps = self._scan_path_commands()  
-                except Exception:
-                    pass
-            
-            total_found = len(desktop_apps) + len(path_apps) + len(snap_apps) + len(flatpak_apps) + len(appimage_apps)
-            print(f"Found: {len(desktop_apps)} desktop, {len(path_apps)} CLI, "
-                  f"{len(snap_apps)} snap, {len(flatpak_apps)} flatpak apps (total: {total_found})")
-            
-            # Safer merge with priority
-            priority = {'desktop': 0, 'flatpak': 1, 'snap': 2, 'appimage': 3, 'cli': 4}
-            all_apps = {}
-            
-            for src_name, src_apps in [('desktop', desktop_apps), ('flatpak', flatpak_apps), 
-                                       ('snap', snap_apps), ('appimage', appimage_apps), ('cli', path_apps)]:
-                if not isinstance(src_apps, dict):
-                    continue
-                for name, info in src_apps.items():
-                    try:
-                        if not name or not isinstance(info, dict):
-                            continue
-                        if name not in all_apps:
-                            all_apps[name] = info
-                        else:
-                            current_priority = priority.get(info.get('type','cli'), 9)
-                            existing_priority = priority.get(all_apps[name].get('type','cli'), 9)
-                            if current_priority < existing_priority:
-                                all_apps[name] = info
-                    except Exception:
-                        continue
-            
-            # Safer categorization
-            for name, info in all_apps.items():
-                try:
-                    category = self._categorize_application(name, info)
-                    if category not in apps_by_category:
-                        category = 'Other'
-                    
-                    app_entry = {
-                        'name': name or 'Unknown',
-                        'command': info.get('command', name) or 'unknown',
-                        'description': info.get('description', 'Application') or 'Application',
-                        'type': info.get('type', 'unknown'),
-                        'icon_path': info.get('icon_path'),
-                        'category': category,
-                        'usage_count': 0
-                    }
-                    
-                    apps_by_category[category].append(app_entry)
-                except Exception:
-                    continue
-            
-            # Safe sorting
-            for cat in apps_by_category:
-                try:
-                    apps_by_category[cat].sort(
-                        key=lambda x: (-x.get('usage_count', 0), x.get('name','').lower())
-                    )
-                except Exception:
-                    pass
-            
-            # Update cache
-            self.scan_cache = apps_by_category
-            self.last_scan_time = current_time
-            
-            # Safe database update
-            try:
-                self._update_database(all_apps, current_time)
-            except Exception:
-                pass
-            
-            return apps_by_category
-            
-        except Exception as e:
-            # Ultimate fallback - return minimal structure
-            print(f"Scan failed: {e}")
-            return {cat: [] for cat in list(self.categories.keys()) + ['Other']}
-    
-    def _scan_desktop_files(self):
-        """Bulletproof desktop file scanning - never crashes"""
-        apps = {}
-        desktop_dirs = [
-            '/usr/share/applications',
-            '/usr/local/share/applications',
-            '/var/lib/flatpak/exports/share/applications',
-            '/var/lib/snapd/desktop/applications',
-            os.path.expanduser('~/.local/share/applications'),
-            os.path.expanduser('~/Desktop')
-        ]
-        
-        for desktop_dir in desktop_dirs:
-            try:
-                if not os.path.exists(desktop_dir) or not os.access(desktop_dir, os.R_OK):
-                    continue
-                    
-                # Use os.listdir instead of Path.glob for better error handling
-                try:
-                    files = [f for f in os.listdir(desktop_dir) if f.endswith('.desktop')]
-                except (OSError, PermissionError):
-                    continue
-                    
-                for filename in files[:200]:  # Limit files to prevent memory issues
-                    file_path = os.path.join(desktop_dir, filename)
-                    try:
-                        # Check file accessibility first
-                        if not os.path.isfile(file_path) or not os.access(file_path, os.R_OK):
-                            continue
-                            
-                        # Check file size to avoid huge files
-                        try:
-                            if os.path.getsize(file_path) > 50000:  # Skip files > 50KB
-                                continue
-                        except OSError:
-                            continue
-                            
-                        name = os.path.splitext(filename)[0]
-                        command = ''
-                        description = 'Application'
-                        en_name = None
-                        en_desc = None
-                        in_entry = False
-                        nodisplay = False
-                        app_type = ''
-                        icon_value = ''
-                        
-                        # Safe file reading with multiple fallbacks
-                        content = None
-                        for encoding in ['utf-8', 'latin-1', 'ascii']:
-                            try:
-                                with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-                                    content = f.read(10000)  # Limit read size
-                                break
-                            except (UnicodeDecodeError, OSError, IOError):
-                                continue
-                                
-                        if not content:
-                            continue
-                            
-                        # Parse content safely
-                        for line in content.split('\n')[:100]:  # Limit lines
-                            try:
-                                line = line.strip()
-                                if not line or line.startswith('#'):
-                                    continue
-                                if line.startswith('['):
-                                    in_entry = (line.lower() == '[desktop entry]')
-                                    continue
-                                if not in_entry or '=' not in line:
-                                    continue
-                                    
-                                try:
-                                    key, value = line.split('=', 1)
-                                    key = key.strip().lower()
-                                    value = value.strip()
-                                except ValueError:
-                                    continue
-                                    
-                                if key == 'nodisplay':
-                                    nodisplay = (value.lower() == 'true')
-                                    if nodisplay:
-                                        break
-                                elif key == 'type':
-                                    app_type = value.lower()
-                                elif key == 'name':
-                                    name = value or name
-                                elif key == 'name[en]':
-                                    en_name = value
-                                elif key == 'exec':
-                                    command = value
-                                elif key == 'comment':
-                                    description = value or description
-                                elif key == 'comment[en]':
-                                    en_desc = value
-                                elif key == 'genericname' and description == 'Application':
-                                    description = value
-                                elif key == 'genericname[en]':
-                                    if not en_desc:
-                                        en_desc = value
-                                elif key == 'icon':
-                                    icon_value = value
-                            except Exception:
-                                continue
-
-                        if nodisplay or (app_type and app_type != 'application'):
-                            continue
-
-                        if command:
-                            try:
-                                # Clean placeholders safely
-                                for placeholder in ['%U', '%F', '%u', '%f', '%i', '%c', '%k']:
-                                    command = command.replace(placeholder, '')
-                                command = command.strip()
-                                # Extract executable
-                                if command:
-                                    command = command.split()[0]
-                            except Exception:
-                                continue
-
-                        display_name = (en_name or name).strip()
-                        display_desc = (en_desc or description).strip()
-                        
-                        if display_name:  # Only add if we have a name
-                            apps[display_name] = {
-                                'command': command or display_name,
-                                'description': display_desc or 'Application',
-                                'type': 'desktop',
-                                'desktop_file': file_path,
-                                'icon_path': icon_value
-                            }
-                    except Exception:
-                        # Silent fail for individual files
-                        continue
-            except Exception:
-                # Silent fail for entire directory
-                continue
-                    
-        return apps
-    
-    def _scan_path_commands(self):
-        """Lightweight PATH scanning for minimal systems"""
-        apps = {}
-        path_dirs = os.environ.get('PATH', '').split(':')
-        
-        # Only scan essential directories to save memory
-        essential_dirs = []
-        for path_dir in path_dirs:
-            if any(essential in path_dir for essential in [
-                '/usr/bin', '/bin', '/usr/local/bin'
-            ]):
-                essential_dirs.append(path_dir)
-        
-        # Limit to 6 directories max for performance
-        for path_dir in essential_dirs[:6]:
-            if not os.path.exists(path_dir):
-                continue
-                
-            try:
-                # Limit entries to prevent memory issues
-                entries = 0
-                with os.scandir(path_dir) as it:
-                    for entry in it:
-                        if entries >= 100:  # Hard limit for minimal systems
-                            break
-                        try:
-                            if not entry.is_file():
-                                continue
-                            name = entry.name
-                            if (name.startswith('.') or len(name) <= 2 or 
-                                name.endswith(('.so', '.a', '.o')) or
-                                name in ['ls', 'cp', 'mv', 'rm', 'cat', 'echo']):  # Skip basic commands
-                                continue
-                            if not os.access(entry.path, os.X_OK):
-                                continue
-                            apps[name] = {
-                                'command': name,
-                                'description': f'CLI tool',
-                                'type': 'cli'
-                            }
-                            entries += 1
-                        except Exception:
-                            continue
-                        
-            except (PermissionError, OSError):
-                continue
-                
-        return apps
-    
-    def _scan_snap_packages(self):
-        """Ultra-fast Snap scanning"""
-        apps = {}
-        try:
-            result = subprocess.run(['snap', 'list'], 
-                                  capture_output=True, text=True, timeout=3)  # Shorter timeout
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[1:11]  # Limit to 10 snaps max
-                for line in lines:
-                    try:
-                        parts = line.split()
-                        if len(parts) >= 1:
-                            name = parts[0]
-                            apps[f"{name}"] = {  # Remove (Snap) suffix for cleaner names
-                                'command': name,
-                                'description': f'Snap: {name}',
-                                'type': 'snap'
-                            }
-                    except Exception:
-                        continue
-        except Exception:
-            pass
-        return apps
-    
-    def _scan_flatpak_packages(self):
-        """Ultra-fast Flatpak scanning"""
-        apps = {}
-        try:
-            result = subprocess.run(['flatpak', 'list', '--app'], 
-                                  capture_output=True, text=True, timeout=3)  # Shorter timeout
-            if result.returncode == 0:
-                lines = result.stdout.strip().split('\n')[:10]  # Limit to 10 flatpaks max
-                for line in lines:
-                    try:
-                        parts = line.split('\t')
-                        if len(parts) >= 2:
-                            name = parts[0]
-                            app_id = parts[1]
-                            apps[name] = {  # Remove (Flatpak) suffix for cleaner names
-                                'command': f'flatpak run {app_id}',
-                                'description': f'Flatpak: {name}',
-                                'type': 'flatpak'
-                            }
-                    except Exception:
-                        continue
-        except Exception:
-            pass
-        return apps
-    
-    def _scan_appimage_files(self):
-        """Minimal AppImage scanning - skip for performance"""
-        return {}
-    
-    def _categorize_application(self, name, info):
-        """Advanced application categorization"""
-        name_lower = name.lower()
-        description_lower = info.get('description', '').lower()
-        command_lower = info.get('command', '').lower()
-        
-        # Check all text
-        all_text = f"{name_lower} {description_lower} {command_lower}"
-        
-        # Score each category
-        category_scores = {}
-        for category, keywords in self.categories.items():
-            score = 0
-            for keyword in keywords:
-                if keyword in all_text:
-                    # Weight by keyword position and length
-                    if keyword in name_lower:
-                        score += 3
-                    elif keyword in command_lower:
-                        score += 2
-                    else:
-                        score += 1
-            category_scores[category] = score
-        
-        # Return best matching category
-        if category_scores:
-            best_category = max(category_scores, key=category_scores.get)
-            if category_scores[best_category] > 0:
-                return best_category
-        
-        return 'Other'
-    
-    def _update_database(self, apps, scan_time):
-        """Update application database"""
-        try:
-            with sqlite3.connect(self.db_path) as conn:
-                for name, info in apps.items():
-                    category = self._categorize_application(name, info)
-                    icon_path = info.get('icon_path')
-                    conn.execute('''
-                        INSERT OR REPLACE INTO applications 
-                        (name, command, description, category, type, icon_path, scan_time)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    ''', (
-                        name,
-                        info.get('command', ''),
-                        info.get('description', ''),
-                        category,
-                        info.get('type', ''),
-                        icon_path,
-                        scan_time
-                    ))
-                conn.commit()
-        except Exception as e:
-            print(f"Database update failed: {e}")
+def catalog_signature(catalog):
+    """Everything the cards show, per app: equal signatures render the same grid"""
+    return frozenset(
+        (app.get('name'), app.get('category'), app.get('type'), app.get('description'),
+         app.get('exec'), app.get('icon_path'), app.get('available', True),
+         app.get('usage_count', 0), len(app.get('alternatives') or []))
+        for app in iter_apps(catalog))
+
+
+# Decoded atlas slices, least recently used first
+_ATLAS_PIXMAPS = OrderedDict()
+_ATLAS_PIXMAP_LIMIT = 1024
+# size -> generation of the atlas the cached slices came from
+_ATLAS_GENERATIONS = {}
+
+
+def _atlas_pixmap(app_data, size):
+    """Slice an app's generated icon of one physical size out of the mmap'd atlas"""
+    icons = _loaded_icons()
+    if icons is None:
+        return None
+    try:
+        atlas = icons._get_icon_generator().get_atlas(size)
+    except Exception:
+        return None
+    if _ATLAS_GENERATIONS.get(size) != atlas.generation:
+        # Rebuilt or compacted: slices of the old sheet may be stale
+        _ATLAS_PIXMAPS.clear()
+        _ATLAS_GENERATIONS.clear()
+        _ATLAS_GENERATIONS[size] = atlas.generation
+    name = app_data.get('name', '')
+    category = app_data.get('category', 'Other')
+    key = (name, category, size)
+    pixmap = _ATLAS_PIXMAPS.get(key)
+    if pixmap is not None:
+        _ATLAS_PIXMAPS.move_to_end(key)
+        return pixmap
+    try:
+        data = atlas.get(name, category)
+        if data is None:
+            return None
+        image = QImage(data, size, size, size * 4, QImage.Format_RGBA8888)
+        # copy() detaches the image from the sliced buffer
+        pixmap = QPixmap.fromImage(image.copy())
+    except Exception:
+        return None
+    _ATLAS_PIXMAPS[key] = pixmap
+    if len(_ATLAS_PIXMAPS) > _ATLAS_PIXMAP_LIMIT:
+        _ATLAS_PIXMAPS.popitem(last=False)
+    return pixmap
+
+
+def _best_atlas_pixmap(app_data, logical_size, device_pixel_ratio):
+    """Pick the stored size closest above logical_size * DPR, without re-rendering"""
+    icons = _loaded_icons()
+    if icons is None or not icons.HAS_PIL:
+        return None
+    wanted = logical_size * device_pixel_ratio
+    sizes = sorted(icons.ICON_SIZES)
+    candidates = [s for s in sizes if s >= wanted] + [s for s in reversed(sizes) if s < wanted]
+    for size in candidates:
+        pixmap = _atlas_pixmap(app_data, size)
+        if pixmap is not None:
+            pixmap.setDevicePixelRatio(size / logical_size)
+            return pixmap
+    return None
+
+
+class AtlasIconLabel(QLabel):
+    """Icon label that chooses the atlas sprite for its screen at paint time"""
+
+    def __init__(self, app_data, logical_size=64):
+        super().__init__()
+        self.app_data = app_data
+        self.logical_size = logical_size
+        self.setFixedSize(logical_size, logical_size)
+
+    def has_icon(self):
+        icons = _loaded_icons()
+        if icons is None or not icons.HAS_PIL:
+            return False
+        key = icons.IconAtlas.make_key(self.app_data.get('name', ''), self.app_data.get('category', 'Other'))
+        generator = icons._get_icon_generator()
+        return any(key in generator.get_atlas(size) for size in icons.ICON_SIZES)
+
+    def paintEvent(self, event):
+        pixmap = _best_atlas_pixmap(self.app_data, self.logical_size, self.devicePixelRatioF())
+        if pixmap is None:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(QRect(0, 0, self.logical_size, self.logical_size), pixmap)
 
 
 class ModernAppCard(QWidget):
@@ -824,13 +284,13 @@ class ModernAppCard(QWidget):
         layout.setContentsMargins(15, 10, 15, 10)
         layout.setSpacing(15)
         
-        # Icon
-        icon_label = QLabel()
-        icon_label.setFixedSize(64, 64)
-        icon_label.setAlignment(Qt.AlignCenter)
-        
-        # Simple icon - just text, no complex generation
-        self._set_simple_icon(icon_label)
+        # Icon: generated atlas sprite sized for the screen, simple text icon otherwise
+        icon_label = AtlasIconLabel(self.app_data)
+        if not icon_label.has_icon():
+            icon_label = QLabel()
+            icon_label.setFixedSize(64, 64)
+            icon_label.setAlignment(Qt.AlignCenter)
+            self._set_simple_icon(icon_label)
         
         # Info section
         info_widget = QWidget()
@@ -866,13 +326,25 @@ class ModernAppCard(QWidget):
             'cli': {'text': '⚡ Command Line', 'color': '#FF9800'},
             'snap': {'text': '📦 Snap Package', 'color': '#2196F3'},
             'flatpak': {'text': '📦 Flatpak', 'color': '#9C27B0'},
-            'appimage': {'text': '📦 AppImage', 'color': '#607D8B'}
+            'appimage': {'text': '📦 AppImage', 'color': '#607D8B'},
+            'steam': {'text': '🎮 Steam Game', 'color': '#1B2838'},
+            'nix': {'text': '❄️ Nix', 'color': '#5277C3'},
+            'brew': {'text': '🍺 Homebrew', 'color': '#FBB040'},
+            'pipx': {'text': '🐍 pipx', 'color': '#3776AB'},
+            'cargo': {'text': '🦀 Cargo', 'color': '#B7410E'},
+            'local': {'text': '🏠 Local', 'color': '#795548'}
         }
         
         app_type = self.app_data.get('type', 'unknown')
         badge_info = type_badges.get(app_type, {'text': '📁 Unknown', 'color': '#9E9E9E'})
         
         type_label = QLabel(badge_info['text'])
+        # Same program from other sources, merged into this card
+        alternatives = self.app_data.get('alternatives') or []
+        if alternatives:
+            type_label.setText(f"{badge_info['text']} +{len(alternatives)}")
+            type_label.setToolTip("Also available as:\n" + "\n".join(
+                f"{alt.get('type', '?')}: {alt.get('exec') or alt.get('command', '')}" for alt in alternatives))
         type_label.setStyleSheet(f"""
             background-color: {badge_info['color']};
             color: white;
@@ -909,7 +381,13 @@ class ModernAppCard(QWidget):
             'cli': '⚡', 
             'snap': '📦',
             'flatpak': '📦',
-            'appimage': '📦'
+            'appimage': '📦',
+            'steam': '🎮',
+            'nix': '❄️',
+            'brew': '🍺',
+            'pipx': '🐍',
+            'cargo': '🦀',
+            'local': '🏠'
         }
         
         category_icons = {
@@ -954,7 +432,13 @@ class ModernAppCard(QWidget):
             'cli': '⚡',
             'snap': '📦',
             'flatpak': '📦',
-            'appimage': '📦'
+            'appimage': '📦',
+            'steam': '🎮',
+            'nix': '❄️',
+            'brew': '🍺',
+            'pipx': '🐍',
+            'cargo': '🦀',
+            'local': '🏠'
         }
         
         icon_text = type_icons.get(self.app_data.get('type', 'unknown'), '📁')
@@ -986,24 +470,45 @@ class ModernAppCard(QWidget):
 class ApexLauncher(QMainWindow):
     """🚀 APEX LAUNCHER - THE ULTIMATE LINUX APPLICATION LAUNCHER"""
     
-    def __init__(self):
+    # Catalogs from the background refresher, delivered on the UI thread
+    background_catalog = pyqtSignal(dict)
+    # Icons for apps a background refresh added are in the atlas
+    background_icons_ready = pyqtSignal()
+    
+    def __init__(self, daemon_mode=False):
         super().__init__()
-        self.detector = AdvancedApplicationDetector()
+        self.background_catalog.connect(self.on_background_catalog)
+        self.background_icons_ready.connect(self.filter_apps)
+        # In daemon mode closing the window only hides it
+        self.daemon_mode = daemon_mode
+        # Built on the loader thread so the window can paint first
+        self.detector = None
+        self.launch_engine = get_launch_engine()
+        self.supervisor = ProcessSupervisor(self.launch_engine)
+        self.child_watcher = ChildWatcher(self.supervisor, self)
         self.all_apps = {}
+        self.rpc_service = None
+        # Idle-priority background refresh, started after the first load
+        self.refresher = None
+        # A loader thread is running; further load_apps() calls coalesce into it
+        self.loading = False
+        self.pending_refresh = False
+        self.loader_threads = []
         self.current_category = 'All'
         self.filtered_apps = []
         
     # Stats tracking
         self.total_apps = 0
         self.launch_count = 0
-        # Removed usable_only feature for simplicity
-        # self.usable_only = False
+        # Hide entries whose Exec/TryExec target is not installed
+        self.usable_only = False
         # Removed favorites for simplicity 
         # self.favorites = set()
         
         self.setup_ui()
         self.setup_shortcuts()
-        self.load_apps()
+        # Start scanning once the event loop runs, i.e. after the window is up
+        QTimer.singleShot(0, self.load_apps)
         
     def setup_ui(self):
         self.setWindowTitle("🚀 APEX LAUNCHER - The Ultimate Linux Application Launcher")
@@ -1143,7 +648,7 @@ class ApexLauncher(QMainWindow):
             'Education': '📚', 'Other': '📁'
         }
         
-        for category in self.detector.categories.keys():
+        for category in CATEGORIES:
             icon = category_icons.get(category, '📁')
             btn = QPushButton(f"{icon} {category}")
             btn.setStyleSheet(category_btn_style)
@@ -1158,6 +663,19 @@ class ApexLauncher(QMainWindow):
         self.category_buttons['Other'] = other_btn
         sidebar_layout.addWidget(other_btn)
         
+        # Filter on the catalog's availability flag (no filesystem access)
+        self.usable_btn = QPushButton("✅ Installed Only")
+        self.usable_btn.setCheckable(True)
+        self.usable_btn.setToolTip("Hide applications whose program is missing (Ctrl+I)")
+        self.usable_btn.setStyleSheet(category_btn_style + """
+            QPushButton:checked {
+                background: rgba(46, 204, 113, 0.7);
+                border: 1px solid rgba(46, 204, 113, 1.0);
+            }
+        """)
+        self.usable_btn.toggled.connect(self.toggle_usable_only)
+        sidebar_layout.addWidget(self.usable_btn)
+        
         sidebar_layout.addStretch()
         
         # Enhanced statistics
@@ -1224,6 +742,7 @@ class ApexLauncher(QMainWindow):
             }
         """)
         self.search_input.textChanged.connect(self.filter_apps)
+        self.search_input.textChanged.connect(self.note_activity)
         
         # View mode selector
         view_widget = QWidget()
@@ -1312,6 +831,7 @@ class ApexLauncher(QMainWindow):
         """Minimal shortcuts only"""
         # Quick search only
         QShortcut(QKeySequence("Ctrl+F"), self, self.focus_search)
+        QShortcut(QKeySequence("Ctrl+I"), self, self.usable_btn.toggle)
     
     def focus_search(self):
         """Focus search input"""
@@ -1320,6 +840,15 @@ class ApexLauncher(QMainWindow):
     
     def load_apps(self, force_refresh=False):
         """Load applications with progress indication"""
+        if self.loading:
+            # One loader at a time: a refresh joins (or restarts) the running scan
+            if force_refresh:
+                if self.detector is not None:
+                    self.detector.scans.request(force_refresh=True)
+                else:
+                    self.pending_refresh = True
+            return
+        self.loading = True
         self.search_input.setEnabled(False)
         self.search_input.setPlaceholderText("🔄 Loading applications...")
         
@@ -1330,26 +859,81 @@ class ApexLauncher(QMainWindow):
         self.worker = QThread()
         self.app_loader = AppLoader(self.detector, force_refresh)
         self.app_loader.moveToThread(self.worker)
+        # A previous loader may still be rendering icons; keep it referenced until its thread ends
+        pair = (self.worker, self.app_loader)
+        self.loader_threads.append(pair)
+        self.worker.finished.connect(lambda: self.loader_threads.remove(pair))
         
         self.worker.started.connect(self.app_loader.run)
         self.app_loader.finished.connect(self.on_apps_loaded)
         self.app_loader.progress.connect(self.on_load_progress)
+        self.app_loader.detector_ready.connect(self.on_detector_ready)
+        self.app_loader.icons_ready.connect(self.on_icons_ready)
         self.app_loader.finished.connect(self.worker.quit)
         self.app_loader.finished.connect(self.app_loader.deleteLater)
         self.worker.finished.connect(self.worker.deleteLater)
         
         self.worker.start()
     
+    def on_detector_ready(self, detector):
+        self.detector = detector
+        if self.rpc_service is not None:
+            # The RPC server starts with the window, before the detector exists
+            self.rpc_service.detector = detector
+
     def on_load_progress(self, message):
         """Update loading progress"""
         self.statusBar().showMessage(message)
     
     def on_apps_loaded(self, apps):
         """Handle loaded applications"""
+        STARTUP.mark('catalog loaded')
+        self.loading = False
+        if self.pending_refresh:
+            # Asked for before the detector existed; rescan now
+            self.pending_refresh = False
+            QTimer.singleShot(0, lambda: self.load_apps(force_refresh=True))
         self.all_apps = apps
+        if self.rpc_service is not None:
+            self.rpc_service.set_catalog(apps)
         self.search_input.setEnabled(True)
         self.search_input.setPlaceholderText("🔍 Search in 6000+ applications...")
+        self.update_stats(apps)
         
+        # Update status
+        self.statusBar().showMessage(f"🚀 Ready! Found {self.total_apps:,} applications")
+        
+        # Show all apps by default
+        self.set_category('All')
+        if self.refresher is None and self.detector is not None:
+            from apex_scheduler import RefreshScheduler
+            self.refresher = RefreshScheduler(self.detector, on_catalog=self.background_catalog.emit).start()
+
+    def on_background_catalog(self, apps):
+        """Swap in a catalog refreshed in the background, keeping category and search"""
+        if apps is self.all_apps or self.loading:
+            return
+        if catalog_signature(apps) == catalog_signature(self.all_apps):
+            return  # Nothing on screen would change; keep the cards
+        known = {(app.get('name'), app.get('category')) for app in iter_apps(self.all_apps)}
+        added = [app for app in iter_apps(apps) if (app.get('name'), app.get('category')) not in known]
+        self.all_apps = apps
+        if self.rpc_service is not None:
+            self.rpc_service.set_catalog(apps)
+        self.update_stats(apps)
+        self.filter_apps()
+        if added:
+            # Like the initial load: render off the GUI thread, then repaint
+            import threading
+            threading.Thread(target=self._generate_added_icons, args=(added,),
+                             name='apex-icons', daemon=True).start()
+
+    def _generate_added_icons(self, apps):
+        if generate_catalog_icons(apps):
+            self.background_icons_ready.emit()
+
+    def update_stats(self, apps):
+        """Recount the catalog for the statistics panel"""
         # Calculate statistics
         self.total_apps = sum(len(app_list) for app_list in apps.values())
         categories_with_apps = len([cat for cat, app_list in apps.items() if app_list])
@@ -1371,18 +955,26 @@ class ApexLauncher(QMainWindow):
                 stats_text += f"\n• {cat}: {count:,} apps"
         
         self.stats_label.setText(stats_text)
-        
-        # Update status
-        self.statusBar().showMessage(f"🚀 Ready! Found {self.total_apps:,} applications")
-        
-        # Show all apps by default
-        self.set_category('All')
     
-    # Removed deep_scan for simplicity
-    # def deep_scan(self):
-    
-    # Removed toggle_usable_only for simplicity  
-    # def toggle_usable_only(self, checked):
+    def on_icons_ready(self):
+        """Repaint cards once generated icons are in the atlas"""
+        self.filter_apps()
+        STARTUP.mark('icons ready')
+        STARTUP.report()
+
+    def note_activity(self, *_):
+        """Typing holds background scans until the user pauses"""
+        if self.refresher is not None:
+            self.refresher.note_activity()
+
+    def note_launch(self):
+        if self.refresher is not None:
+            self.refresher.note_launch()
+
+    def toggle_usable_only(self, checked):
+        """Show only applications whose program is installed"""
+        self.usable_only = bool(checked)
+        self.filter_apps()
     
     def set_category(self, category):
         """Set active category with enhanced styling"""
@@ -1447,26 +1039,10 @@ class ApexLauncher(QMainWindow):
         """Enhanced application filtering"""
         search_text = self.search_input.text().lower().strip()
         
-        # Get apps for current category (simplified)
-        if self.current_category == 'All':
-            apps = []
-            for app_list in self.all_apps.values():
-                apps.extend(app_list)
-        else:
-            apps = self.all_apps.get(self.current_category, [])
-        
-        # Apply search filter (simplified)
-        if search_text:
-            filtered = []
-            for app in apps:
-                if (search_text in app.get('name','').lower() or
-                    search_text in app.get('description','').lower() or
-                    search_text in app.get('command','').lower()):
-                    filtered.append(app)
-            apps = filtered
-
-        # Simple sort by name only
-        apps.sort(key=lambda x: x.get('name','').lower())
+        apps = iter_apps(self.all_apps, self.current_category)
+        if self.usable_only:
+            apps = [app for app in apps if app.get('available', True)]
+        apps = search_apps(apps, search_text)
         
         self.filtered_apps = apps
         self.display_apps(apps)
@@ -1539,25 +1115,47 @@ class ApexLauncher(QMainWindow):
     def launch_app(self, app_data):
         """Simple, fast application launcher"""
         try:
-            command = app_data.get('command', '').strip()
             name = app_data.get('name', 'Unknown').strip()
             
-            if not command or not name:
-                self.statusBar().showMessage(f"❌ No command for {name}", 3000)
+            # Exec line -> argv -> posix_spawn, no shell in between
+            result = self.supervisor.launch(app_data)
+            if result.reused:
+                self.statusBar().showMessage(f"🔁 {name} is already running (pid {result.pid})", 2000)
                 return
+            self.child_watcher.watch(result.pid)
+            self.note_launch()
             
-            # Simple launch - no complex handling
-            subprocess.Popen(command, shell=True, 
-                           stdout=subprocess.DEVNULL, 
-                           stderr=subprocess.DEVNULL)
-            
-            # Update launch counter only
+            # Session counter plus the shared usage count in the cache
             self.launch_count += 1
-            self.statusBar().showMessage(f"🚀 Launched: {name}", 2000)
+            record_launch(app_data)
+            self.statusBar().showMessage(f"🚀 Launched: {name} ({result.latency_ms:.1f} ms)", 2000)
                 
+        except LaunchError as e:
+            self.statusBar().showMessage(f"❌ {e}", 3000)
         except Exception as e:
             self.statusBar().showMessage(f"❌ Failed: {str(e)[:30]}", 3000)
 
+    def present(self, query=None):
+        """Bring the (possibly hidden) window to the front"""
+        if query is not None:
+            self.search_input.setText(query)
+        self.showNormal()
+        self.raise_()
+        self.activateWindow()
+        self.focus_search()
+
+    def find_app(self, name):
+        """Exact (case-insensitive) name match, else the best search hit"""
+        hits = search_apps(iter_apps(self.all_apps), name, limit=1) if name.strip() else []
+        return hits[0] if hits else None
+
+    def closeEvent(self, event):
+        if self.daemon_mode:
+            event.ignore()
+            self.hide()
+            return
+        super().closeEvent(event)
+
     # Removed keyPressEvent for favorites (too complex)
     # def keyPressEvent(self, event):
         
@@ -1565,11 +1163,150 @@ class ApexLauncher(QMainWindow):
     # def toggle_favorite_current(self):
 
 
+class ChildWatcher(QObject):
+    """Reaps launched apps from the Qt event loop via pidfds (SIGCHLD fallback)"""
+
+    def __init__(self, supervisor, parent=None):
+        super().__init__(parent)
+        self.supervisor = supervisor
+        self.notifiers = {}
+        self.sigchld_notifier = None
+        supervisor.exit_callbacks.append(self._on_exit)
+
+    def watch(self, pid):
+        fd = self.supervisor.watch_fd(pid)
+        if fd is None:
+            # No pidfd support: wake up on SIGCHLD instead
+            if self.sigchld_notifier is None:
+                wakeup_fd = self.supervisor.install_sigchld(wakeup=True)
+                self.sigchld_notifier = QSocketNotifier(wakeup_fd, QSocketNotifier.Read, self)
+                self.sigchld_notifier.activated.connect(lambda _fd: self.supervisor.drain_wakeup())
+            return
+        notifier = QSocketNotifier(fd, QSocketNotifier.Read, self)
+        notifier.activated.connect(lambda _fd: self.supervisor.reap())
+        self.notifiers[pid] = notifier
+
+    def _on_exit(self, pid, status):
+        # Runs right after the pidfd is closed, before control returns to Qt
+        notifier = self.notifiers.pop(pid, None)
+        if notifier is not None:
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+
+
+class DaemonServer(QObject):
+    """Unix-socket front door of a resident launcher (`--daemon`)
+
+    Each connection sends one JSON line ({"cmd": "show" | "search" |
+    "launch" | "refresh" | "ping" | "quit", ...}) and gets one JSON line
+    back. Commands run on the GUI thread against the warm catalog.
+    """
+
+    # Emitted from the RPC thread; delivered queued on the GUI thread
+    rpc_launched = pyqtSignal(int)
+    rpc_refresh = pyqtSignal()
+
+    def __init__(self, launcher, path, parent=None):
+        super().__init__(parent)
+        self.launcher = launcher
+        self.path = path
+        self.server = QLocalServer(self)
+        self.server.setSocketOptions(QLocalServer.UserAccessOption)
+        self.server.newConnection.connect(self._on_new_connection)
+        self.buffers = {}
+
+    def listen(self):
+        # A socket file without a live daemon behind it is left over from a crash
+        QLocalServer.removeServer(self.path)
+        return self.server.listen(self.path)
+
+    def start_rpc(self):
+        """Serve the JSON RPC API (apex_rpc) from the same warm catalog"""
+        from apex_rpc import CatalogService, RPCServer
+        launcher = self.launcher
+        self.rpc_launched.connect(self._on_rpc_launched)
+        self.rpc_refresh.connect(self._on_rpc_refresh)
+        service = CatalogService(launcher.detector, launcher.supervisor, refresher=self.rpc_refresh.emit)
+        service.launch_callbacks.append(self.rpc_launched.emit)
+        if launcher.all_apps:
+            service.set_catalog(launcher.all_apps)
+        launcher.rpc_service = service
+        self.rpc = RPCServer(service)
+        self.rpc.start_in_thread()
+        return self.rpc.path
+
+    def _on_rpc_launched(self, pid):
+        self.launcher.child_watcher.watch(pid)
+        self.launcher.note_launch()
+        self.launcher.launch_count += 1
+
+    def _on_rpc_refresh(self):
+        self.launcher.load_apps(force_refresh=True)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            conn = self.server.nextPendingConnection()
+            self.buffers[conn] = b''
+            conn.readyRead.connect(lambda conn=conn: self._on_ready_read(conn))
+            conn.disconnected.connect(lambda conn=conn: self._on_disconnected(conn))
+
+    def _on_disconnected(self, conn):
+        self.buffers.pop(conn, None)
+        conn.deleteLater()
+
+    def _on_ready_read(self, conn):
+        data = self.buffers.get(conn, b'') + bytes(conn.readAll())
+        if b'\n' not in data:
+            self.buffers[conn] = data
+            return
+        line = data.split(b'\n', 1)[0]
+        try:
+            reply = self.handle(json.loads(line.decode('utf-8')))
+        except Exception as e:
+            reply = {'ok': False, 'error': str(e)}
+        conn.write(json.dumps(reply).encode('utf-8') + b'\n')
+        conn.flush()
+        conn.disconnectFromServer()
+
+    def handle(self, request):
+        cmd = request.get('cmd')
+        launcher = self.launcher
+        if cmd == 'ping':
+            return {'ok': True, 'apps': launcher.total_apps}
+        if cmd == 'show':
+            launcher.present()
+            return {'ok': True}
+        if cmd == 'search':
+            launcher.present(str(request.get('query', '')))
+            return {'ok': True}
+        if cmd == 'launch':
+            app = launcher.find_app(str(request.get('name', '')))
+            if app is None:
+                return {'ok': False, 'error': f"No application named {request.get('name')!r}"}
+            result = launcher.supervisor.launch(app)
+            if not result.reused:
+                launcher.child_watcher.watch(result.pid)
+                launcher.note_launch()
+                launcher.launch_count += 1
+                record_launch(app)
+            return {'ok': True, 'pid': result.pid, 'reused': result.reused,
+                    'message': f"🚀 Launched: {app.get('name')} ({result.latency_ms:.1f} ms)"}
+        if cmd == 'refresh':
+            launcher.load_apps(force_refresh=True)
+            return {'ok': True}
+        if cmd == 'quit':
+            QTimer.singleShot(0, QApplication.instance().quit)
+            return {'ok': True}
+        return {'ok': False, 'error': f"Unknown command {cmd!r}"}
+
+
 class AppLoader(QObject):
     """Enhanced worker thread for loading applications"""
     
     finished = pyqtSignal(dict)
     progress = pyqtSignal(str)
+    icons_ready = pyqtSignal()
+    detector_ready = pyqtSignal(object)
     
     def __init__(self, detector, force_refresh=False):
         super().__init__()
@@ -1579,10 +1316,21 @@ class AppLoader(QObject):
     def run(self):
         """Load applications with progress updates"""
         self.progress.emit("🔍 Starting application scan...")
-        apps = self.detector.detect_applications(self.force_refresh)
+        if self.detector is None:
+            self.detector = AdvancedApplicationDetector()
+            STARTUP.mark('detector constructed')
+            self.detector_ready.emit(self.detector)
+        # Shared with the RPC server: overlapping refreshes run a single scan
+        apps = self.detector.scans.scan(self.force_refresh)
         self.progress.emit("✅ Application scan completed!")
         self.finished.emit(apps)
 
+        # Fill the icon atlas after the list is visible; cards pick it up on repaint
+        if generate_catalog_icons(iter_apps(apps)):
+            self.icons_ready.emit()
+            return
+        STARTUP.report()
+
 
 def main():
     """Ultra-safe main function with comprehensive crash protection"""
@@ -1590,23 +1338,54 @@ def main():
         # Basic CLI flags to control behavior
         refresh_flag = any(arg in sys.argv for arg in ["--refresh", "-r"]) 
         deep_flag = any(arg in sys.argv for arg in ["--deep-scan", "--deep", "-d"]) 
+        daemon_flag = "--daemon" in sys.argv
+
+        if daemon_flag:
+            from apex_client import socket_path, request as daemon_request
+            try:
+                daemon_request({'cmd': 'ping'}, timeout=0.5)
+                print("🚀 APEX Launcher daemon is already running")
+                return
+            except (OSError, ValueError):
+                pass
+
+        # Real device pixel ratios so cards can pick 1.5x/2x icon sprites
+        try:
+            QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
+            QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+        except Exception:
+            pass
 
         app = QApplication(sys.argv)
+        STARTUP.mark('QApplication')
         app.setApplicationName("APEX Launcher")
         app.setApplicationVersion("3.0")
         
         # Set application icon safely
         try:
-            icon_path = Path(__file__).parent / "apex-launcher.png"
-            if icon_path.exists():
-                app.setWindowIcon(QIcon(str(icon_path)))
+            icon_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "apex-launcher.png")
+            if os.path.exists(icon_path):
+                app.setWindowIcon(QIcon(icon_path))
         except Exception:
             pass  # Don't crash on icon issues
         
         # Create and show launcher with error handling
         try:
-            launcher = ApexLauncher()
-            launcher.show()
+            launcher = ApexLauncher(daemon_mode=daemon_flag)
+            STARTUP.mark('window constructed')
+            if daemon_flag:
+                # Stay resident with a hidden window; clients ask us to show it
+                app.setQuitOnLastWindowClosed(False)
+                daemon = DaemonServer(launcher, socket_path(), app)
+                if not daemon.listen():
+                    print(f"❌ Cannot listen on {daemon.path}: {daemon.server.errorString()}")
+                    sys.exit(1)
+                print(f"🚀 APEX Launcher daemon listening on {daemon.path}")
+                print(f"🔌 JSON RPC listening on {daemon.start_rpc()}")
+            else:
+                launcher.show()
+                STARTUP.mark('window shown')
+                QTimer.singleShot(0, lambda: STARTUP.mark('first event loop turn'))
             
             # Center window safely
             try:
@@ -1620,9 +1399,8 @@ def main():
             
             # Apply flags after UI shows
             try:
-                if deep_flag:
-                    QTimer.singleShot(1000, launcher.deep_scan)  # Delayed to avoid startup crash
-                elif refresh_flag:
+                # A full rescan already covers every source, so --deep-scan means --refresh
+                if refresh_flag or deep_flag:
                     QTimer.singleShot(1000, lambda: launcher.load_apps(force_refresh=True))
             except Exception:
                 pass  # Don't crash on flags
@@ -0,0 +1,253 @@
+#!/usr/bin/env python3
+"""
+📖 APEX Launcher - Man Page Descriptions
+One-line summaries for CLI tools, read in bulk from the NAME section of
+every page in man1/man8 instead of running `whatis` per command.
+
+Results live in apps.db, keyed by man directory and its mtime, so a
+directory is only re-read after a package adds or removes pages.
+"""
+
+import os
+import re
+import sys
+
+# User commands and administration commands; other sections are not launchable
+MAN_SECTIONS = ('man1', 'man8')
+
+# Enough of a page to reach its NAME section
+READ_LIMIT = 16384
+
+# Longest summary kept; whatis lines are one line by convention
+MAX_DESCRIPTION = 160
+
+_FONT_ESCAPE = re.compile(r'\\f(\[[^\]]*\]|\(..|.)')
+_NAMED_ESCAPE = re.compile(r'\\(\[[^\]]*\]|\(..|\*.)')
+_SPACES = re.compile(r'\s+')
+
+# Separators between the names and the summary of a NAME line
+_SEPARATORS = (' - ', ' -- ', ' — ', ' – ')
+
+# Named glyphs that show up in NAME lines
+_GLYPHS = {'\\(em': '-', '\\(en': '-', '\\[em]': '-', '\\[en]': '-', '\\(aq': "'", '\\[aq]': "'",
+           '\\(lq': '"', '\\(rq': '"', '\\(cq': "'", '\\(oq': "'"}
+
+
+def man_dirs(include_user=True):
+    """man1/man8 directories to read, system pages first"""
+    roots = ['/usr/share/man', '/usr/local/share/man', '/usr/local/man']
+    if include_user:
+        roots.append(os.path.expanduser('~/.local/share/man'))
+    return [os.path.join(root, section) for root in roots for section in MAN_SECTIONS]
+
+
+def _open_page(path):
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    if path.endswith('.bz2'):
+        import bz2
+        return bz2.open(path, 'rt', encoding='utf-8', errors='replace')
+    if path.endswith(('.xz', '.lzma')):
+        import lzma
+        return lzma.open(path, 'rt', encoding='utf-8', errors='replace')
+    if path.endswith('.zst'):
+        return None  # No zstd in the standard library
+    return open(path, 'r', encoding='utf-8', errors='replace')
+
+
+def page_command(filename):
+    """'gzip.1.gz' -> 'gzip'"""
+    for suffix in ('.gz', '.bz2', '.xz', '.lzma', '.zst'):
+        if filename.endswith(suffix):
+            filename = filename[:-len(suffix)]
+            break
+    command, dot, _section = filename.rpartition('.')
+    return command if dot else filename
+
+
+def _clean(text):
+    """Strip the roff markup that appears in NAME lines"""
+    for glyph, char in _GLYPHS.items():
+        text = text.replace(glyph, char)
+    text = _FONT_ESCAPE.sub('', text)
+    text = text.replace('\\-', '-').replace('\\ ', ' ').replace('\\e', '\\')
+    for escape in ('\\&', '\\%', '\\:', '\\/', '\\,', '\\c', '\\|', '\\^'):
+        text = text.replace(escape, '')
+    text = _NAMED_ESCAPE.sub('', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def parse_name_section(lines):
+    """(names, description) from a page's lines, or None
+
+    Handles man(7) pages (`.SH NAME` then `foo, bar \\- summary`) and
+    mdoc(7) pages (`.Nm foo` / `.Nd summary`).
+    """
+    in_name = False
+    text = []
+    names = []
+    # Set once a "names - summary" line is seen; the next break ends the entry
+    complete = False
+    for line in lines:
+        line = line.rstrip('\n')
+        macro = line.split(None, 1)
+        head = macro[0] if macro else ''
+        if head in ('.SH', '.Sh'):
+            if in_name:
+                break
+            title = macro[1].strip().strip('"').upper() if len(macro) > 1 else ''
+            in_name = title in ('NAME', 'NOM', 'NOMBRE')
+            continue
+        if not in_name:
+            continue
+        if head == '.Nd' and len(macro) > 1:
+            summary = _clean(macro[1])
+            return (names, summary) if summary else None
+        if head == '.Nm' and len(macro) > 1:
+            names.extend(n.strip() for n in _clean(macro[1]).split(',') if n.strip())
+            continue
+        if line.startswith(('.', "'")):
+            # Font macros carry text; anything else is layout
+            if head in ('.B', '.I', '.BR', '.IR', '.RB', '.RI', '.BI', '.IB') and len(macro) > 1:
+                line = macro[1].replace('"', '')
+            elif complete:
+                break  # .br/.PP after the summary: further names or unrelated text
+            else:
+                continue
+        if any(separator in _clean(line) for separator in _SEPARATORS):
+            if complete:
+                break  # "domainname - ..." after "hostname - ...": keep the first
+            complete = True
+        text.append(line)
+    if not text:
+        return None
+    joined = _clean(' '.join(text))
+    for separator in _SEPARATORS:
+        left, found, summary = joined.partition(separator)
+        if found:
+            names = [n.strip() for n in left.split(',') if n.strip()]
+            summary = summary.strip()
+            return (names, summary) if summary else None
+    return None
+
+
+def read_page(path):
+    """(names, description) for one page file, a ('.so', target) redirect, or None"""
+    try:
+        handle = _open_page(path)
+        if handle is None:
+            return None
+        with handle:
+            head = handle.read(READ_LIMIT)
+    except (OSError, EOFError, ValueError):
+        return None
+    except Exception:
+        return None  # Corrupt archives raise format-specific errors
+    lines = head.split('\n')
+    first = lines[0].strip() if lines else ''
+    if first.startswith('.so '):
+        return ('.so', page_command(os.path.basename(first[4:].strip())))
+    return parse_name_section(lines)
+
+
+def scan_man_dir(man_dir):
+    """command -> description for every page in one directory"""
+    descriptions = {}
+    redirects = {}
+    try:
+        filenames = os.listdir(man_dir)
+    except OSError:
+        return descriptions
+    for filename in sorted(filenames):
+        command = page_command(filename)
+        if command in descriptions:
+            continue
+        parsed = read_page(os.path.join(man_dir, filename))
+        if not parsed:
+            continue
+        if parsed[0] == '.so':
+            redirects[command] = parsed[1]
+            continue
+        names, summary = parsed
+        summary = summary[:MAX_DESCRIPTION]
+        descriptions[command] = summary
+        # "gzip, gunzip, zcat - ..." describes every listed name
+        for name in names:
+            if ' ' not in name:
+                descriptions.setdefault(name, summary)
+    for command, target in redirects.items():
+        if target in descriptions:
+            descriptions.setdefault(command, descriptions[target])
+    return descriptions
+
+
+class ManPageIndex:
+    """📖 Bulk man-page summaries cached in apps.db
+
+    fallback: an object with man_descriptions(man_dir, mtime) (the system
+    index) consulted before re-reading a changed directory.
+    """
+
+    def __init__(self, db_path, include_user=True, fallback=None):
+        self.db_path = db_path
+        self.include_user = include_user
+        self.fallback = fallback
+
+    def init_table(self, conn):
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS man_descriptions (
+                mandir TEXT,
+                mtime REAL,
+                command TEXT,
+                description TEXT,
+                PRIMARY KEY (mandir, command)
+            )
+        ''')
+
+    def load(self):
+        """command -> description, re-reading only man directories whose mtime changed"""
+        import sqlite3
+        descriptions = {}
+        try:
+            with sqlite3.connect(self.db_path, timeout=5) as conn:
+                self.init_table(conn)
+                cached = {}
+                for man_dir, mtime in conn.execute('SELECT DISTINCT mandir, mtime FROM man_descriptions'):
+                    cached[man_dir] = mtime
+                for man_dir in man_dirs(self.include_user):
+                    try:
+                        mtime = os.stat(man_dir).st_mtime
+                    except OSError:
+                        continue
+                    if cached.get(man_dir) == mtime:
+                        rows = conn.execute('SELECT command, description FROM man_descriptions '
+                                            'WHERE mandir = ?', (man_dir,))
+                        found = dict(rows)
+                    else:
+                        found = None
+                        if self.fallback is not None:
+                            found = self.fallback.man_descriptions(man_dir, mtime)
+                        if found is None:
+                            found = scan_man_dir(man_dir)
+                        conn.execute('DELETE FROM man_descriptions WHERE mandir = ?', (man_dir,))
+                        conn.executemany('INSERT INTO man_descriptions (mandir, mtime, command, description) '
+                                         'VALUES (?, ?, ?, ?)',
+                                         [(man_dir, mtime, command, summary)
+                                          for command, summary in found.items()])
+                    for command, summary in found.items():
+                        descriptions.setdefault(command, summary)
+                conn.commit()
+        except Exception as e:
+            print(f"Man page index error: {e}", file=sys.stderr)
+        return descriptions
+
+
+if __name__ == "__main__":
+    # Quick check without the cache: python3 apex_manpages.py gzip ls
+    merged = {}
+    for man_dir in man_dirs():
+        for command, summary in scan_man_dir(man_dir).items():
+            merged.setdefault(command, summary)
+    for command in sys.argv[1:] or ['gzip']:
+        print(f"{command} - {merged.get(command, '(no man page)')}")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+📏 APEX Launcher - Resource Profile
+Sizes scan parallelism, batch sizes, caches and icon workers from the
+host (CPU cores, available memory, cgroup limits, rotational storage),
+and enforces a scan memory budget instead of fixed item caps: how much
+a scan may grow the process' RSS over what it was when the scan began
+(the GUI's Qt and PIL are not the scan's to pay for).
+
+Every figure can be overridden from the environment:
+    APEX_SCAN_WORKERS, APEX_ICON_WORKERS, APEX_MEMORY_MB (scan budget),
+    APEX_ICON_CACHE_MB, APEX_STORAGE=ssd|hdd
+"""
+
+import os
+import sys
+
+# Footprint of one icon-render worker process (PIL + interpreter)
+ICON_WORKER_MB = 40
+
+# Budget bounds when APEX_MEMORY_MB is not set
+MIN_BUDGET_MB = 64
+MAX_BUDGET_MB = 1024
+
+# Threads per scan stage; scans are I/O bound, so more than this only adds contention
+MAX_SCAN_WORKERS = 8
+
+# How often (in items) long loops re-read the RSS
+BUDGET_CHECK_EVERY = 64
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _env_int(name):
+    try:
+        value = int(float(os.environ[name]))
+    except (KeyError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def cpu_count():
+    """Cores this process may run on (affinity and cgroup CPU quota aware)"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):
+        cores = os.cpu_count() or 1
+    try:
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            cores = min(cores, max(1, int(int(quota) / int(period))))
+    except (OSError, ValueError):
+        pass
+    return max(1, cores)
+
+
+def memory_available_mb():
+    """MemAvailable, capped by the cgroup v2 limit when there is one"""
+    available = None
+    try:
+        with open('/proc/meminfo') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    available = int(line.split()[1]) // 1024
+                    break
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        with open('/sys/fs/cgroup/memory.max') as f:
+            limit = f.read().strip()
+        if limit != 'max':
+            with open('/sys/fs/cgroup/memory.current') as f:
+                used = int(f.read().strip())
+            room = (int(limit) - used) // (1024 * 1024)
+            available = room if available is None else min(available, room)
+    except (OSError, ValueError):
+        pass
+    return available if available is not None else 1024
+
+
+def storage_type(path='/usr'):
+    """'hdd' when the device holding path is rotational, 'ssd' when not, else 'unknown'"""
+    try:
+        st = os.stat(path)
+        block = f'/sys/dev/block/{os.major(st.st_dev)}:{os.minor(st.st_dev)}'
+        for queue in (os.path.join(block, 'queue'), os.path.join(block, '..', 'queue')):
+            try:
+                with open(os.path.join(queue, 'rotational')) as f:
+                    return 'hdd' if f.read().strip() == '1' else 'ssd'
+            except OSError:
+                continue
+    except (OSError, ValueError):
+        pass
+    return 'unknown'
+
+
+def current_rss_mb():
+    """Resident set size of this process, from /proc/self/statm"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        try:
+            import resource
+            # ru_maxrss is the peak, in KiB on Linux: a safe over-estimate
+            return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        except Exception:
+            return 0.0
+
+
+class ResourceProfile:
+    """📏 Host-derived limits shared by the detector, icon engine and frontends"""
+
+    def __init__(self, cores=None, memory_mb=None, storage=None):
+        self.cores = cores or cpu_count()
+        self.memory_mb = memory_mb or memory_available_mb()
+        self.storage = os.environ.get('APEX_STORAGE') or storage or storage_type()
+
+        # Scan budget: RSS growth of a tenth of available memory, within sane bounds
+        self.rss_budget_mb = _env_int('APEX_MEMORY_MB') or int(
+            min(MAX_BUDGET_MB, max(MIN_BUDGET_MB, self.memory_mb // 10)))
+
+        # Seeks dominate on spinning disks; parallel directory walks just thrash
+        scan_workers = 2 if self.storage == 'hdd' else min(MAX_SCAN_WORKERS, self.cores * 2)
+        if self.memory_mb < 512:
+            scan_workers = 1
+        self.scan_workers = _env_int('APEX_SCAN_WORKERS') or max(1, scan_workers)
+
+        # Render processes: one per core, as many as the memory headroom allows
+        self.icon_workers = _env_int('APEX_ICON_WORKERS') or max(
+            1, min(self.cores, self.memory_mb // (ICON_WORKER_MB * 4)))
+
+        # Rows per executemany() and per streamed chunk
+        self.batch_size = 256 if self.memory_mb < 1024 else 2048
+
+        # Generated-icon disk cache (the rendered atlas is mmap'd, so size tracks memory)
+        self.icon_cache_mb = _env_int('APEX_ICON_CACHE_MB') or int(
+            min(256, max(16, self.memory_mb // 64)))
+
+        self._checks = 0
+        self._baseline_mb = 0.0
+
+    def begin_scan(self):
+        """Measure the RSS the budget is counted from"""
+        self._checks = 0
+        self._baseline_mb = current_rss_mb()
+
+    def over_budget(self):
+        """True once RSS grew past the budget since begin_scan() (re-read every BUDGET_CHECK_EVERY calls)"""
+        self._checks += 1
+        if self._checks % BUDGET_CHECK_EVERY:
+            return False
+        return current_rss_mb() - self._baseline_mb > self.rss_budget_mb
+
+    def as_dict(self):
+        return {
+            'cores': self.cores,
+            'memory_available_mb': self.memory_mb,
+            'storage': self.storage,
+            'rss_budget_mb': self.rss_budget_mb,
+            'scan_workers': self.scan_workers,
+            'icon_workers': self.icon_workers,
+            'batch_size': self.batch_size,
+            'icon_cache_mb': self.icon_cache_mb,
+        }
+
+
+_PROFILE = None
+
+
+def get_profile():
+    """The process-wide profile, measured on first use"""
+    global _PROFILE
+    if _PROFILE is None:
+        _PROFILE = ResourceProfile()
+    return _PROFILE
+
+
+if __name__ == "__main__":
+    profile = get_profile()
+    for key, value in profile.as_dict().items():
+        print(f"{key:>20}: {value}")
+    print(f"{'current_rss_mb':>20}: {current_rss_mb():.1f}")
+    sys.exit(0)
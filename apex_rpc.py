@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+🔌 APEX Launcher - Local JSON RPC
+JSON-lines query/launch API over a Unix socket, served from the
+detector's in-memory catalog so scripts never have to rescan.
+
+Request:  {"id": 1, "method": "search", "params": {"query": "fire", "limit": 5}}
+Response: {"id": 1, "result": [...]}   or   {"id": 1, "error": "..."}
+
+Methods: search, list_category, launch, refresh, stats. A connection may
+pipeline many requests; each is handled as its own asyncio task, so
+replies can arrive out of order and are matched by "id".
+"""
+
+import os
+import sys
+import json
+import time
+import asyncio
+import threading
+
+from apex_client import socket_path
+from apex_core import (LaunchError, ProcessSupervisor, SearchIndex, app_record, iter_apps,
+                       record_launch, search_apps)
+
+RPC_SOCKET_NAME = 'rpc.sock'
+
+# Upper bound for one request line
+MAX_LINE = 1024 * 1024
+
+
+class CatalogService:
+    """📚 RPC methods over a detector's catalog
+
+    Holds a flattened snapshot of the catalog and its search indexes,
+    swapped atomically on refresh, so reads never block on a scan.
+    """
+
+    def __init__(self, detector, supervisor=None, refresher=None):
+        self.detector = detector
+        # Owner-provided rescan hook (the GUI daemon rescans on its own thread
+        # and pushes the result back through set_catalog)
+        self.refresher = refresher
+        self.supervisor = supervisor or ProcessSupervisor()
+        self.launch_callbacks = []
+        self.catalog = {}
+        self.apps = []
+        # category (None for all) -> SearchIndex; search runs on the event loop thread only
+        self.indexes = {None: SearchIndex([])}
+        self.loaded_at = 0
+        self.requests = 0
+
+    def load(self, force_refresh=False):
+        """(Re)load the catalog from the detector; safe to call from a worker thread"""
+        if self.refresher is not None:
+            self.refresher()
+            return self.stats()
+        # Concurrent refresh calls join the detector's in-flight scan
+        self.set_catalog(self.detector.scans.scan(force_refresh))
+        return self.stats()
+
+    def set_catalog(self, catalog):
+        apps = iter_apps(catalog)
+        # Lowercased once here, not on every query; category indexes are built on first use
+        indexes = {None: SearchIndex(apps)}
+        self.catalog, self.apps, self.indexes = catalog, apps, indexes
+        self.loaded_at = time.time()
+
+    def search(self, query='', limit=20, category=None):
+        indexes = self.indexes
+        index = indexes.get(category or None)
+        if index is None:
+            index = indexes[category] = SearchIndex(iter_apps(self.catalog, category))
+        return [app_record(app) for app in index.search(query, limit)]
+
+    def list_category(self, category='All'):
+        if category not in (None, '', 'All') and category not in self.catalog:
+            raise ValueError(f"Unknown category {category!r}")
+        return [app_record(app) for app in iter_apps(self.catalog, category)]
+
+    def launch(self, name):
+        hits = search_apps(self.apps, name, limit=1) if str(name).strip() else []
+        if not hits:
+            raise LaunchError(f"No application named {name!r}")
+        app = hits[0]
+        result = self.supervisor.launch(app)
+        if not result.reused:
+            record_launch(app)
+            for callback in self.launch_callbacks:
+                callback(result.pid)
+        return {'name': app.get('name'), 'pid': result.pid, 'reused': result.reused,
+                'argv': result.argv, 'latency_ms': round(result.latency_ms, 3)}
+
+    def stats(self):
+        return {
+            'apps': len(self.apps),
+            'categories': {cat: len(apps) for cat, apps in self.catalog.items() if apps},
+            'loaded_at': self.loaded_at,
+            'running': len(self.supervisor.running()),
+            'requests': self.requests,
+            # Per-source status, entries and milliseconds of the last scan
+            'scanners': getattr(self.detector, 'scan_metrics', {}),
+        }
+
+
+class RPCServer:
+    """asyncio Unix-socket server dispatching JSON lines to a CatalogService"""
+
+    # Methods that may touch the filesystem run in the default executor
+    BLOCKING = {'refresh', 'launch'}
+
+    def __init__(self, service, path=None):
+        self.service = service
+        self.path = path or socket_path(RPC_SOCKET_NAME)
+        self.loop = None
+        self.server = None
+
+    async def start(self):
+        self.loop = asyncio.get_running_loop()
+        try:
+            # Remove a socket left behind by a crashed server
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+        self.server = await asyncio.start_unix_server(self._handle_connection, self.path, limit=MAX_LINE)
+        os.chmod(self.path, 0o600)
+        return self.server
+
+    async def serve_forever(self):
+        await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    def start_in_thread(self):
+        """Run the server on its own event loop in a daemon thread (used by the GUI daemon)"""
+        started = threading.Event()
+
+        def _run():
+            async def _main():
+                await self.start()
+                started.set()
+                async with self.server:
+                    await self.server.serve_forever()
+            try:
+                asyncio.run(_main())
+            except Exception as e:
+                print(f"RPC server stopped: {e}")
+                started.set()
+
+        thread = threading.Thread(target=_run, name='apex-rpc', daemon=True)
+        thread.start()
+        started.wait(5)
+        return thread
+
+    async def _handle_connection(self, reader, writer):
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except (asyncio.LimitOverrunError, ValueError):
+                    break
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(self._handle_line(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            writer.close()
+
+    async def _handle_line(self, line, writer, write_lock):
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get('id')
+            result = await self.dispatch(request.get('method'), request.get('params') or {})
+            reply = {'id': request_id, 'result': result}
+        except Exception as e:
+            reply = {'id': request_id, 'error': str(e)}
+        async with write_lock:
+            writer.write(json.dumps(reply).encode('utf-8') + b'\n')
+            try:
+                await writer.drain()
+            except ConnectionError:
+                pass
+
+    async def dispatch(self, method, params):
+        service = self.service
+        service.requests += 1
+        if method in self.BLOCKING:
+            if method == 'refresh':
+                call = lambda: service.load(True)
+            else:
+                call = lambda: service.launch(params.get('name', ''))
+            return await self.loop.run_in_executor(None, call)
+        if method == 'search':
+            return service.search(params.get('query', ''), params.get('limit', 20), params.get('category'))
+        if method == 'list_category':
+            return service.list_category(params.get('category', 'All'))
+        if method == 'stats':
+            return service.stats()
+        raise ValueError(f"Unknown method {method!r}")
+
+
+def _watch_children(loop, supervisor):
+    """Reap launched apps from the asyncio loop (headless server)"""
+    import signal
+    try:
+        loop.add_signal_handler(signal.SIGCHLD, supervisor.reap)
+    except (NotImplementedError, RuntimeError, ValueError):
+        pass
+
+
+def serve(detector=None, path=None):
+    """Run a headless RPC server in the foreground"""
+    if detector is None:
+        from apex_core import AdvancedApplicationDetector
+        detector = AdvancedApplicationDetector()
+    service = CatalogService(detector)
+    service.load()
+    server = RPCServer(service, path)
+    from apex_scheduler import RefreshScheduler
+    refresher = RefreshScheduler(service.detector, on_catalog=service.set_catalog).start()
+    service.launch_callbacks.append(lambda pid: refresher.note_launch())
+
+    async def _main():
+        _watch_children(asyncio.get_running_loop(), service.supervisor)
+        await server.start()
+        print(f"🔌 APEX RPC listening on {server.path} ({len(service.apps)} apps)")
+        async with server.server:
+            await server.server.serve_forever()
+
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    serve()
+    sys.exit(0)
@@ -0,0 +1,540 @@
+#!/usr/bin/env python3
+"""
+🧩 APEX Launcher - Scanner Plugins
+Every catalog source is a plugin answering three questions:
+
+    discover()           the directories it reads; empty when the source
+                         is not installed here
+    fingerprint(paths)   a cheap, JSON-able summary of them (mtimes,
+                         profile links); unchanged means the cached result
+                         is still right. None: no cache
+    scan(paths)          {name: entry} in the detector's entry format
+
+The detector runs all plugins in its scan pool. Each gets its own time
+budget, counted from when it starts: a plugin still running when its
+budget is spent contributes its last cached result instead, and its
+late result is cached for the next scan. Results are cached per plugin
+in apps.db (scanner_cache), and timings land in detector.scan_metrics.
+
+Built in, next to the core desktop/PATH/snap/flatpak sources: Nix
+profiles, Homebrew on Linux, pipx, cargo, ~/.local/bin and Steam
+library manifests. register_scanner() adds more.
+
+    python3 apex_scanners.py      # scan once and print per-plugin timings
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+
+from apex_core import dir_mtime, list_executables, _is_cli_candidate
+from apex_launch import quote_exec_arg
+
+# Extra plugin classes, run after the built-ins
+SCANNERS = []
+
+
+# Guards metric updates shared by the scan and plugins finishing past their budget
+_metrics_lock = threading.Lock()
+
+
+def register_scanner(plugin_class):
+    """Add a ScannerPlugin subclass to every detector created afterwards"""
+    if plugin_class not in SCANNERS:
+        SCANNERS.append(plugin_class)
+    return plugin_class
+
+
+class ScannerPlugin:
+    """🧩 One catalog source"""
+
+    # Cache key and metrics label
+    name = ''
+    # 'type' of the entries it produces
+    type = 'cli'
+    # Merge order when two sources provide one program: lower wins
+    priority = 40
+    # Seconds the scan waits for this plugin once it has started
+    budget = 2.0
+    # Man-page summaries replace this plugin's descriptions when a page exists
+    man_pages = False
+
+    def discover(self):
+        return []
+
+    def fingerprint(self, paths):
+        return [[path, dir_mtime(path)] for path in paths]
+
+    def scan(self, paths):
+        return {}
+
+
+class CoreScanner(ScannerPlugin):
+    """A detector method as a plugin; those keep their own per-directory caches
+
+    The method gets this scanner's `side` dict for what it finds besides
+    entries (PATH executables, listings to record); the detector reads it
+    only when the scanner finished within its budget.
+    """
+
+    def __init__(self, name, entry_type, priority, budget, method, man_pages=False):
+        self.name = name
+        self.type = entry_type
+        self.priority = priority
+        self.budget = budget
+        self.method = method
+        self.man_pages = man_pages
+        self.side = {}
+
+    def discover(self):
+        return [self.name]
+
+    def fingerprint(self, paths):
+        return None
+
+    def scan(self, paths):
+        return self.method(self.side)
+
+
+class BinDirScanner(ScannerPlugin):
+    """Executables of one or more bin directories, described by the package that owns them"""
+
+    man_pages = True
+    label = ''
+
+    def bin_dirs(self):
+        return []
+
+    def discover(self):
+        return [path for path in self.bin_dirs() if os.path.isdir(path)]
+
+    def package_of(self, path):
+        """'name version' of the package providing path, or ''"""
+        return ''
+
+    def scan(self, paths):
+        apps = {}
+        for bin_dir in paths:
+            for name in sorted(list_executables(bin_dir)):
+                if name in apps:
+                    continue
+                path = os.path.join(bin_dir, name)
+                package = self.package_of(path)
+                # rg or fd from a known package are real tools, whatever their length
+                if not package and not _is_cli_candidate(name):
+                    continue
+                apps[name] = {
+                    'command': name,
+                    'exec': quote_exec_arg(path),
+                    'description': f"{self.label}: {package}" if package else 'CLI tool',
+                    'type': self.type,
+                }
+        return apps
+
+
+class NixScanner(BinDirScanner):
+    """❄️ Nix user, default and system profiles"""
+
+    name = type = 'nix'
+    label = 'Nix'
+
+    def bin_dirs(self):
+        user = os.environ.get('USER', '')
+        return [os.path.expanduser('~/.nix-profile/bin'),
+                os.path.expanduser('~/.local/state/nix/profile/bin'),
+                f'/etc/profiles/per-user/{user}/bin',
+                '/nix/var/nix/profiles/default/bin',
+                '/run/current-system/sw/bin']
+
+    def fingerprint(self, paths):
+        # Store paths all have mtime 1; a new generation is a new link target
+        return [[path, os.path.realpath(path)] for path in paths]
+
+    def package_of(self, path):
+        # /nix/store/<hash>-ripgrep-14.1.0/bin/rg -> ripgrep-14.1.0
+        parts = os.path.realpath(path).split('/')
+        if len(parts) > 3 and parts[1] == 'nix' and parts[2] == 'store':
+            return parts[3].split('-', 1)[-1]
+        return ''
+
+
+class HomebrewScanner(BinDirScanner):
+    """🍺 Homebrew on Linux"""
+
+    name = type = 'brew'
+    label = 'Homebrew'
+
+    def prefixes(self):
+        return [os.environ.get('HOMEBREW_PREFIX', ''), '/home/linuxbrew/.linuxbrew',
+                os.path.expanduser('~/.linuxbrew')]
+
+    def bin_dirs(self):
+        return [os.path.join(prefix, 'bin') for prefix in self.prefixes() if prefix]
+
+    def fingerprint(self, paths):
+        # bin/ gains links on install; Cellar/ changes on upgrades that keep the link
+        return [[path, dir_mtime(path), dir_mtime(os.path.join(os.path.dirname(path), 'Cellar'))]
+                for path in paths]
+
+    def package_of(self, path):
+        # bin/rg -> ../Cellar/ripgrep/14.1.0/bin/rg
+        try:
+            parts = os.readlink(path).split('/')
+        except OSError:
+            return ''
+        if 'Cellar' in parts:
+            i = parts.index('Cellar')
+            return ' '.join(parts[i + 1:i + 3])
+        return ''
+
+
+class PipxScanner(ScannerPlugin):
+    """🐍 Apps installed with pipx, read from each venv's pipx_metadata.json"""
+
+    name = type = 'pipx'
+    man_pages = True
+
+    def discover(self):
+        homes = [os.environ.get('PIPX_HOME', ''), os.path.expanduser('~/.local/share/pipx'),
+                 os.path.expanduser('~/.local/pipx')]
+        return [os.path.join(home, 'venvs') for home in homes
+                if home and os.path.isdir(os.path.join(home, 'venvs'))]
+
+    def _metadata_files(self, venvs):
+        try:
+            names = sorted(os.listdir(venvs))
+        except OSError:
+            return []
+        return [os.path.join(venvs, name, 'pipx_metadata.json') for name in names]
+
+    def fingerprint(self, paths):
+        # Upgrades rewrite the metadata without touching venvs/
+        return [[path, dir_mtime(path)] + [dir_mtime(meta) for meta in self._metadata_files(path)]
+                for path in paths]
+
+    def scan(self, paths):
+        bin_dir = os.environ.get('PIPX_BIN_DIR') or os.path.expanduser('~/.local/bin')
+        apps = {}
+        for venvs in paths:
+            for meta_path in self._metadata_files(venvs):
+                try:
+                    with open(meta_path, 'r', encoding='utf-8') as f:
+                        main = json.load(f).get('main_package') or {}
+                except (OSError, ValueError, AttributeError):
+                    continue
+                package = f"{main.get('package', '')} {main.get('package_version', '')}".strip()
+                for app in main.get('apps') or []:
+                    if not isinstance(app, str) or app in apps:
+                        continue
+                    exposed = os.path.join(bin_dir, app)
+                    if not os.path.exists(exposed):
+                        exposed = os.path.join(os.path.dirname(meta_path), 'bin', app)
+                    apps[app] = {
+                        'command': app,
+                        'exec': quote_exec_arg(exposed),
+                        'description': f"pipx: {package}" if package else 'CLI tool',
+                        'type': 'pipx',
+                    }
+        return apps
+
+
+class CargoScanner(BinDirScanner):
+    """🦀 cargo install'ed binaries, named after their crate via .crates2.json"""
+
+    name = type = 'cargo'
+    label = 'cargo'
+
+    def cargo_home(self):
+        return os.environ.get('CARGO_HOME') or os.path.expanduser('~/.cargo')
+
+    def bin_dirs(self):
+        return [os.path.join(self.cargo_home(), 'bin')]
+
+    def fingerprint(self, paths):
+        return [[path, dir_mtime(path), dir_mtime(os.path.join(self.cargo_home(), '.crates2.json'))]
+                for path in paths]
+
+    def scan(self, paths):
+        self._crates = {}
+        try:
+            with open(os.path.join(self.cargo_home(), '.crates2.json'), 'r', encoding='utf-8') as f:
+                installs = json.load(f).get('installs') or {}
+            for key, install in installs.items():
+                # "ripgrep 14.1.0 (registry+https://...)"
+                crate = ' '.join(key.split(' ')[:2])
+                for binary in install.get('bins') or []:
+                    self._crates[binary] = crate
+        except (OSError, ValueError, AttributeError):
+            pass
+        return super().scan(paths)
+
+    def package_of(self, path):
+        return self._crates.get(os.path.basename(path), '')
+
+
+class LocalBinScanner(BinDirScanner):
+    """🏠 The user's own scripts and tools in ~/.local/bin"""
+
+    name = type = 'local'
+    priority = 45  # pipx/cargo entries for the same file say more about it
+
+    def bin_dirs(self):
+        return [os.path.expanduser('~/.local/bin')]
+
+
+class SteamScanner(ScannerPlugin):
+    """🎮 Installed Steam games, from the appmanifest files of every library"""
+
+    name = type = 'steam'
+    priority = 25
+    budget = 3.0
+
+    # Runtimes and compatibility tools, not games
+    SKIP_PREFIXES = ('Proton', 'Steam Linux Runtime', 'Steamworks Common', 'SteamVR')
+
+    # (Steam root, how to run it)
+    ROOTS = (
+        ('~/.steam/steam', 'steam'),
+        ('~/.local/share/Steam', 'steam'),
+        ('~/.var/app/com.valvesoftware.Steam/.local/share/Steam', 'flatpak run com.valvesoftware.Steam'),
+    )
+
+    def discover(self):
+        libraries = []
+        seen = set()
+        for root, _launcher in self.ROOTS:
+            root = os.path.expanduser(root)
+            steamapps = os.path.join(root, 'steamapps')
+            if not os.path.isdir(steamapps):
+                continue
+            candidates = [steamapps]
+            for path in self._library_paths(os.path.join(steamapps, 'libraryfolders.vdf')):
+                candidates.append(os.path.join(path, 'steamapps'))
+            for candidate in candidates:
+                real = os.path.realpath(candidate)
+                if real not in seen and os.path.isdir(candidate):
+                    seen.add(real)
+                    libraries.append(candidate)
+        return libraries
+
+    @staticmethod
+    def _library_paths(vdf_path):
+        paths = []
+        try:
+            with open(vdf_path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.strip().split('"')
+                    # "path"		"/mnt/games/SteamLibrary"
+                    if len(fields) >= 4 and fields[1] == 'path':
+                        paths.append(fields[3].replace('\\\\', '\\'))
+        except OSError:
+            pass
+        return paths
+
+    @staticmethod
+    def _manifest(path):
+        """Top-level "key" "value" pairs of an appmanifest_<id>.acf"""
+        values = {}
+        try:
+            with open(path, 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    fields = line.strip().split('"')
+                    if len(fields) >= 4 and fields[1] not in values:
+                        values[fields[1]] = fields[3]
+        except OSError:
+            pass
+        return values
+
+    def _launcher(self, library):
+        for root, launcher in self.ROOTS:
+            if os.path.realpath(library).startswith(os.path.realpath(os.path.expanduser(root))):
+                return launcher
+        return 'steam'
+
+    def scan(self, paths):
+        apps = {}
+        for library in paths:
+            launcher = self._launcher(library)
+            try:
+                manifests = [name for name in os.listdir(library)
+                             if name.startswith('appmanifest_') and name.endswith('.acf')]
+            except OSError:
+                continue
+            for filename in sorted(manifests):
+                values = self._manifest(os.path.join(library, filename))
+                app_id, name = values.get('appid', ''), values.get('name', '').strip()
+                if not app_id or not name or name.startswith(self.SKIP_PREFIXES):
+                    continue
+                # StateFlags 4: fully installed (not queued or half-downloaded)
+                try:
+                    if not int(values.get('StateFlags', '4')) & 4:
+                        continue
+                except ValueError:
+                    pass
+                apps[name] = {
+                    'command': 'steam',
+                    'exec': f"{launcher} steam://rungameid/{app_id}",
+                    'description': 'Steam game',
+                    'type': 'steam',
+                    'app_id': app_id,
+                }
+        return apps
+
+
+# Built-in plugins beyond the core sources
+BUILTIN_SCANNERS = [NixScanner, HomebrewScanner, PipxScanner, CargoScanner, LocalBinScanner, SteamScanner]
+
+
+class ScannerCache:
+    """🧩 Per-plugin results in apps.db, keyed by the plugin's fingerprint"""
+
+    def __init__(self, db_path, lock=None):
+        self.db_path = db_path
+        self.lock = lock
+
+    def load(self):
+        """plugin -> (fingerprint JSON, entries JSON)"""
+        import sqlite3
+        try:
+            with sqlite3.connect(self.db_path, timeout=5) as conn:
+                return {plugin: (fingerprint, entries) for plugin, fingerprint, entries in
+                        conn.execute('SELECT plugin, fingerprint, entries FROM scanner_cache')}
+        except Exception as e:
+            print(f"Scanner cache unreadable: {e}", file=sys.stderr)
+            return {}
+
+    def save(self, plugin, fingerprint, entries, duration_ms):
+        import sqlite3
+        try:
+            if self.lock is not None:
+                self.lock.acquire()
+            try:
+                with sqlite3.connect(self.db_path, timeout=5) as conn:
+                    conn.execute('INSERT OR REPLACE INTO scanner_cache '
+                                 '(plugin, fingerprint, entries, duration_ms, scanned_at) VALUES (?, ?, ?, ?, ?)',
+                                 (plugin, fingerprint, json.dumps(entries), duration_ms, time.time()))
+                    conn.commit()
+            finally:
+                if self.lock is not None:
+                    self.lock.release()
+        except Exception as e:
+            print(f"Scanner cache update failed for {plugin}: {e}", file=sys.stderr)
+
+
+def _decode(entries):
+    try:
+        return json.loads(entries) if entries else {}
+    except ValueError:
+        return {}
+
+
+def _new_metric(plugin):
+    return {'status': 'running', 'ms': 0.0, 'entries': 0, 'budget_ms': plugin.budget * 1000}
+
+
+def _run_plugin(plugin, cached, cache, metrics):
+    """Scan one plugin (or reuse its cache); records its metrics"""
+    start = time.perf_counter()
+    metric = metrics.setdefault(plugin.name, _new_metric(plugin))
+    try:
+        paths = plugin.discover()
+        if not paths:
+            status, apps = 'absent', {}
+        else:
+            fingerprint = plugin.fingerprint(paths)
+            key = json.dumps(fingerprint, sort_keys=True) if fingerprint is not None else None
+            if key is not None and cached and cached[0] == key:
+                status, apps = 'cached', _decode(cached[1])
+            else:
+                status, apps = 'scanned', plugin.scan(paths) or {}
+                if key is not None:
+                    cache.save(plugin.name, key, apps, (time.perf_counter() - start) * 1000)
+    except Exception as e:
+        print(f"Scanner {plugin.name} failed: {e}", file=sys.stderr)
+        status, apps = 'error', {}
+    elapsed = round((time.perf_counter() - start) * 1000, 1)
+    with _metrics_lock:
+        if metric['status'] == 'over budget':
+            # The scan went on without this result; keep saying so
+            metric['late_ms'] = elapsed
+        else:
+            metric.update(status=status, ms=elapsed, entries=len(apps))
+    return apps
+
+
+def run_scanners(detector, plugins, workers=1):
+    """name -> entries for every plugin, each held to its own budget"""
+    cache = ScannerCache(detector.db_path, detector.db_lock)
+    cached = cache.load()
+    metrics = {}
+    detector.scan_metrics = metrics
+    results = {}
+    started = {}
+
+    def run(plugin):
+        # The metric exists before the deadline starts counting
+        metrics[plugin.name] = _new_metric(plugin)
+        started[plugin.name] = time.perf_counter()
+        return _run_plugin(plugin, cached.get(plugin.name), cache, metrics)
+
+    try:
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+        pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix='apex-scan')
+    except Exception:
+        # Threading unavailable: scan in this thread, budgets can't interrupt
+        for plugin in plugins:
+            results[plugin.name] = run(plugin)
+        return results
+
+    futures = {pool.submit(run, plugin): plugin for plugin in plugins}
+    pending = set(futures)
+    while pending:
+        # Wake at the earliest deadline of the plugins already running
+        now = time.perf_counter()
+        deadlines = [started[futures[f].name] + futures[f].budget
+                     for f in pending if futures[f].name in started]
+        timeout = max(0.0, min(deadlines) - now) if deadlines else 0.05
+        done, pending = wait(pending, timeout=min(timeout, 0.5) or 0.01, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                results[futures[future].name] = future.result()
+            except Exception:
+                results[futures[future].name] = {}
+        now = time.perf_counter()
+        for future in list(pending):
+            plugin = futures[future]
+            start = started.get(plugin.name)
+            if start is None or now - start <= plugin.budget:
+                continue
+            # Over budget: carry on without it; its late result fills the cache for next time
+            previous = cached.get(plugin.name)
+            with _metrics_lock:
+                if metrics[plugin.name]['status'] != 'running':
+                    continue  # Finished just now; collected on the next pass
+                results[plugin.name] = _decode(previous[1]) if previous else {}
+                metrics[plugin.name].update(status='over budget', ms=round((now - start) * 1000, 1),
+                                            entries=len(results[plugin.name]))
+            pending.discard(future)
+            print(f"⏱️ {plugin.name} scan over its {plugin.budget:g} s budget; "
+                  f"using its last result ({len(results[plugin.name])} entries)", file=sys.stderr)
+    pool.shutdown(wait=False)
+    return results
+
+
+def format_metrics(metrics):
+    lines = [f"{'scanner':<10} {'status':<12} {'entries':>8} {'ms':>9} {'budget':>8}"]
+    for name, metric in sorted(metrics.items(), key=lambda item: -item[1].get('ms', 0)):
+        lines.append(f"{name:<10} {metric.get('status', ''):<12} {metric.get('entries', 0):>8} "
+                     f"{metric.get('ms', 0):>9.1f} {metric.get('budget_ms', 0) / 1000:>7g}s")
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    from apex_core import AdvancedApplicationDetector
+    detector = AdvancedApplicationDetector()
+    detector.scans.scan(force_refresh='--refresh' in sys.argv)
+    print(format_metrics(detector.scan_metrics) if detector.scan_metrics else "Catalog served from cache; "
+          "run with --refresh to scan")
+    sys.exit(0)
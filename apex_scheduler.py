@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+⏳ APEX Launcher - Background Refresh
+Keeps the catalog current from a low-priority thread: refresh triggers
+are coalesced into single scans, which run at idle CPU and I/O priority
+and wait while the user is typing, right after a launch, or while the
+machine is busy (load average, /proc/pressure).
+"""
+
+import os
+import sys
+import time
+import threading
+
+# Wait this long after the last keystroke before scanning
+QUIET_SECONDS = 2.0
+
+# Leave a freshly launched app alone while it starts up
+LAUNCH_GRACE_SECONDS = 30.0
+
+# Busy when the 1-minute load average exceeds this per core
+LOAD_PER_CORE = 0.8
+
+# Busy when more than this % of the last 10 s had tasks stalled on CPU or I/O
+PSI_LIMIT = 10.0
+
+# Back-off between busy checks doubles up to this
+MAX_BACKOFF_SECONDS = 60.0
+
+# A deferred refresh runs anyway after this long
+MAX_DEFER_SECONDS = 900.0
+
+# ioprio_set(2) syscall numbers by architecture
+_IOPRIO_SET = {'x86_64': 251, 'amd64': 251, 'i386': 289, 'i686': 289,
+               'aarch64': 30, 'arm64': 30, 'armv7l': 314, 'ppc64le': 273, 'riscv64': 30}
+_IOPRIO_WHO_PROCESS = 1
+_IOPRIO_CLASS_IDLE = 3
+_IOPRIO_CLASS_SHIFT = 13
+
+
+def lower_thread_priority():
+    """Drop the calling thread to nice 19 and the idle I/O class
+
+    On Linux both settings are per thread and inherited by threads and
+    processes it starts, so the scan pool and icon workers follow while
+    the UI thread keeps its priority.
+    """
+    try:
+        os.nice(19 - os.nice(0))
+    except (AttributeError, OSError):
+        pass
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        import ctypes
+        import platform
+        number = _IOPRIO_SET.get(platform.machine().lower())
+        if number is None:
+            return
+        libc = ctypes.CDLL(None, use_errno=True)
+        # who=0: the calling thread
+        libc.syscall(number, _IOPRIO_WHO_PROCESS, 0, _IOPRIO_CLASS_IDLE << _IOPRIO_CLASS_SHIFT)
+    except Exception:
+        pass
+
+
+def read_pressure(resource):
+    """'some avg10' from /proc/pressure/<resource>, or None without PSI"""
+    try:
+        with open(f'/proc/pressure/{resource}') as f:
+            for line in f:
+                if line.startswith('some '):
+                    for field in line.split()[1:]:
+                        key, _, value = field.partition('=')
+                        if key == 'avg10':
+                            return float(value)
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def system_busy(cores):
+    """Reason the machine is too busy for a background scan, or None"""
+    try:
+        load = os.getloadavg()[0]
+        if load > cores * LOAD_PER_CORE:
+            return f"load {load:.2f}"
+    except (AttributeError, OSError):
+        pass
+    for resource in ('cpu', 'io'):
+        pressure = read_pressure(resource)
+        if pressure is not None and pressure > PSI_LIMIT:
+            return f"{resource} pressure {pressure:.1f}%"
+    return None
+
+
+class RefreshScheduler:
+    """⏳ Coalescing, low-priority catalog refresher
+
+    trigger() may be called any number of times; pending triggers collapse
+    into one scan through the detector's ScanCoordinator. on_catalog is
+    called from the scheduler thread with each refreshed catalog.
+    """
+
+    def __init__(self, detector, on_catalog=None, interval=None):
+        self.detector = detector
+        self.on_catalog = on_catalog
+        # Periodic check; a non-forced scan is a few stats when nothing changed
+        self.interval = interval or detector.cache_duration
+        self.cores = getattr(getattr(detector, 'profile', None), 'cores', None) or os.cpu_count() or 1
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._pending = None  # None, or force flag of the coalesced request
+        self.last_activity = 0.0
+        self.last_launch = 0.0
+        self.refreshes = 0
+        self.deferrals = 0
+        self.thread = None
+
+    def start(self):
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name='apex-refresh', daemon=True)
+            self.thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def trigger(self, force_refresh=False):
+        """Ask for a refresh; repeated calls before it runs are merged"""
+        with self._lock:
+            self._pending = bool(force_refresh) or bool(self._pending)
+        self._wake.set()
+
+    def note_activity(self):
+        """The user is typing; hold scans until they pause"""
+        self.last_activity = time.monotonic()
+
+    def note_launch(self):
+        """An app was just launched; keep the disk and CPU for it"""
+        self.last_launch = time.monotonic()
+
+    def busy_reason(self):
+        now = time.monotonic()
+        if now - self.last_activity < QUIET_SECONDS:
+            return "typing"
+        if now - self.last_launch < LAUNCH_GRACE_SECONDS:
+            return "app starting"
+        return system_busy(self.cores)
+
+    def _run(self):
+        lower_thread_priority()
+        while not self._stop.is_set():
+            if not self._wake.wait(self.interval):
+                self.trigger()  # Periodic check
+            self._wake.clear()
+            if self._stop.is_set():
+                return
+            self._wait_until_idle()
+            with self._lock:
+                force, self._pending = bool(self._pending), None
+            try:
+                catalog = self.detector.scans.scan(force)
+            except Exception as e:
+                print(f"Background refresh failed: {e}", file=sys.stderr)
+                continue
+            self.refreshes += 1
+            if self.on_catalog is not None:
+                try:
+                    self.on_catalog(catalog)
+                except Exception as e:
+                    print(f"Background refresh callback failed: {e}", file=sys.stderr)
+
+    def _wait_until_idle(self):
+        """Back off (doubling) while busy, up to MAX_DEFER_SECONDS"""
+        deadline = time.monotonic() + MAX_DEFER_SECONDS
+        backoff = 1.0
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            reason = self.busy_reason()
+            if reason is None:
+                return
+            self.deferrals += 1
+            if reason == "typing":
+                delay = QUIET_SECONDS
+            elif reason == "app starting":
+                delay = LAUNCH_GRACE_SECONDS - (time.monotonic() - self.last_launch)
+            else:
+                delay = backoff
+                backoff = min(backoff * 2, MAX_BACKOFF_SECONDS)
+            # New triggers don't cut the wait short; they are already merged
+            self._stop.wait(max(0.1, min(delay, deadline - time.monotonic())))
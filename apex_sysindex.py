@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+🗄️ APEX Launcher - System Index
+A read-only catalog of everything users share (/usr/share/applications,
+/usr/bin and the other system PATH directories, system flatpaks, snaps
+and man pages), built once into /var/cache/apex-launcher by a package
+manager hook instead of by every user.
+
+Entries are stored per directory with the directory's mtime. A per-user
+scan takes each system directory whose mtime still matches from here and
+only reads ~/.local, ~/Desktop and per-user flatpaks itself; anything
+installed since the last build is scanned as before.
+
+    apex-launcher --build-system-index     # as root; run by the pacman/apt hooks
+
+APEX_SYSTEM_INDEX_DIR points both the builder and readers elsewhere.
+"""
+
+import os
+import sys
+import json
+import time
+
+from apex_core import PARSER_VERSION, cache_dir
+
+SYSTEM_INDEX_DIR = '/var/cache/apex-launcher'
+INDEX_NAME = 'system.db'
+
+# Bumped when the stored entry layout changes; older indexes are ignored
+INDEX_FORMAT = 1
+
+
+def index_dir():
+    return os.environ.get('APEX_SYSTEM_INDEX_DIR') or SYSTEM_INDEX_DIR
+
+
+def index_path():
+    return os.path.join(index_dir(), INDEX_NAME)
+
+
+def user_index_path():
+    """Where a user without write access to the system location keeps an imported index"""
+    return os.path.join(cache_dir(), INDEX_NAME)
+
+
+def init_tables(conn):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS system_sources (
+            source TEXT,
+            dir TEXT,
+            mtime REAL,
+            entries TEXT,
+            PRIMARY KEY (source, dir)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS system_index (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+    ''')
+
+
+class SystemIndex:
+    """🗄️ Read-only view of the prebuilt system catalog"""
+
+    def __init__(self, path):
+        self.path = path
+
+    @classmethod
+    def open(cls, path=None):
+        """The newest usable index (system location or a user's imported bundle), or None"""
+        candidates = []
+        for candidate in ([path] if path else [index_path(), user_index_path()]):
+            try:
+                candidates.append((os.stat(candidate).st_mtime, candidate))
+            except OSError:
+                continue
+        for _mtime, candidate in sorted(candidates, reverse=True):
+            index = cls(candidate)
+            info = index.info()
+            # Entries parsed by another scanner version would mix old and new parsing
+            if info.get('format') == str(INDEX_FORMAT) and info.get('parser_version') == str(PARSER_VERSION):
+                return index
+        return None
+
+    def _connect(self):
+        import sqlite3
+        from urllib.parse import quote
+        # Read-only: the file belongs to root and users must never write to it
+        return sqlite3.connect(f'file:{quote(self.path)}?mode=ro', uri=True, timeout=2)
+
+    def _query(self, sql, params=()):
+        try:
+            with self._connect() as conn:
+                return conn.execute(sql, params).fetchall()
+        except Exception as e:
+            print(f"System index unreadable: {e}", file=sys.stderr)
+            return []
+
+    def info(self):
+        """Build metadata: format, built_at, version"""
+        return dict(self._query('SELECT key, value FROM system_index'))
+
+    def sources(self, source):
+        """directory -> (mtime, {name: entry}) for one source (desktop, flatpak, snap)"""
+        result = {}
+        for directory, mtime, entries in self._query(
+                'SELECT dir, mtime, entries FROM system_sources WHERE source = ?', (source,)):
+            try:
+                # Decoded per call: callers mutate the entries while merging
+                result[directory] = (mtime, json.loads(entries))
+            except ValueError:
+                continue
+        return result
+
+    def path_listings(self):
+        """directory -> (mtime, executable names), as in apps.db"""
+        return {directory: (mtime, names.split('\n') if names else [])
+                for directory, mtime, names in self._query(
+                    'SELECT dir, mtime, executables FROM path_listings')}
+
+    def fingerprints(self):
+        """directory -> mtime for every directory the index was built from"""
+        prints = {}
+        for sql in ('SELECT dir, mtime FROM system_sources',
+                    'SELECT dir, mtime FROM path_listings',
+                    'SELECT DISTINCT mandir, mtime FROM man_descriptions'):
+            prints.update(self._query(sql))
+        return prints
+
+    def man_descriptions(self, man_dir, mtime):
+        """command -> description for man_dir if indexed at this mtime, else None"""
+        rows = self._query('SELECT command, description FROM man_descriptions '
+                           'WHERE mandir = ? AND mtime = ?', (man_dir, mtime))
+        return dict(rows) if rows else None
+
+
+def _read_version():
+    try:
+        with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'VERSION')) as f:
+            return f.read().strip()
+    except OSError:
+        return ''
+
+
+def build_system_index(directory=None):
+    """Scan the shared directories into <directory>/system.db; returns the app count"""
+    import sqlite3
+    from apex_core import AdvancedApplicationDetector
+    directory = directory or index_dir()
+    os.makedirs(directory, mode=0o755, exist_ok=True)
+    final = os.path.join(directory, INDEX_NAME)
+    # Built beside the old index and swapped in, so readers never see a partial file
+    tmp = os.path.join(directory, f'.{INDEX_NAME}.{os.getpid()}')
+    for path in (tmp, tmp + '-journal'):
+        if os.path.exists(path):
+            os.remove(path)
+    try:
+        detector = AdvancedApplicationDetector(db_path=tmp, system_scope=True)
+        catalog = detector.detect_applications(force_refresh=True)
+        if not any(catalog.values()):
+            # detect_applications() reports failures as an empty catalog; keep the old index
+            raise RuntimeError("the scan found no applications")
+        if detector.scan_truncated:
+            # A partial snapshot would ship to every user and in every bundle
+            raise RuntimeError("the scan hit the memory budget (raise APEX_MEMORY_MB)")
+        with sqlite3.connect(tmp) as conn:
+            init_tables(conn)
+            conn.executemany('INSERT OR REPLACE INTO system_sources (source, dir, mtime, entries) '
+                             'VALUES (?, ?, ?, ?)',
+                             [(source, path, mtime, entries)
+                              for (source, path), (mtime, entries) in detector.source_listings.items()])
+            conn.executemany('INSERT OR REPLACE INTO system_index (key, value) VALUES (?, ?)', [
+                ('format', str(INDEX_FORMAT)),
+                ('parser_version', str(PARSER_VERSION)),
+                ('built_at', str(time.time())),
+                ('version', _read_version()),
+            ])
+            conn.commit()
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, final)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+    return sum(len(apps) for apps in catalog.values())
+
+
+def remove_system_index(directory=None):
+    try:
+        os.remove(os.path.join(directory or index_dir(), INDEX_NAME))
+    except OSError:
+        pass
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    if '--remove' in args:
+        remove_system_index()
+        sys.exit(0)
+    try:
+        count = build_system_index()
+    except Exception as e:
+        print(f"❌ Cannot write the system index in {index_dir()}: {e}", file=sys.stderr)
+        print("   Run as root, or set APEX_SYSTEM_INDEX_DIR", file=sys.stderr)
+        sys.exit(1)
+    if '--quiet' not in args:
+        print(f"🗄️ System index: {count:,} applications in {index_path()}")
+    sys.exit(0)
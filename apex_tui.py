@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+⌨️ APEX Launcher - Terminal UI
+curses search-as-you-type frontend: results update on every keystroke
+from an in-memory SearchIndex, arrow keys move, Enter launches.
+
+Built for slow links: only rows whose text or highlight changed are
+rewritten, and a burst of typed-ahead keys is applied before a single
+redraw.
+"""
+
+import os
+import sys
+
+from apex_core import LaunchError, SearchIndex, record_launch
+
+# Rows above the result list: prompt and status
+HEADER_ROWS = 2
+
+NAME_WIDTH = 32
+CATEGORY_WIDTH = 12
+
+KEY_ESCAPE = 27
+
+
+class LauncherTUI:
+    """⌨️ Incremental-search launcher screen"""
+
+    def __init__(self, apps, supervisor, db_path=None):
+        self.apps = apps
+        self.index = SearchIndex(apps)
+        # Ctrl-A swaps in an index of installed apps only, built on first use
+        self.indexes = {False: self.index}
+        self.available_only = False
+        self.supervisor = supervisor
+        self.db_path = db_path
+        self.query = ''
+        self.results = self.index.search('')
+        self.selected = 0
+        self.offset = 0
+        self.message = ''
+        self.drawn = {}  # row -> (text, attr) currently on screen
+        self.screen = None
+
+    def run(self):
+        import curses
+        import locale
+        # UTF-8 names and descriptions need the user's locale
+        locale.setlocale(locale.LC_ALL, '')
+        # Esc should quit promptly, not after the default 1 s escape-sequence wait
+        os.environ.setdefault('ESCDELAY', '25')
+        return curses.wrapper(self._main)
+
+    def _main(self, screen):
+        import curses
+        self.curses = curses
+        self.screen = screen
+        try:
+            curses.curs_set(1)
+        except curses.error:
+            pass
+        screen.keypad(True)
+        self.draw()
+        while True:
+            try:
+                keys = [screen.get_wch()]
+            except curses.error:
+                # Interrupted, e.g. by SIGCHLD from a launched app exiting
+                continue
+            # Apply everything already typed ahead before redrawing once
+            screen.nodelay(True)
+            try:
+                while True:
+                    keys.append(screen.get_wch())
+            except curses.error:
+                pass
+            finally:
+                screen.nodelay(False)
+            for key in keys:
+                if self.handle_key(key) is False:
+                    return 0
+            self.draw()
+
+    # Input
+
+    def handle_key(self, key):
+        """Apply one key; False means quit"""
+        curses = self.curses
+        if key in (KEY_ESCAPE, chr(KEY_ESCAPE), '\x03', '\x04'):
+            return False
+        if key == curses.KEY_RESIZE:
+            self.screen.clear()
+            self.drawn = {}
+        elif key in (curses.KEY_UP, '\x10'):
+            self.move(-1)
+        elif key in (curses.KEY_DOWN, '\x0e'):
+            self.move(1)
+        elif key == curses.KEY_PPAGE:
+            self.move(-self.page_size())
+        elif key == curses.KEY_NPAGE:
+            self.move(self.page_size())
+        elif key in ('\n', '\r', curses.KEY_ENTER):
+            self.launch_selected()
+        elif key in (curses.KEY_BACKSPACE, '\x7f', '\x08'):
+            self.set_query(self.query[:-1])
+        elif key == '\x15':  # Ctrl-U
+            self.set_query('')
+        elif key == '\x01':  # Ctrl-A
+            self.toggle_available()
+        elif key == '\x17':  # Ctrl-W
+            self.set_query(self.query.rstrip().rpartition(' ')[0])
+        elif isinstance(key, str) and key.isprintable():
+            self.set_query(self.query + key)
+        return True
+
+    def set_query(self, query):
+        if query == self.query:
+            return
+        self.query = query
+        self.results = self.index.search(query)
+        self.selected = 0
+        self.offset = 0
+        self.message = ''
+
+    def toggle_available(self):
+        self.available_only = not self.available_only
+        index = self.indexes.get(self.available_only)
+        if index is None:
+            index = self.indexes[True] = SearchIndex(
+                [app for app in self.apps if app.get('available', True)])
+        self.index = index
+        self.results = index.search(self.query)
+        self.selected = 0
+        self.offset = 0
+        self.message = ''
+
+    def page_size(self):
+        height, _width = self.screen.getmaxyx()
+        return max(1, height - HEADER_ROWS)
+
+    def move(self, delta):
+        if not self.results:
+            return
+        self.selected = max(0, min(len(self.results) - 1, self.selected + delta))
+        page = self.page_size()
+        if self.selected < self.offset:
+            self.offset = self.selected
+        elif self.selected >= self.offset + page:
+            self.offset = self.selected - page + 1
+
+    def launch_selected(self):
+        if not self.results:
+            return
+        app = self.results[self.selected]
+        try:
+            result = self.supervisor.launch(app)
+        except LaunchError as e:
+            self.message = f"Failed: {e}"
+            return
+        if result.reused:
+            self.message = f"Already running: {app.get('name')} (pid {result.pid})"
+        else:
+            record_launch(app, self.db_path)
+            self.message = f"Launched: {app.get('name')} (pid {result.pid}, {result.latency_ms:.1f} ms)"
+
+    # Output
+
+    def format_row(self, app, width):
+        name = app.get('name', '')
+        category = app.get('category', '')
+        description = app.get('description', '')
+        line = f" {name[:NAME_WIDTH]:<{NAME_WIDTH}} {category[:CATEGORY_WIDTH]:<{CATEGORY_WIDTH}} {description}"
+        return line[:width]
+
+    def build_lines(self, height, width):
+        curses = self.curses
+        scope = 'installed apps' if self.available_only else 'apps'
+        status = self.message or f"{len(self.results):,} of {len(self.index):,} {scope}  " \
+                                 "↑/↓ select · Enter launch · ^A installed only · Esc quit"
+        lines = {
+            0: (f"> {self.query}"[:width], curses.A_BOLD),
+            1: (status[:width], curses.A_DIM),
+        }
+        for row in range(HEADER_ROWS, height):
+            i = self.offset + row - HEADER_ROWS
+            if i < len(self.results):
+                attr = curses.A_REVERSE if i == self.selected else curses.A_NORMAL
+                lines[row] = (self.format_row(self.results[i], width), attr)
+            else:
+                lines[row] = ('', curses.A_NORMAL)
+        return lines
+
+    def draw(self):
+        """Rewrite only the rows that differ from what is on screen"""
+        curses = self.curses
+        screen = self.screen
+        height, width = screen.getmaxyx()
+        # Never write the last column: curses errors on the bottom-right cell
+        lines = self.build_lines(height, max(1, width - 1))
+        for row, line in lines.items():
+            if self.drawn.get(row) == line:
+                continue
+            text, attr = line
+            try:
+                screen.move(row, 0)
+                screen.clrtoeol()
+                if text:
+                    screen.addstr(row, 0, text, attr)
+            except curses.error:
+                pass
+            self.drawn[row] = line
+        for row in [r for r in self.drawn if r >= height]:
+            del self.drawn[row]
+        try:
+            screen.move(0, min(width - 1, 2 + len(self.query)))
+        except curses.error:
+            pass
+        screen.noutrefresh()
+        curses.doupdate()
+
+
+def run_tui(launcher):
+    """Start the TUI on a SmartCLILauncher's detector and supervisor"""
+    if not sys.stdin.isatty() or not sys.stdout.isatty():
+        print("The TUI needs a terminal; use `list`/`search` for pipes", file=sys.stderr)
+        return 2
+    try:
+        import curses  # noqa: F401
+    except ImportError:
+        print("curses is not available in this Python", file=sys.stderr)
+        return 1
+    launcher.supervisor.install_sigchld()
+    apps = list(launcher.iter_records())
+    return LauncherTUI(apps, launcher.supervisor, launcher.detector.db_path).run()
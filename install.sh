@@ -37,7 +37,7 @@ if [ "$INSTALL_FROM_SOURCE" = true ]; then
     echo "📋 Installing application files..."
     
     # Check required files exist
-    REQUIRED_FILES=("apex_launcher.py" "smart_cli_launcher.py" "bin/apex-launcher" "apex-launcher.desktop" "apex-launcher.png")
+    REQUIRED_FILES=("apex_launcher.py" "apex_core.py" "apex_icons.py" "apex_launch.py" "apex_client.py" "apex_rpc.py" "apex_tui.py" "apex_manpages.py" "apex_resources.py" "apex_scheduler.py" "apex_sysindex.py" "apex_bundle.py" "apex_scanners.py" "smart_cli_launcher.py" "bin/apex-launcher" "apex-launcher.desktop" "apex-launcher.png")
     for file in "${REQUIRED_FILES[@]}"; do
         if [ ! -f "$file" ]; then
             echo "❌ Required file missing: $file" >&2
@@ -47,7 +47,7 @@ if [ "$INSTALL_FROM_SOURCE" = true ]; then
     done
     
     # Install files
-    cp -f "apex_launcher.py" "$APPDIR/"
+    cp -f apex_*.py "$APPDIR/"
     cp -f "smart_cli_launcher.py" "$APPDIR/"
     cp -f "apex-launcher.png" "$APPDIR/"
     cp -f "VERSION" "$APPDIR/" 2>/dev/null || echo "1.0.0" > "$APPDIR/VERSION"
@@ -88,7 +88,7 @@ else
     cd apex-launcher-main/
     
     # Install files
-    cp -f "apex_launcher.py" "$APPDIR/"
+    cp -f apex_*.py "$APPDIR/"
     cp -f "smart_cli_launcher.py" "$APPDIR/"
     cp -f "apex-launcher.png" "$APPDIR/"
     cp -f "VERSION" "$APPDIR/" 2>/dev/null || echo "1.0.0" > "$APPDIR/VERSION"
@@ -117,6 +117,24 @@ if command -v update-desktop-database >/dev/null 2>&1; then
     update-desktop-database "$DESKTOP_DIR" 2>/dev/null || true
 fi
 
+# Fleets: start from a catalog bundle exported on an identical machine
+if [ -n "${APEX_CATALOG_BUNDLE:-}" ]; then
+    echo "📦 Importing catalog bundle..."
+    "$BIN/apex-launcher" --import-bundle "$APEX_CATALOG_BUNDLE" || echo "⚠️  Bundle not imported; the first launch will scan"
+fi
+
+# System-wide install: prebuild the shared catalog and keep it current after apt runs
+if [ "$(id -u)" -eq 0 ]; then
+    if [ -z "${APEX_CATALOG_BUNDLE:-}" ]; then
+        echo "🗄️  Building the system index..."
+        "$BIN/apex-launcher" --build-system-index --quiet 2>/dev/null || echo "⚠️  System index not built"
+    fi
+    if [ -d /etc/apt/apt.conf.d ]; then
+        echo "DPkg::Post-Invoke { \"$BIN/apex-launcher --build-system-index --quiet >/dev/null 2>&1 || true\"; };" \
+            > /etc/apt/apt.conf.d/99apex-launcher
+    fi
+fi
+
 # Check PyQt5 availability
 if python3 -c "import PyQt5" >/dev/null 2>&1; then
     GUI_AVAILABLE="✅ GUI mode available"
@@ -4,82 +4,123 @@
 """
 Smart CLI Launcher - Terminal-based intelligent launcher
 Works without GUI, perfect for headless systems
+
+Interactive menu by default; for scripts, dmenu and fzf:
+    smart_cli_launcher.py list [CATEGORY] [--available] [--json|--ndjson]
+    smart_cli_launcher.py search QUERY [--limit N] [--available] [--json|--ndjson]
+    smart_cli_launcher.py launch NAME|ID [--json]
+    smart_cli_launcher.py refresh [--json]
+    smart_cli_launcher.py tui           (curses search-as-you-type, also --tui)
 """
 
 import sys
 import os
-import subprocess
-import json
-from pathlib import Path
 
-# Optional fuzzy matching
-try:
-    from rapidfuzz import fuzz as _fuzz
-    _HAS_RAPIDFUZZ = True
-except Exception:
-    _HAS_RAPIDFUZZ = False
+# Shared Qt-free detector, cache and launch engine
+# (fuzzy ranking uses RapidFuzz when installed, see apex_core.FuzzyMatcher)
+from apex_core import (AdvancedApplicationDetector, CATEGORIES, FuzzyMatcher, LaunchError,
+                       ProcessSupervisor, app_record, get_launch_engine, iter_apps, record_launch,
+                       search_apps)
+
+# Interactive searches list at most this many best matches
+SEARCH_RESULTS = 40
+
+SCRIPT_COMMANDS = ('list', 'search', 'launch', 'refresh')
+
+# Streamed output is flushed after the first record, then every this many
+FLUSH_EVERY = 256
+
+
+class RecordWriter:
+    """Streams records to stdout as text lines, NDJSON or a single JSON array"""
+
+    def __init__(self, fmt='text', out=None):
+        self.fmt = fmt
+        self.out = out or sys.stdout
+        self.count = 0
+        if fmt != 'text':
+            import json
+            self._dumps = json.dumps
+
+    def write(self, record):
+        if self.fmt == 'text':
+            self.out.write('\t'.join(str(record.get(key, '')) for key in ('id', 'name', 'category', 'description')) + '\n')
+        elif self.fmt == 'ndjson':
+            self.out.write(self._dumps(record) + '\n')
+        else:
+            # The separator goes before each element so nothing waits on the next one
+            self.out.write(('[\n' if self.count == 0 else ',\n') + self._dumps(record))
+        self.count += 1
+        if self.count == 1 or self.count % FLUSH_EVERY == 0:
+            self.out.flush()
+
+    def close(self):
+        if self.fmt == 'json':
+            self.out.write('[]\n' if self.count == 0 else '\n]\n')
+        self.out.flush()
+
+
+def parse_command(argv):
+    """Split script arguments into (command, words, options); raises ValueError"""
+    words = []
+    options = {'format': 'text', 'limit': None, 'available': False}
+    args = iter(argv)
+    for arg in args:
+        if arg in ('--json', '--ndjson'):
+            options['format'] = arg[2:]
+        elif arg == '--limit' or arg.startswith('--limit='):
+            value = arg.split('=', 1)[1] if '=' in arg else next(args, '')
+            try:
+                options['limit'] = max(1, int(value))
+            except ValueError:
+                raise ValueError("--limit needs a number")
+        elif arg == '--available':
+            options['available'] = True
+        elif arg == '--cli':
+            continue
+        elif arg.startswith('-'):
+            raise ValueError(f"Unknown option {arg}")
+        else:
+            words.append(arg)
+    if not words or words[0] not in SCRIPT_COMMANDS:
+        raise ValueError(f"Expected one of: {', '.join(SCRIPT_COMMANDS)}")
+    return words[0], words[1:], options
 
-# Try to import ApplicationDetector; fallback to a simple detector
-try:
-    from smart_launcher import ApplicationDetector  # type: ignore
-except Exception:
-    class ApplicationDetector:
-        def __init__(self):
-            pass
-        def detect_applications(self):
-            apps = {}
-            desktop_dirs = [
-                '/usr/share/applications',
-                '/usr/local/share/applications',
-                os.path.expanduser('~/.local/share/applications')
-            ]
-            for desktop_dir in desktop_dirs:
-                if not os.path.exists(desktop_dir):
-                    continue
-                for fp in Path(desktop_dir).glob('*.desktop'):
-                    try:
-                        import configparser
-                        cfg = configparser.ConfigParser()
-                        cfg.read(fp, encoding='utf-8')
-                        if 'Desktop Entry' not in cfg:
-                            continue
-                        entry = cfg['Desktop Entry']
-                        if entry.get('Type', '').lower() != 'application':
-                            continue
-                        name = entry.get('Name', fp.stem)
-                        cmd = entry.get('Exec', '').replace('%U', '').replace('%F', '').strip()
-                        desc = entry.get('Comment', entry.get('GenericName', 'Application'))
-                        category = 'Other'
-                        apps.setdefault(category, []).append({
-                            'name': name,
-                            'command': cmd,
-                            'description': desc,
-                            'source': 'desktop'
-                        })
-                    except Exception:
-                        continue
-            return apps
 
 class SmartCLILauncher:
     """Terminal-based smart launcher"""
     
     def __init__(self):
-        self.detector = ApplicationDetector()
+        self.detector = AdvancedApplicationDetector()
+        self.launch_engine = get_launch_engine()
+        self.supervisor = ProcessSupervisor(self.launch_engine)
         self.applications = {}
+        self._matchers = {}
+        self.catalog = {}
+        # Hide entries whose program is not installed
+        self.available_only = False
         self.current_category = ""
         
-    def load_applications(self):
-        """Load and categorize applications"""
-        print("🔍 Scanning for applications...")
-        detected_apps = self.detector.detect_applications()
-        
+    def load_applications(self, force_refresh=False):
+        """Load categorized applications from the shared cache (rescans only when stale)"""
+        if force_refresh:
+            print("🔍 Rescanning for applications...")
+        self.catalog = self.detector.scans.scan(force_refresh)
+        total_apps = self.apply_filter()
+        print(f"✅ Found {total_apps} applications in {len(self.applications)} categories")
+
+    def apply_filter(self):
+        """Rebuild the visible categories from the catalog; returns the app count"""
+        self.applications = {}
+        self._matchers = {}
         total_apps = 0
-        for category, apps in detected_apps.items():
+        for category, apps in self.catalog.items():
+            if self.available_only:
+                apps = [app for app in apps if app.get('available', True)]
             if apps:  # Only include categories with apps
                 self.applications[category] = apps
                 total_apps += len(apps)
-                
-        print(f"✅ Found {total_apps} applications in {len(self.applications)} categories")
+        return total_apps
         
     def show_main_menu(self):
         """Show main categories menu"""
@@ -97,7 +138,8 @@ class SmartCLILauncher:
                 
             print(f"\n{len(categories)+1:2d}. 🔍 Search applications")
             print(f"{len(categories)+2:2d}. 🔄 Refresh/Rescan")
-            print(f"{len(categories)+3:2d}. ❌ Exit")
+            print(f"{len(categories)+3:2d}. ✅ Installed only: {'on' if self.available_only else 'off'}")
+            print(f"{len(categories)+4:2d}. ❌ Exit")
             
             try:
                 choice = input("\n➤ Select option: ").strip()
@@ -113,8 +155,11 @@ class SmartCLILauncher:
                 elif choice_num == len(categories) + 1:
                     self.search_applications()
                 elif choice_num == len(categories) + 2:
-                    self.load_applications()
+                    self.load_applications(force_refresh=True)
                 elif choice_num == len(categories) + 3:
+                    self.available_only = not self.available_only
+                    self.apply_filter()
+                elif choice_num == len(categories) + 4:
                     print("\n👋 Goodbye!")
                     break
                 else:
@@ -147,7 +192,7 @@ class SmartCLILauncher:
                 for i, app in enumerate(page_apps, start_idx + 1):
                     name = app['name'][:40] + "..." if len(app['name']) > 40 else app['name']
                     desc = app['description'][:30] + "..." if len(app['description']) > 30 else app['description']
-                    source = f"[{app['source']}]"
+                    source = f"[{app.get('type', '?')}]"
                     print(f"{i:3d}. ⚡ {name:<43} {source:<8} {desc}")
                 
                 # Navigation options
@@ -200,11 +245,8 @@ class SmartCLILauncher:
         if not query:
             return
             
-        found_apps = []
-        for category, apps in self.applications.items():
-            for app in apps:
-                if self.matches_search(app, query):
-                    found_apps.append((category, app))
+        found_apps = [(app.get('category', 'Other'), app)
+                      for app in self.find_apps(query, 'All', SEARCH_RESULTS)]
                     
         if not found_apps:
             print(f"❌ No applications found for '{query}'")
@@ -236,7 +278,7 @@ class SmartCLILauncher:
             return
             
         apps = self.applications[category]
-        found_apps = [app for app in apps if self.matches_search(app, query)]
+        found_apps = self.find_apps(query, category, SEARCH_RESULTS)
         
         if not found_apps:
             print(f"❌ No applications found in {category} for '{query}'")
@@ -261,14 +303,16 @@ class SmartCLILauncher:
         except (ValueError, KeyboardInterrupt):
             pass
             
-    def matches_search(self, app: dict, query: str) -> bool:
-        """Check if app matches search query"""
-        q = query.lower()
-        fields = [app.get('name', '').lower(), app.get('command', '').lower(), app.get('description', '').lower()]
-        if _HAS_RAPIDFUZZ and len(q) >= 2:
-            score = max(_fuzz.partial_ratio(q, f) for f in fields)
-            return score >= 70
-        return any(q in f for f in fields)
+    def find_apps(self, query: str, category: str = 'All', limit=None) -> list:
+        """Top matches for query, best first (one batch-scoring matcher per category)"""
+        matcher = self._matchers.get(category)
+        if matcher is None:
+            if category == 'All':
+                apps = [app for app_list in self.applications.values() for app in app_list]
+            else:
+                apps = self.applications.get(category, [])
+            matcher = self._matchers[category] = FuzzyMatcher(apps)
+        return matcher.search(query, limit)
         
     def launch_application(self, app: dict):
         """Launch an application"""
@@ -282,10 +326,14 @@ class SmartCLILauncher:
         if confirm in ['y', 'yes']:
             try:
                 print("⚡ Starting application...")
-                subprocess.Popen(app['command'], shell=True, 
-                               stdout=subprocess.DEVNULL, 
-                               stderr=subprocess.DEVNULL)
-                print("✅ Application launched successfully!")
+                result = self.supervisor.launch(app)
+                if result.reused:
+                    print(f"🔁 Already running (pid {result.pid})")
+                else:
+                    print(f"✅ Application launched successfully! (pid {result.pid}, {result.latency_ms:.1f} ms)")
+                    record_launch(app, self.detector.db_path)
+            except LaunchError as e:
+                print(f"❌ {e}")
             except Exception as e:
                 print(f"❌ Failed to launch: {e}")
         else:
@@ -293,12 +341,102 @@ class SmartCLILauncher:
             
         input("Press Enter to continue...")
         
+    def iter_records(self, category=None, available_only=False):
+        """Apps from the shared cache, scanning first only if it is stale"""
+        if not self.detector.cache_is_fresh():
+            # Through the coordinator, so a concurrent refresh is joined rather than repeated
+            catalog = self.detector.scans.scan()
+            if not self.detector.cache_is_fresh():
+                # Cache not writable: serve the scan itself (no ids)
+                apps = iter_apps(catalog, category)
+            else:
+                apps = self.detector.iter_cached(category)
+        else:
+            apps = self.detector.iter_cached(category)
+        for app in apps:
+            if not available_only or app.get('available', True):
+                yield app
+
+    def run_command(self, argv):
+        """Non-interactive entry: returns an exit code"""
+        try:
+            command, words, options = parse_command(argv)
+        except ValueError as e:
+            print(f"smart_cli_launcher: {e}", file=sys.stderr)
+            return 2
+        writer = RecordWriter(options['format'])
+        try:
+            if command == 'list':
+                category = None
+                if words:
+                    names = {cat.lower(): cat for cat in list(CATEGORIES) + ['Other', 'All']}
+                    category = names.get(' '.join(words).lower())
+                    if category is None:
+                        print(f"Unknown category {' '.join(words)!r}", file=sys.stderr)
+                        return 1
+                for app in self.iter_records(category, options['available']):
+                    writer.write(app_record(app))
+            elif command == 'search':
+                if not words:
+                    print("search needs a QUERY", file=sys.stderr)
+                    return 2
+                apps = self.iter_records(available_only=options['available'])
+                for app in FuzzyMatcher(apps).search(' '.join(words), options['limit']):
+                    writer.write(app_record(app))
+            elif command == 'launch':
+                return self._launch_command(' '.join(words), writer)
+            elif command == 'refresh':
+                catalog = self.detector.scans.scan(force_refresh=True)
+                stats = {'apps': sum(len(apps) for apps in catalog.values()),
+                         'categories': {cat: len(apps) for cat, apps in catalog.items() if apps}}
+                if options['format'] == 'text':
+                    print(f"✅ {stats['apps']} applications in {len(stats['categories'])} categories")
+                else:
+                    writer.write(stats)
+            writer.close()
+            return 0
+        except BrokenPipeError:
+            # The reader (fzf, head) went away; keep the interpreter quiet at exit
+            devnull = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(devnull, sys.stdout.fileno())
+            return 0
+
+    def _launch_command(self, target, writer):
+        if not target:
+            print("launch needs a NAME or ID", file=sys.stderr)
+            return 2
+        if target.isdigit():
+            app = self.detector.find_cached(target)
+        else:
+            hits = search_apps(self.iter_records(), target, limit=1)
+            app = hits[0] if hits else None
+        if app is None:
+            print(f"No application matching {target!r}", file=sys.stderr)
+            return 1
+        try:
+            result = self.supervisor.launch(app)
+        except LaunchError as e:
+            print(f"❌ {e}", file=sys.stderr)
+            return 1
+        if not result.reused:
+            record_launch(app, self.detector.db_path)
+        if writer.fmt == 'text':
+            print(f"🚀 Launched: {app['name']} (pid {result.pid}, {result.latency_ms:.1f} ms)")
+        else:
+            record = app_record(app)
+            record.update(pid=result.pid, reused=result.reused)
+            writer.write(record)
+            writer.close()
+        return 0
+
     def run(self):
         """Run the launcher"""
         print("🚀 Smart Echo Launcher - CLI Edition")
         print("Loading applications...")
         
         try:
+            # Reap launched apps as they exit instead of leaving zombies
+            self.supervisor.install_sigchld()
             self.load_applications()
             if not self.applications:
                 print("❌ No applications found!")
@@ -312,7 +450,13 @@ class SmartCLILauncher:
 
 def main():
     """Main entry point"""
+    argv = [arg for arg in sys.argv[1:] if arg != '--cli']
     launcher = SmartCLILauncher()
+    if argv and argv[0] in ('tui', '--tui'):
+        from apex_tui import run_tui
+        sys.exit(run_tui(launcher))
+    if argv and argv[0] in SCRIPT_COMMANDS:
+        sys.exit(launcher.run_command(argv))
     launcher.run()
 
 if __name__ == "__main__":
@@ -53,12 +53,14 @@ fi
 
 # Test syntax
 echo "🔍 Testing syntax..."
-if python3 -m py_compile apex_launcher.py; then
-    print_status "apex_launcher.py syntax OK"
-else
-    print_error "apex_launcher.py syntax error"
-    exit 1
-fi
+for module in apex_*.py; do
+    if python3 -m py_compile "$module"; then
+        print_status "$module syntax OK"
+    else
+        print_error "$module syntax error"
+        exit 1
+    fi
+done
 
 if python3 -m py_compile smart_cli_launcher.py; then
     print_status "smart_cli_launcher.py syntax OK"
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """An empty home directory and no system index"""
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setenv('APEX_SYSTEM_INDEX_DIR', str(tmp_path / 'system-index'))
+    return tmp_path
+
+
+def write_desktop(directory, name, exec_line=None):
+    directory.mkdir(parents=True, exist_ok=True)
+    exec_line = exec_line or f'{name.lower()}-app'
+    (directory / f'{name.lower()}.desktop').write_text(
+        f"[Desktop Entry]\nType=Application\nName={name}\nExec={exec_line}\n")
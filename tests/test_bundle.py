@@ -0,0 +1,60 @@
+import hashlib
+import io
+import os
+import tarfile
+
+import pytest
+
+from apex_bundle import _stage_objects, check_fingerprints
+
+
+def _bundle(tmp_path, objects):
+    """A tar holding objects/<digest> for each (digest, data)"""
+    path = tmp_path / 'bundle.tar'
+    with tarfile.open(path, 'w') as tar:
+        for digest, data in objects:
+            info = tarfile.TarInfo(f'objects/{digest}')
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    return tarfile.open(path)
+
+
+def _digest(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def test_stage_objects_verifies_hashes(tmp_path):
+    data = b'catalog'
+    manifest = {'files': {'system.db': {'sha256': _digest(data)}}}
+    with _bundle(tmp_path, [(_digest(data), data)]) as tar:
+        staged = _stage_objects(tar, manifest, str(tmp_path))
+    with open(staged['system.db'], 'rb') as f:
+        assert f.read() == data
+
+
+def test_stage_objects_rejects_tampered_object(tmp_path):
+    digest = _digest(b'catalog')
+    manifest = {'files': {'system.db': {'sha256': digest}}}
+    with _bundle(tmp_path, [(digest, b'tampered')]) as tar:
+        with pytest.raises(ValueError, match='hash mismatch'):
+            _stage_objects(tar, manifest, str(tmp_path))
+
+
+@pytest.mark.parametrize('logical', ['../evil', 'icons/../x', 'icons/.hidden', 'other.db', 'icons/a/b'])
+def test_stage_objects_rejects_unexpected_names(tmp_path, logical):
+    data = b'x'
+    manifest = {'files': {logical: {'sha256': _digest(data)}}}
+    with _bundle(tmp_path, [(_digest(data), data)]) as tar:
+        with pytest.raises(ValueError):
+            _stage_objects(tar, manifest, str(tmp_path))
+
+
+def test_check_fingerprints_reports_drift(tmp_path):
+    same, changed = tmp_path / 'same', tmp_path / 'changed'
+    same.mkdir()
+    changed.mkdir()
+    prints = {str(same): os.stat(same).st_mtime, str(changed): os.stat(changed).st_mtime - 10,
+              str(tmp_path / 'gone'): 123.0}
+    matching, drifted = check_fingerprints(prints)
+    assert matching == [str(same)]
+    assert sorted(drifted) == sorted([str(changed), str(tmp_path / 'gone')])
@@ -0,0 +1,63 @@
+import sqlite3
+
+import pytest
+
+from conftest import write_desktop
+
+import apex_core
+
+
+def _scanned(home):
+    write_desktop(home / '.local/share/applications', 'Alpha')
+    detector = apex_core.AdvancedApplicationDetector()
+    detector.detect_applications(force_refresh=True)
+    return detector
+
+
+def test_matching_cache_is_left_alone(home):
+    detector = _scanned(home)
+    with sqlite3.connect(detector.db_path) as conn:
+        before = conn.execute('SELECT COUNT(*) FROM applications WHERE scan_time > 0').fetchone()[0]
+    apex_core.AdvancedApplicationDetector()
+    with sqlite3.connect(detector.db_path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM applications WHERE scan_time > 0').fetchone()[0] == before
+
+
+def test_new_rules_recategorize_without_a_scan(home, monkeypatch):
+    detector = _scanned(home)
+    with sqlite3.connect(detector.db_path) as conn:
+        assert conn.execute("SELECT category FROM applications WHERE name = 'Alpha'").fetchone()[0] == 'Other'
+
+    rules = {cat: list(words) for cat, words in apex_core.CATEGORIES.items()}
+    rules['Education'].append('alpha')
+    monkeypatch.setattr(apex_core, 'CATEGORIES', rules)
+    monkeypatch.setattr(apex_core.AdvancedApplicationDetector, 'detect_applications',
+                        lambda *args, **kwargs: pytest.fail('scanned'))
+    apex_core.AdvancedApplicationDetector()
+
+    with sqlite3.connect(detector.db_path) as conn:
+        category, scan_time = conn.execute(
+            "SELECT category, scan_time FROM applications WHERE name = 'Alpha'").fetchone()
+        assert category == 'Education'
+        assert scan_time > 0
+        assert dict(conn.execute('SELECT key, value FROM cache_meta'))['rules_hash'] == \
+            apex_core.rules_hash(rules)
+
+
+def test_new_parser_expires_rows_and_listings(home, monkeypatch):
+    detector = _scanned(home)
+    with sqlite3.connect(detector.db_path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM path_listings').fetchone()[0]
+        conn.execute("INSERT INTO scanner_cache (plugin, fingerprint, entries) VALUES ('x', '[]', '{}')")
+
+    monkeypatch.setattr(apex_core, 'PARSER_VERSION', apex_core.PARSER_VERSION + 1)
+    fresh = apex_core.AdvancedApplicationDetector()
+
+    with sqlite3.connect(detector.db_path) as conn:
+        assert conn.execute('SELECT COUNT(*) FROM applications WHERE scan_time > 0').fetchone()[0] == 0
+        assert conn.execute('SELECT COUNT(*) FROM path_listings').fetchone()[0] == 0
+        assert conn.execute('SELECT COUNT(*) FROM scanner_cache').fetchone()[0] == 0
+    # Rows are kept (with their usage counts) until the rescan replaces them
+    assert 'Alpha' in {app['name'] for app in fresh.iter_cached()}
+    assert not fresh.cache_is_fresh()
+
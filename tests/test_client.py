@@ -0,0 +1,28 @@
+import os
+
+import pytest
+
+from apex_client import runtime_dir
+
+
+def test_runtime_dir_is_created_private(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    path = runtime_dir()
+    assert path == str(tmp_path / 'apex-launcher')
+    assert os.stat(path).st_mode & 0o777 == 0o700
+
+
+def test_runtime_dir_refuses_a_symlink(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    (tmp_path / 'elsewhere').mkdir(mode=0o700)
+    os.symlink(tmp_path / 'elsewhere', tmp_path / 'apex-launcher')
+    with pytest.raises(PermissionError):
+        runtime_dir()
+
+
+def test_runtime_dir_refuses_a_shared_directory(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    (tmp_path / 'apex-launcher').mkdir()
+    os.chmod(tmp_path / 'apex-launcher', 0o777)
+    with pytest.raises(PermissionError):
+        runtime_dir()
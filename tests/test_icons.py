@@ -0,0 +1,90 @@
+import pytest
+
+Image = pytest.importorskip('PIL.Image')
+
+import apex_icons
+from apex_icons import IconAtlas, IconGenerator
+
+
+def _png(tmp_path, name, color):
+    path = tmp_path / f'{name}.png'
+    Image.new('RGBA', (16, 16), color).save(path)
+    return str(path)
+
+
+def test_two_instances_append_without_losing_sprites(tmp_path):
+    red = _png(tmp_path, 'red', (255, 0, 0, 255))
+    blue = _png(tmp_path, 'blue', (0, 0, 255, 255))
+    first = IconAtlas(tmp_path, size=16)
+    stale = IconAtlas(tmp_path, size=16)  # Loaded before first appends
+
+    assert first.add_files([('Red', 'Other', red)]) == 1
+    red_bytes = first.get('Red', 'Other')
+    assert stale.add_files([('Blue', 'Other', blue)]) == 1
+
+    # The stale instance appended after the existing sprite instead of over it
+    assert stale.slots == 2
+    assert (tmp_path / 'atlas-16.rgba').stat().st_size == 2 * 16 * 16 * 4
+    assert first.get('Red', 'Other') == red_bytes
+
+    reader = IconAtlas(tmp_path, size=16)
+    assert reader.get('Red', 'Other') == red_bytes
+    assert reader.get('Blue', 'Other')[:4] == bytes([0, 0, 255, 255])
+
+
+def test_partial_tail_is_skipped_not_truncated(tmp_path):
+    red = _png(tmp_path, 'red', (255, 0, 0, 255))
+    atlas = IconAtlas(tmp_path, size=16)
+    atlas.add_files([('Red', 'Other', red)])
+    with open(tmp_path / 'atlas-16.rgba', 'ab') as f:
+        f.write(b'\0' * 100)  # An interrupted append
+    size = (tmp_path / 'atlas-16.rgba').stat().st_size
+
+    blue = _png(tmp_path, 'blue', (0, 0, 255, 255))
+    assert atlas.add_files([('Blue', 'Other', blue)]) == 1
+    assert (tmp_path / 'atlas-16.rgba').stat().st_size > size
+    assert atlas.get('Blue', 'Other')[:4] == bytes([0, 0, 255, 255])
+    assert atlas.get('Red', 'Other')[:4] == bytes([255, 0, 0, 255])
+
+
+def test_generation_changes_only_when_slots_move(tmp_path):
+    red = _png(tmp_path, 'red', (255, 0, 0, 255))
+    blue = _png(tmp_path, 'blue', (0, 0, 255, 255))
+    atlas = IconAtlas(tmp_path, size=16)
+    other = IconAtlas(tmp_path, size=16)
+    green = _png(tmp_path, 'green', (0, 255, 0, 255))
+    atlas.add_files([('Red', 'Other', red), ('Green', 'Other', green), ('Blue', 'Other', blue)])
+    generation = atlas.generation
+    other.load()  # Appends keep every slot where it was
+    assert other.generation == 0
+
+    # Mostly dead, so it compacts: Blue moves to slot 0
+    atlas.retain(lambda key: key.startswith('Blue'))
+    assert atlas.generation > generation
+    assert atlas.index == {IconAtlas.make_key('Blue', 'Other'): 0}
+    other.load()
+    assert other.generation == 1
+
+
+class BrokenPool:
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def map(self, *args, **kwargs):
+        raise apex_icons.BrokenProcessPool('worker killed')
+
+
+def test_broken_worker_pool_falls_back_to_in_process_rendering(tmp_path, monkeypatch):
+    monkeypatch.setattr(apex_icons, 'ProcessPoolExecutor', BrokenPool)
+    generator = IconGenerator(cache_dir=tmp_path)
+    apps = [{'name': f'App {i}', 'category': 'Other'} for i in range(apex_icons.POOL_THRESHOLD)]
+    results = generator.generate_icons(apps, sizes=(16,), max_workers=2)
+    assert len(results) == len(apps)
+    assert all(isinstance(paths, dict) for paths in results.values())
+    assert generator.get_atlas(16).get('App 0', 'Other') is not None
@@ -0,0 +1,69 @@
+import pytest
+
+from apex_launch import (LaunchResult, ProcessSupervisor, expand_field_codes, parse_exec, quote_exec_arg,
+                         split_exec, unescape_exec)
+
+
+def test_split_exec_quoting():
+    assert split_exec('foo --bar baz') == ['foo', '--bar', 'baz']
+    assert split_exec('"/opt/My App/run" %U') == ['/opt/My App/run', '%U']
+    assert split_exec(r'sh -c "echo \"hi\" \$HOME \`x\` \\"') == ['sh', '-c', 'echo "hi" $HOME `x` \\']
+    assert split_exec('a  "" b') == ['a', '', 'b']
+
+
+def test_unescape_exec_string_escapes():
+    assert unescape_exec(r'a\sb\\c') == 'a b\\c'
+    assert unescape_exec(r'keep\q') == r'keep\q'
+
+
+def test_expand_field_codes():
+    files = ['/tmp/a.txt', '/tmp/b c.txt']
+    assert expand_field_codes(['edit', '%F'], files) == ['edit', '/tmp/a.txt', '/tmp/b c.txt']
+    assert expand_field_codes(['edit', '%f'], files) == ['edit', '/tmp/a.txt']
+    assert expand_field_codes(['edit', '%u'], []) == ['edit']
+    assert expand_field_codes(['app', '%i'], icon='app.png') == ['app', '--icon', 'app.png']
+    assert expand_field_codes(['app', '%i']) == ['app']
+    assert expand_field_codes(['app', '--title=%c', '%k'], name='App', desktop_file='/x.desktop') == \
+        ['app', '--title=App', '/x.desktop']
+    assert expand_field_codes(['printf', '100%%', '%d']) == ['printf', '100%']
+
+
+@pytest.mark.parametrize('path', [
+    '/usr/bin/plain',
+    '/home/a b/.local/bin/tool',
+    '/x/"q"/$HOME/`y`/back\\slash',
+    '/p/100%/x',
+    "/it's/(here)",
+])
+def test_quote_exec_arg_round_trips(path):
+    assert parse_exec(quote_exec_arg(path)) == [path]
+    assert parse_exec(quote_exec_arg(path) + ' %f', files=['/f']) == [path, '/f']
+
+
+def test_parse_exec_drops_flatpak_markers_and_deprecated_codes():
+    assert parse_exec('flatpak run --file-forwarding org.App @@u %U @@', files=['/f']) == \
+        ['flatpak', 'run', '--file-forwarding', 'org.App', '/f']
+    assert parse_exec('app %d %D %n %N %v %m') == ['app']
+
+
+class FakeEngine:
+    def __init__(self):
+        self.launched = []
+
+    def launch(self, app, files=()):
+        self.launched.append(app['name'])
+        return LaunchResult(4242, [app['exec']], 0.0)
+
+
+def test_single_instance_launch_falls_through_when_the_child_is_gone():
+    supervisor = ProcessSupervisor(FakeEngine())
+    supervisor._open_pidfd = lambda pid: None
+    supervisor.reap = lambda: []
+    app = {'name': 'Editor', 'exec': 'editor', 'single_instance': True}
+    # Left behind by a reaper that dropped the child but not yet its key
+    supervisor.by_key['editor'] = {1}
+    result = supervisor.launch(app)
+    assert not result.reused and supervisor.engine.launched == ['Editor']
+    again = supervisor.launch(app)
+    assert again.reused and again.pid == 4242
+    assert supervisor.engine.launched == ['Editor']
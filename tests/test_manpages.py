@@ -0,0 +1,73 @@
+import gzip
+
+from apex_manpages import page_command, parse_name_section, scan_man_dir
+
+GZIP_PAGE = r'''.TH GZIP 1 local
+.SH NAME
+gzip, gunzip, zcat \- compress or expand files
+.SH SYNOPSIS
+.B gzip
+'''
+
+MDOC_PAGE = r'''.Dd $Mdocdate$
+.Dt LS 1
+.Os
+.Sh NAME
+.Nm ls
+.Nd list directory contents
+.Sh SYNOPSIS
+'''
+
+HOSTNAME_PAGE = r'''.TH HOSTNAME 1 "2009-09-16" "net-tools" "Linux System Administrator's Manual"
+.SH NAME
+hostname \- show or set the system's host name
+.br
+domainname \- show or set the system's NIS/YP domain name
+.br
+ypdomainname \- show or set the system's NIS/YP domain name
+.SH SYNOPSIS
+'''
+
+
+def _lines(page):
+    return page.split('\n')
+
+
+def test_man_name_line_with_escaped_dash():
+    assert parse_name_section(_lines(GZIP_PAGE)) == (['gzip', 'gunzip', 'zcat'], 'compress or expand files')
+
+
+def test_mdoc_name_and_description():
+    assert parse_name_section(_lines(MDOC_PAGE)) == (['ls'], 'list directory contents')
+
+
+def test_multi_entry_name_section_keeps_the_first_entry():
+    assert parse_name_section(_lines(HOSTNAME_PAGE)) == (['hostname'], "show or set the system's host name")
+
+
+def test_page_without_name_section():
+    assert parse_name_section(_lines('.TH X 1\n.SH SYNOPSIS\nx \\- not a name line\n')) is None
+
+
+def test_page_command_strips_section_and_compression():
+    assert page_command('gzip.1.gz') == 'gzip'
+    assert page_command('CA.pl.1ssl.gz') == 'CA.pl'
+    assert page_command('lsblk.8') == 'lsblk'
+    assert page_command('README') == 'README'
+
+
+def test_scan_man_dir_follows_so_redirects(tmp_path):
+    with gzip.open(tmp_path / 'gzip.1.gz', 'wt') as f:
+        f.write(GZIP_PAGE)
+    (tmp_path / 'ls.1').write_text(MDOC_PAGE)
+    (tmp_path / 'CA.pl.1ssl').write_text('.SH NAME\nCA.pl \\- friendlier interface for OpenSSL certificate programs\n')
+    with gzip.open(tmp_path / 'gzcat.1.gz', 'wt') as f:
+        f.write('.so man1/gzip.1\n')
+    (tmp_path / 'dangling.1').write_text('.so man1/missing.1\n')
+
+    descriptions = scan_man_dir(str(tmp_path))
+    assert descriptions['gzip'] == descriptions['gunzip'] == 'compress or expand files'
+    assert descriptions['gzcat'] == 'compress or expand files'
+    assert descriptions['ls'] == 'list directory contents'
+    assert descriptions['CA.pl'] == 'friendlier interface for OpenSSL certificate programs'
+    assert 'dangling' not in descriptions
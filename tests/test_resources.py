@@ -0,0 +1,54 @@
+import pytest
+
+from conftest import write_desktop
+
+import apex_core
+import apex_resources
+from apex_resources import ResourceProfile
+
+
+def _names(catalog):
+    return {app['name'] for apps in catalog.values() for app in apps}
+
+
+def test_budget_counts_growth_over_the_scan_baseline(monkeypatch):
+    profile = ResourceProfile(cores=2, memory_mb=1000, storage='ssd')
+    assert profile.rss_budget_mb == 100
+    rss = [900.0]
+    monkeypatch.setattr(apex_resources, 'current_rss_mb', lambda: rss[0])
+    profile.begin_scan()
+    checks = lambda: any(profile.over_budget() for _ in range(apex_resources.BUDGET_CHECK_EVERY))
+    # A frontend already far above the budget is not the scan's doing
+    assert not checks()
+    rss[0] = 1001.0
+    assert checks()
+
+
+def test_truncated_scan_keeps_rows_and_listings(home, monkeypatch):
+    write_desktop(home / '.local/share/applications', 'Alpha')
+    detector = apex_core.AdvancedApplicationDetector()
+    detector.detect_applications(force_refresh=True)
+    assert 'Alpha' in {app['name'] for app in detector.iter_cached()}
+
+    # Over the memory budget from the start: every scan stage stops early
+    monkeypatch.setattr(detector.profile, 'over_budget', lambda: True)
+    recorded = []
+    detector._record_source = lambda *args: recorded.append(args)
+    catalog = detector.detect_applications(force_refresh=True)
+    assert detector.scan_truncated
+    assert [args for args in recorded if args[1] == 'desktop'] == []
+    cached = {app['name'] for app in detector.iter_cached()}
+    assert 'Alpha' in cached
+    # What the frontends show is what apps.db holds
+    assert _names(catalog) == cached
+
+
+def test_truncated_scan_is_not_published_as_system_index(home, monkeypatch, tmp_path):
+    from apex_sysindex import build_system_index
+    calls = []
+    # Trips partway through the merge, after some apps are in
+    monkeypatch.setattr(apex_resources.get_profile(), 'over_budget',
+                        lambda: calls.append(1) or len(calls) > 100)
+    with pytest.raises(RuntimeError, match='memory budget'):
+        build_system_index(str(tmp_path / 'index'))
+    assert not (tmp_path / 'index' / 'system.db').exists()
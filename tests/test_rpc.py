@@ -0,0 +1,35 @@
+from apex_core import SearchIndex, search_apps
+from apex_rpc import CatalogService
+
+
+def _app(name, category, command=None):
+    return {'name': name, 'category': category, 'command': command or name.lower(), 'type': 'desktop'}
+
+
+CATALOG = {
+    'Internet': [_app('Firefox', 'Internet'), _app('Fire Chat', 'Internet')],
+    'Development': [_app('Firebug', 'Development'), _app('Vim', 'Development')],
+}
+
+
+def test_search_serves_from_the_index_and_honours_categories():
+    service = CatalogService(None)
+    service.set_catalog(CATALOG)
+    assert [app['name'] for app in service.search('fire')] == ['Fire Chat', 'Firebug', 'Firefox']
+    assert [app['name'] for app in service.search('fire', category='Development')] == ['Firebug']
+    assert [app['name'] for app in service.search('', limit=2)] == ['Fire Chat', 'Firebug']
+
+    # A new catalog replaces every index, category ones included
+    service.set_catalog({'Development': [_app('Firewall', 'Development')]})
+    assert [app['name'] for app in service.search('fire', category='Development')] == ['Firewall']
+    assert service.search('fire', category='Internet') == []
+
+
+def test_limit_zero_returns_nothing():
+    apps = [app for apps in CATALOG.values() for app in apps]
+    assert search_apps(apps, 'fire', limit=0) == []
+    assert SearchIndex(apps).search('fire', limit=0) == []
+    assert SearchIndex(apps).search('', limit=0) == []
+    service = CatalogService(None)
+    service.set_catalog(CATALOG)
+    assert service.search('fire', limit=0) == []
@@ -0,0 +1,138 @@
+import time
+
+from conftest import write_desktop
+
+import apex_core
+from apex_scanners import CoreScanner, ScannerPlugin, run_scanners
+
+
+class SlowPlugin(ScannerPlugin):
+    name = type = 'slow'
+    budget = 0.2
+
+    def __init__(self, delay):
+        self.delay = delay
+
+    def discover(self):
+        return ['/']
+
+    def fingerprint(self, paths):
+        return [time.time()]  # Never reuse the cache
+
+    def scan(self, paths):
+        time.sleep(self.delay)
+        return {'late': {'command': 'late', 'exec': 'true', 'type': 'slow'}}
+
+
+def _tight_budget(detector, name, budget=0.2):
+    scanner_plugins = detector.scanner_plugins
+
+    def tight_budgets():
+        plugins = scanner_plugins()
+        for plugin in plugins:
+            if plugin.name == name:
+                plugin.budget = budget
+        return plugins
+    detector.scanner_plugins = tight_budgets
+
+
+def test_over_budget_plugin_uses_its_last_result(home):
+    detector = apex_core.AdvancedApplicationDetector()
+    assert run_scanners(detector, [SlowPlugin(0)])['slow']
+    start = time.perf_counter()
+    results = run_scanners(detector, [SlowPlugin(2)], workers=2)
+    assert time.perf_counter() - start < 1.5
+    assert 'late' in results['slow']
+    assert detector.scan_metrics['slow']['status'] == 'over budget'
+
+
+def test_failing_plugin_is_reported(home):
+    detector = apex_core.AdvancedApplicationDetector()
+    boom = CoreScanner('boom', 'boom', 0, 1.0, lambda side: 1 / 0)
+    assert run_scanners(detector, [boom]) == {'boom': {}}
+    assert detector.scan_metrics['boom']['status'] == 'error'
+
+
+def test_desktop_rows_survive_an_over_budget_scan(home):
+    write_desktop(home / '.local/share/applications', 'Alpha')
+    write_desktop(home / '.local/share/applications', 'Beta')
+    detector = apex_core.AdvancedApplicationDetector()
+    names = lambda catalog: {app['name'] for apps in catalog.values() for app in apps}
+    assert {'Alpha', 'Beta'} <= names(detector.detect_applications(force_refresh=True))
+
+    scan_desktop_files = detector._scan_desktop_files
+
+    def slow_desktop_files(side):
+        time.sleep(1.0)
+        return scan_desktop_files(side)
+    detector._scan_desktop_files = slow_desktop_files
+    _tight_budget(detector, 'desktop')
+
+    catalog = detector.detect_applications(force_refresh=True)
+    assert detector.scan_metrics['desktop']['status'] == 'over budget'
+    assert {'Alpha', 'Beta'} <= names(catalog)
+    assert {'Alpha', 'Beta'} <= {app['name'] for app in detector.iter_cached()}
+
+
+def test_late_core_scanner_leaves_the_next_scan_alone(home):
+    detector = apex_core.AdvancedApplicationDetector()
+    detector.detect_applications(force_refresh=True)
+    assert detector.path_executables
+
+    scan_path_commands = detector._scan_path_commands
+
+    def slow_path_commands(side):
+        time.sleep(0.6)
+        return scan_path_commands(side)
+    detector._scan_path_commands = slow_path_commands
+    _tight_budget(detector, 'path')
+
+    detector.detect_applications(force_refresh=True)
+    assert detector.scan_metrics['path']['status'] == 'over budget'
+    assert detector.path_executables == {}
+    time.sleep(0.8)  # The abandoned PATH scan has finished by now
+    assert detector.path_executables == {}
+
+
+def test_bin_dir_entries_launch_from_paths_with_spaces(tmp_path, monkeypatch):
+    from apex_launch import LaunchEngine
+    from apex_scanners import LocalBinScanner
+    home = tmp_path / 'my home'
+    monkeypatch.setenv('HOME', str(home))
+    bin_dir = home / '.local/bin'
+    bin_dir.mkdir(parents=True)
+    tool = bin_dir / 'my-tool'
+    tool.write_text('#!/bin/sh\n')
+    tool.chmod(0o755)
+
+    plugin = LocalBinScanner()
+    entry = plugin.scan(plugin.discover())['my-tool']
+    argv, _cwd = LaunchEngine().build_argv(dict(entry, name='my-tool'))
+    assert argv == [str(tool)]
+
+
+def test_failed_package_listings_are_not_recorded(home, monkeypatch):
+    import subprocess
+
+    def failing_run(args, **kwargs):
+        if args[0] == 'snap':
+            raise subprocess.TimeoutExpired(args, 3)
+        return subprocess.CompletedProcess(args, 1, '', 'error')
+    monkeypatch.setattr(subprocess, 'run', failing_run)
+    detector = apex_core.AdvancedApplicationDetector(db_path=str(home / 'system.db'), system_scope=True)
+    plugins = [plugin for plugin in detector.scanner_plugins() if plugin.type in ('flatpak', 'snap')]
+    assert run_scanners(detector, plugins) == {'flatpak': {}, 'snap': {}}
+    assert detector.scan_metrics['flatpak']['status'] == 'error'
+    assert detector.scan_metrics['snap']['status'] == 'error'
+    assert not any(plugin.side.get('sources') for plugin in plugins)
+
+
+def test_missing_package_tools_list_nothing(home, monkeypatch):
+    import subprocess
+
+    def missing_run(args, **kwargs):
+        raise FileNotFoundError(args[0])
+    monkeypatch.setattr(subprocess, 'run', missing_run)
+    detector = apex_core.AdvancedApplicationDetector()
+    assert detector._list_flatpaks() == {}
+    assert detector._list_snaps() == {}